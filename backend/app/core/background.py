@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """
+    Runs one background job at a time. Triggers that arrive while it is running
+    are coalesced into a single follow-up run.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._task: Optional[asyncio.Task] = None
+        self._rerun = False
+
+    def trigger(self, job: Callable[[], Awaitable[object]]) -> None:
+        if self._task is not None and not self._task.done():
+            self._rerun = True
+            return
+
+        async def run() -> None:
+            while True:
+                self._rerun = False
+                try:
+                    await job()
+                except Exception as e:
+                    logger.error(f"Background {self.name} failed: {e}", exc_info=True)
+                if not self._rerun:
+                    return
+
+        self._task = asyncio.create_task(run())
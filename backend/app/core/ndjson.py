@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Callable
+
+import orjson
+
+
+async def iter_ndjson_chunks(
+    stream: AsyncIterator[bytes],
+    chunk_size: int,
+    *,
+    on_error: Callable[[int, str], None],
+    max_line_bytes: int,
+) -> AsyncIterator[list[Any]]:
+    """
+    Parse a newline-delimited JSON byte stream into lists of up to chunk_size
+    values, without holding more than one partial line in memory.
+
+    Blank lines are ignored. Lines that are not valid JSON, or longer than
+    max_line_bytes, are reported via on_error(line_no, message) and skipped.
+    """
+    buf = bytearray()
+    chunk: list[Any] = []
+    line_no = 0
+    skipping = False  # inside an over-long line; drop bytes until its newline
+
+    def parse(line: bytes) -> None:
+        nonlocal line_no
+        line_no += 1
+        if not line.strip():
+            return
+        try:
+            chunk.append(orjson.loads(line))
+        except orjson.JSONDecodeError as e:
+            on_error(line_no, f"invalid JSON: {e}")
+
+    async for data in stream:
+        buf += data
+        start = 0
+        while True:
+            end = buf.find(b"\n", start)
+            if end == -1:
+                break
+            if skipping:
+                skipping = False
+            else:
+                parse(bytes(buf[start:end]))
+            start = end + 1
+            if len(chunk) >= chunk_size:
+                del buf[:start]
+                start = 0
+                yield chunk
+                chunk = []
+        del buf[:start]
+
+        if len(buf) > max_line_bytes:
+            if not skipping:
+                line_no += 1
+                on_error(line_no, f"line longer than {max_line_bytes} bytes")
+            skipping = True
+            buf.clear()
+        # Parsing is CPU-bound; let other requests run between network reads
+        await asyncio.sleep(0)
+
+    if buf and not skipping:
+        parse(bytes(buf))
+    if chunk:
+        yield chunk
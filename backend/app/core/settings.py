@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import Field, field_validator
 
 
@@ -36,6 +36,73 @@ class Settings(BaseSettings):
         description="Google Gemini API key for AI proposal generation"
     )
 
+    # Shared LLM clients
+    LLM_OPENAI_MAX_CONCURRENCY: int = Field(
+        8,
+        description="Maximum in-flight OpenAI requests per process"
+    )
+    LLM_GEMINI_MAX_CONCURRENCY: int = Field(
+        4,
+        description="Maximum in-flight Gemini requests per process"
+    )
+    LLM_HTTP_MAX_CONNECTIONS: int = Field(
+        20,
+        description="Connection pool size for the shared LLM HTTP client"
+    )
+    LLM_HTTP_MAX_KEEPALIVE: int = Field(
+        10,
+        description="Idle keep-alive connections kept open by the shared LLM HTTP client"
+    )
+    LLM_HTTP_TIMEOUT_SECONDS: float = Field(
+        120.0,
+        description="Request timeout for LLM HTTP calls (seconds)"
+    )
+
+    LLM_RETRY_MAX_ATTEMPTS: int = Field(
+        5,
+        description="Attempts per LLM call for retryable errors (429, 5xx, timeouts)"
+    )
+    LLM_RETRY_BASE_DELAY_SECONDS: float = Field(
+        1.0,
+        description="Base delay for jittered exponential backoff between LLM retries"
+    )
+    LLM_RETRY_MAX_DELAY_SECONDS: float = Field(
+        60.0,
+        description="Upper bound on a single LLM retry delay, including Retry-After"
+    )
+    GEMINI_USE_ASYNC: bool = Field(
+        True,
+        description="Use the Gemini SDK's async client; when false, calls run on a dedicated thread pool"
+    )
+    GEMINI_EXECUTOR_WORKERS: int = Field(
+        8,
+        description="Thread pool size for blocking Gemini calls (only used when GEMINI_USE_ASYNC is false)"
+    )
+
+    # Batch proposal generation
+    PROPOSAL_BATCH_CONCURRENCY: int = Field(
+        4,
+        description="Default worker count for POST /proposals/generate/batch"
+    )
+    PROPOSAL_BATCH_STALE_SECONDS: int = Field(
+        1800,
+        description="At startup, queued/running batches with no progress for this long are marked interrupted"
+    )
+
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = Field(
+        True,
+        description="Reuse completions for identical prompts and generation parameters"
+    )
+    LLM_CACHE_TTL_SECONDS: int = Field(
+        86400,
+        description="How long cached completions are reused (seconds); also the llm_cache TTL index"
+    )
+    LLM_CACHE_MAX_MEMORY_ENTRIES: int = Field(
+        512,
+        description="Size of the in-process LRU in front of the llm_cache collection"
+    )
+
     # n8n ingestion security (optional, but recommended)
     N8N_SHARED_SECRET: Optional[str] = None
     
@@ -51,6 +118,203 @@ class Settings(BaseSettings):
         description="Comma-separated list of allowed CORS origins"
     )
 
+    # Notifications
+    NOTIFY_CHANNEL_TIMEOUT_SECONDS: float = Field(
+        10.0,
+        description="Per-channel delivery timeout for Slack/webhook notifications (overridable per channel via config.timeout_seconds)"
+    )
+    NOTIFY_HTTP_MAX_CONNECTIONS: int = Field(
+        20,
+        description="Connection pool size for the shared notification HTTP client"
+    )
+
+    NOTIFY_OUTBOX_ENABLED: bool = Field(
+        True,
+        description="Queue notifications in notification_outbox and deliver them from a background dispatcher"
+    )
+    NOTIFY_OUTBOX_POLL_SECONDS: float = Field(
+        5.0,
+        description="How often the outbox dispatcher looks for due notifications; bursts within a poll are coalesced"
+    )
+    NOTIFY_OUTBOX_BATCH_SIZE: int = Field(
+        100,
+        description="Maximum outbox rows claimed per dispatch"
+    )
+    NOTIFY_OUTBOX_MAX_ATTEMPTS: int = Field(
+        6,
+        description="Delivery attempts before an outbox row is marked failed"
+    )
+    NOTIFY_OUTBOX_BACKOFF_BASE_SECONDS: float = Field(
+        10.0,
+        description="Base delay for exponential backoff between outbox delivery attempts"
+    )
+    NOTIFY_OUTBOX_BACKOFF_MAX_SECONDS: float = Field(
+        900.0,
+        description="Upper bound on the delay between outbox delivery attempts"
+    )
+    NOTIFY_OUTBOX_LEASE_SECONDS: int = Field(
+        120,
+        description="How long a claimed outbox row stays reserved before another dispatcher may retry it"
+    )
+    NOTIFY_DIGEST_MAX_LINES: int = Field(
+        20,
+        description="Maximum proposals listed in one Slack digest message"
+    )
+
+    # Celery worker (proposal generation off the web process)
+    CELERY_BROKER_URL: Optional[str] = Field(
+        None,
+        description="Celery broker URL, e.g. redis://localhost:6379/0 (falls back to REDIS_URL); memory:// for tests"
+    )
+    CELERY_RESULT_BACKEND: Optional[str] = Field(
+        None,
+        description="Celery result backend (defaults to the broker). Task status is also kept in proposal_tasks."
+    )
+    CELERY_TASK_ALWAYS_EAGER: bool = Field(
+        False,
+        description="Run Celery tasks inline instead of on a worker (tests/local development)"
+    )
+
+    # Re-filtering stored jobs
+    REFILTER_ON_CONFIG_CHANGE: bool = Field(
+        True,
+        description="Re-evaluate stored jobs in the background when keyword/geo filters change"
+    )
+    REFILTER_BATCH_SIZE: int = Field(
+        500,
+        description="Jobs per bulk write when re-filtering jobs_raw"
+    )
+
+    # Rescoring after ruleset changes
+    RESCORE_ON_RULES_CHANGE: bool = Field(
+        True,
+        description="Recompute stale job_scores in the background when client/job/risk rules change"
+    )
+    RESCORE_BATCH_SIZE: int = Field(
+        500,
+        description="Scores per bulk write when rescoring"
+    )
+
+    # Materialized job rankings (one row per rank profile and job)
+    RANKING_MAX_AGE_DAYS: int = Field(
+        30,
+        description="Jobs posted longer ago than this drop out of job_rankings on the next rebuild"
+    )
+    RANKING_BATCH_SIZE: int = Field(
+        500,
+        description="Jobs scored per bulk write when maintaining job_rankings"
+    )
+    RANKING_UPDATE_ON_INGEST: bool = Field(
+        True,
+        description="Update job_rankings in the background as jobs are ingested or re-filtered"
+    )
+
+    # Streaming ingest
+    INGEST_CHUNK_SIZE: int = Field(
+        200,
+        description="Items handed to the ingest pipeline at a time when a body is streamed (/ingest/rss, /ingest/jobs/stream, /webhook/vollna/stream)"
+    )
+    INGEST_STREAM_MAX_LINE_BYTES: int = Field(
+        1_048_576,
+        description="Longest accepted NDJSON line (one job) on the streaming endpoints; longer lines are skipped"
+    )
+
+    # Recent-url filter in front of dedup lookups
+    RECENT_URL_FILTER_ENABLED: bool = Field(
+        True,
+        description="Skip the dedup lookup for urls an in-memory Bloom filter of recently ingested urls has never seen"
+    )
+    RECENT_URL_WINDOW_DAYS: int = Field(
+        7,
+        description="How far back the recent-url filter remembers urls (also how much of jobs_raw/vollna_jobs it loads at startup)"
+    )
+    RECENT_URL_GENERATIONS: int = Field(
+        7,
+        description="Slices the window is split into; the oldest slice is dropped as the window moves"
+    )
+    RECENT_URL_CAPACITY: int = Field(
+        200_000,
+        description="Urls per window the filter is sized for at RECENT_URL_ERROR_RATE"
+    )
+    RECENT_URL_ERROR_RATE: float = Field(
+        0.01,
+        description="Target false-positive rate of the recent-url filter (false positives cost one indexed lookup)"
+    )
+
+    # Vollna webhook normalization pool
+    NORMALIZE_POOL_WORKERS: int = Field(
+        2,
+        description="Worker processes for normalizing large webhook batches (0 = always normalize on the event loop)"
+    )
+    NORMALIZE_POOL_THRESHOLD: int = Field(
+        500,
+        description="Batches with at least this many jobs are normalized on the process pool; smaller ones inline"
+    )
+    NORMALIZE_POOL_CHUNK_SIZE: int = Field(
+        250,
+        description="Jobs per task sent to a normalization worker"
+    )
+
+    # Ingest text cleanup
+    MAX_DESCRIPTION_CHARS: Optional[int] = Field(
+        None,
+        description="Truncate cleaned job descriptions to this many characters (unset = no limit)"
+    )
+
+    # Raw payload storage (job_payloads)
+    JOB_PAYLOAD_COMPRESSION: Literal["none", "zstd"] = Field(
+        "none",
+        description="Store original job payloads zstd-compressed (needs the zstandard package) instead of as plain documents"
+    )
+    JOB_PAYLOAD_ZSTD_LEVEL: int = Field(
+        3,
+        description="zstd compression level for job payloads"
+    )
+
+    # Pipeline scheduler (steps/interval live in scheduler_config)
+    SCHEDULER_ENABLED: bool = Field(
+        True,
+        description="Run the scheduler loop in this process; scheduler_config.enabled still gates each run"
+    )
+    SCHEDULER_POLL_SECONDS: float = Field(
+        15.0,
+        description="How often the scheduler checks whether a run is due"
+    )
+    SCHEDULER_LEASE_SECONDS: int = Field(
+        900,
+        description="Minimum lease held on scheduler_locks while a run is in progress"
+    )
+
+    # Audit log writer
+    AUDIT_BUFFER_ENABLED: bool = Field(
+        True,
+        description="Buffer audit events in memory and write them in batches instead of one insert per event"
+    )
+    AUDIT_FLUSH_MAX_EVENTS: int = Field(
+        500,
+        description="Flush the audit buffer once this many events are pending"
+    )
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = Field(
+        2.0,
+        description="Flush the audit buffer at least this often (seconds)"
+    )
+    AUDIT_MAX_BUFFERED_EVENTS: int = Field(
+        20000,
+        description="Upper bound on pending audit events; oldest events are dropped beyond this"
+    )
+    AUDIT_SAMPLE_RATES: dict[str, float] = Field(
+        default_factory=dict,
+        description='Per-action sampling rates as JSON, e.g. {"job_ingested": 0.1}. Unlisted actions are always logged.'
+    )
+    AUDIT_TTL_DAYS: Optional[int] = Field(
+        None,
+        description="Expire audit_logs documents after this many days (TTL index on ts)"
+    )
+    AUDIT_CAPPED_SIZE_MB: Optional[int] = Field(
+        None,
+        description="Create audit_logs as a capped collection of this size (MB) when it does not exist yet"
+    )
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     @field_validator("MONGODB_URI")
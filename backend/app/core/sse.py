@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+# Stop reverse proxies (nginx, Render) from buffering the stream.
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
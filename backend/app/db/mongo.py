@@ -11,6 +11,8 @@ logger = get_logger(__name__)
 
 _client: Optional[AsyncIOMotorClient] = None
 _db: Optional[AsyncIOMotorDatabase] = None
+# Collections whose unique job_key index is in place (see connect_mongo)
+_job_key_indexes: set[str] = set()
 
 
 def _sanitize_uri_for_logging(uri: str) -> str:
@@ -32,6 +34,31 @@ def _sanitize_uri_for_logging(uri: str) -> str:
         return "mongodb://***"
 
 
+async def _ensure_ttl_index(collection, field: str, seconds: int, *, name: Optional[str] = None) -> None:
+    """
+    Create a TTL index on `field`, or update expireAfterSeconds in place when the
+    configured TTL changed (create_index would fail with IndexOptionsConflict).
+    """
+    for index_name, info in (await collection.index_information()).items():
+        if [tuple(k) for k in info.get("key", [])] != [(field, 1)]:
+            continue
+        current = info.get("expireAfterSeconds")
+        if current == seconds:
+            return
+        if current is not None:
+            await collection.database.command(
+                "collMod",
+                collection.name,
+                index={"keyPattern": {field: 1}, "expireAfterSeconds": seconds},
+            )
+            logger.info(f"Changed TTL of {collection.name}.{index_name} from {current}s to {seconds}s")
+            return
+        # A plain index on the same key would conflict with the TTL one
+        await collection.drop_index(index_name)
+        break
+    await collection.create_index([(field, 1)], expireAfterSeconds=seconds, **({"name": name} if name else {}))
+
+
 async def connect_mongo() -> None:
     """
     Initialize MongoDB connection using AsyncIOMotorClient.
@@ -65,8 +92,10 @@ async def connect_mongo() -> None:
         await _db["jobs_raw"].create_index([("source", 1)])  # For filtering by source
         await _db["jobs_raw"].create_index([("created_at", -1)])  # For sorting by creation time
         await _db["jobs_raw"].create_index([("last_seen_at", -1)])  # For tracking last seen
+        await _db["jobs_raw"].create_index([("updated_at", -1)])  # Scheduler re-filters jobs changed since its last run
         await _db["jobs_raw"].create_index([("budget", -1)])  # For budget filtering/sorting
         await _db["jobs_raw"].create_index([("proposals", 1)])  # For proposal count filtering
+        await _db["jobs_raw"].create_index([("filter_version", 1), ("filter_passed", 1)])  # For incremental re-filtering
         
         # Jobs Filtered collection indexes
         await _db["jobs_filtered"].create_index("url", unique=True)
@@ -79,18 +108,72 @@ async def connect_mongo() -> None:
         await _db["vollna_jobs"].create_index([("created_at", -1)])  # For sorting by most recent
         await _db["vollna_jobs"].create_index([("received_at", -1)])  # For sorting by received time
         await _db["vollna_jobs"].create_index([("source", 1)])  # For filtering by source
+        await _db["vollna_jobs"].create_index([("url", 1)])  # Webhook duplicate check (not unique: older data has repeats)
         await _db["jobs_filtered"].create_index([("budget", -1)])  # For budget filtering/sorting
         await _db["jobs_filtered"].create_index([("proposals", 1)])  # For proposal count filtering
         await _db["jobs_filtered"].create_index([("skills", 1)])  # For skills filtering
         
+        # Canonical job keys (services.job_key): one document per job across url forms.
+        # Partial so documents from before job_key existed don't collide on null.
+        for name in ("jobs_raw", "jobs_filtered", "vollna_jobs"):
+            try:
+                await _db[name].create_index(
+                    "job_key",
+                    unique=True,
+                    partialFilterExpression={"job_key": {"$type": "string"}},
+                )
+                _job_key_indexes.add(name)
+            except Exception as e:
+                # Without it, every key has to be confirmed in the database (see recent_urls())
+                logger.warning(f"{name}.job_key unique index not created (run backfill_job_keys.py): {e}")
+        
         # Feed tracking collection (for feed status)
         await _db["feed_status"].create_index([("source", 1), ("updated_at", -1)], unique=True)
         
         # Proposals indexes
         await _db["proposals"].create_index([("job_url", 1), ("created_at", -1)])
         
+        # Notification outbox (dispatcher claims due rows in next_attempt_at order)
+        await _db["notification_outbox"].create_index([("status", 1), ("next_attempt_at", 1)])
+        await _db["notification_outbox"].create_index([("claim_id", 1)], sparse=True)
+
+        # Job scores: one current score per job (see dedupe_job_scores.py for legacy duplicates)
+        try:
+            await _db["job_scores"].create_index("job_url", unique=True)
+        except Exception as e:
+            logger.warning(f"job_scores.job_url unique index not created (run dedupe_job_scores.py): {e}")
+        await _db["job_scores"].create_index([("updated_at", -1)])
+
+        # Materialized rankings: recommendations read (profile_id, score desc) ranges
+        await _db["job_rankings"].create_index([("profile_id", 1), ("score", -1)])
+        await _db["job_rankings"].create_index([("profile_id", 1), ("job_id", 1)], unique=True)
+        await _db["job_rankings"].create_index([("job_url", 1)])
+
+        # Scheduler run history
+        await _db["scheduler_runs"].create_index([("started_at", -1)])
+
+        # LLM response cache (entries expire via TTL index)
+        await _ensure_ttl_index(_db["llm_cache"], "created_at", settings.LLM_CACHE_TTL_SECONDS)
+
+        # Audit logs: optional capped collection (must exist before first insert)
+        if settings.AUDIT_CAPPED_SIZE_MB:
+            existing = await _db.list_collection_names(filter={"name": "audit_logs"})
+            if not existing:
+                await _db.create_collection(
+                    "audit_logs",
+                    capped=True,
+                    size=settings.AUDIT_CAPPED_SIZE_MB * 1024 * 1024,
+                )
+
         # Audit logs indexes
         await _db["audit_logs"].create_index([("ts", -1)])
+        if settings.AUDIT_TTL_DAYS:
+            # MongoDB rejects TTL indexes on capped collections
+            audit_options = await _db["audit_logs"].options()
+            if audit_options.get("capped"):
+                logger.warning("audit_logs is a capped collection; AUDIT_TTL_DAYS is ignored (size bounds it instead)")
+            else:
+                await _ensure_ttl_index(_db["audit_logs"], "ts", settings.AUDIT_TTL_DAYS * 86400, name="ts_ttl")
 
         logger.info(f"MongoDB connected successfully to database '{settings.MONGODB_DB}'")
 
@@ -126,6 +209,11 @@ def mongo_db() -> AsyncIOMotorDatabase:
     return _db
 
 
+def has_unique_job_key(collection: str) -> bool:
+    """True once connect_mongo() created the unique job_key index on `collection`."""
+    return collection in _job_key_indexes
+
+
 async def get_db() -> AsyncGenerator[AsyncIOMotorDatabase, None]:
     """
     FastAPI dependency that yields a MongoDB database handle.
@@ -8,7 +8,15 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .core.logging import setup_logging
 from .core.settings import settings
-from .db.mongo import close_mongo, connect_mongo
+from .db.mongo import close_mongo, connect_mongo, mongo_db
+from .services.audit import start_audit_writer, stop_audit_writer
+from .services.llm_registry import close_llm_registry, init_llm_registry
+from .services.notification_outbox import start_outbox_dispatcher, stop_outbox_dispatcher
+from .services.notification_service import close_notification_client, init_notification_client
+from .services.pipeline_scheduler import start_scheduler, stop_scheduler
+from .services.proposal_batch import recover_stale_batches
+from .services.recent_urls import start_recent_url_warmup, stop_recent_url_warmup
+from .services.vollna_normalizer import close_normalize_pool, init_normalize_pool
 from .routers import (
     ai_router,
     config_router,
@@ -32,7 +40,22 @@ from .routers.jobs import api_router
 async def lifespan(app: FastAPI):
     setup_logging()
     await connect_mongo()
+    await start_audit_writer(mongo_db())
+    await recover_stale_batches(mongo_db())
+    init_llm_registry()
+    init_notification_client()
+    init_normalize_pool()
+    start_recent_url_warmup(mongo_db())
+    await start_outbox_dispatcher(mongo_db())
+    await start_scheduler(mongo_db())
     yield
+    await stop_scheduler()
+    await stop_outbox_dispatcher()
+    await stop_recent_url_warmup()
+    close_normalize_pool()
+    await close_notification_client()
+    await close_llm_registry()
+    await stop_audit_writer()
     await close_mongo()
 
 
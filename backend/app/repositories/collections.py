@@ -39,6 +39,10 @@ class JobsFilteredRepo(BaseRepository):
     collection_name = "jobs_filtered"
 
 
+class JobPayloadsRepo(BaseRepository):
+    collection_name = "job_payloads"
+
+
 class JobScoresRepo(BaseRepository):
     collection_name = "job_scores"
 
@@ -71,3 +75,39 @@ class FeedStatusRepo(BaseRepository):
     collection_name = "feed_status"
 
 
+class LLMCacheRepo(BaseRepository):
+    collection_name = "llm_cache"
+
+
+class ProposalBatchesRepo(BaseRepository):
+    collection_name = "proposal_batches"
+
+
+class NotificationOutboxRepo(BaseRepository):
+    collection_name = "notification_outbox"
+
+
+class SchedulerLocksRepo(BaseRepository):
+    collection_name = "scheduler_locks"
+
+
+class SchedulerRunsRepo(BaseRepository):
+    collection_name = "scheduler_runs"
+
+
+class ProposalTasksRepo(BaseRepository):
+    collection_name = "proposal_tasks"
+
+
+class FilterStateRepo(BaseRepository):
+    collection_name = "filter_state"
+
+
+class RankProfilesRepo(BaseRepository):
+    collection_name = "rank_profiles"
+
+
+class JobRankingsRepo(BaseRepository):
+    collection_name = "job_rankings"
+
+
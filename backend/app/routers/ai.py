@@ -5,14 +5,19 @@ from datetime import datetime
 from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from ..core.sse import SSE_HEADERS, SSE_MEDIA_TYPE, sse_event
 from ..db.mongo import get_db
-from ..repositories.base import oid_str
+from ..repositories.base import oid_str, to_object_id
 from ..repositories.collections import JobsFilteredRepo
 from ..schemas.jobs import JobRankRequest, JobRankResponse, JobOut
 from ..schemas.jobs import ProposalGenerateAIRequest
-from ..services.openai_service import OpenAIService
+from ..services.gemini_service import gemini_stats
+from ..services.job_ranking import RANK_PROJECTION, RankingService
+from ..services.llm_cache import LLMCache, cache_stats
+from ..services.llm_rate_limit import configure_rate_limits, rate_limiter
 from ..core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -38,118 +43,25 @@ async def rank_jobs(
     """
     repo = JobsFilteredRepo(db)
     
-    # Fetch all jobs
-    jobs: list[dict[str, Any]] = []
-    for job_id in payload.job_ids:
-        doc = await repo.find_by_id(job_id)
-        if doc:
-            jobs.append(doc)
+    # Fetch only the precomputed ranking features, never full descriptions
+    oids = []
+    for job_id in dict.fromkeys(payload.job_ids):
+        try:
+            oids.append(to_object_id(job_id))
+        except Exception:
+            continue
+    docs = {d["_id"]: d async for d in repo.col.find({"_id": {"$in": oids}}, RANK_PROJECTION)} if oids else {}
+    jobs = [docs[oid] for oid in oids if oid in docs]
     
     if not jobs:
         raise HTTPException(status_code=404, detail="No jobs found with provided IDs")
     
-    # Score each job
-    ranked_results: list[dict[str, Any]] = []
-    
-    for job in jobs:
-        score = 0.0
-        breakdown: dict[str, Any] = {
-            "budget_score": 0.0,
-            "competition_score": 0.0,
-            "skill_relevance_score": 0.0,
-            "description_quality_score": 0.0,
-        }
-        
-        # 1. Budget scoring (0-30 points)
-        budget = job.get("budget")
-        if budget is not None and payload.prioritize_budget:
-            # Normalize budget: higher budget = higher score
-            # Assuming typical range: $10-$200/hour
-            normalized_budget = min(budget / 200.0, 1.0)  # Cap at $200
-            budget_score = normalized_budget * 30.0
-            breakdown["budget_score"] = budget_score
-            score += budget_score
-        elif budget is not None:
-            # Still give some points for having budget info
-            breakdown["budget_score"] = 5.0
-            score += 5.0
-        
-        # 2. Competition scoring (0-25 points)
-        proposals = job.get("proposals")
-        if proposals is not None and payload.prioritize_low_competition:
-            # Lower proposals = higher score
-            # Normalize: 0 proposals = 25 points, 50+ proposals = 0 points
-            if proposals == 0:
-                competition_score = 25.0
-            elif proposals <= 50:
-                competition_score = 25.0 * (1.0 - (proposals / 50.0))
-            else:
-                competition_score = 0.0
-            breakdown["competition_score"] = competition_score
-            score += competition_score
-        elif proposals is not None:
-            # Still give some points for having proposal info
-            breakdown["competition_score"] = 5.0
-            score += 5.0
-        
-        # 3. Skill relevance scoring (0-25 points)
-        job_skills = [s.lower() for s in (job.get("skills") or [])]
-        user_skills = [s.lower() for s in (payload.user_skills or [])]
-        
-        if user_skills and job_skills:
-            # Count matching skills
-            matches = len(set(user_skills) & set(job_skills))
-            total_user_skills = len(user_skills)
-            if total_user_skills > 0:
-                relevance_ratio = matches / total_user_skills
-                skill_score = relevance_ratio * 25.0
-                breakdown["skill_relevance_score"] = skill_score
-                breakdown["matched_skills"] = list(set(user_skills) & set(job_skills))
-                score += skill_score
-        else:
-            breakdown["skill_relevance_score"] = 0.0
-        
-        # 4. Description quality scoring (0-20 points) - AI analysis
-        description = job.get("description", "")
-        if description:
-            # Simple heuristic: longer, more detailed descriptions score higher
-            # In production, you could use AI to analyze description quality
-            word_count = len(description.split())
-            if word_count < 50:
-                quality_score = 5.0
-            elif word_count < 200:
-                quality_score = 10.0
-            elif word_count < 500:
-                quality_score = 15.0
-            else:
-                quality_score = 20.0
-            
-            # Check for key indicators of quality
-            quality_indicators = ["experience", "requirements", "skills", "project", "deliverables"]
-            indicator_count = sum(1 for indicator in quality_indicators if indicator.lower() in description.lower())
-            quality_score += min(indicator_count * 1.0, 5.0)  # Up to 5 bonus points
-            
-            breakdown["description_quality_score"] = min(quality_score, 20.0)
-            score += min(quality_score, 20.0)
-        else:
-            breakdown["description_quality_score"] = 0.0
-        
-        # Total score (0-100)
-        breakdown["total_score"] = min(score, 100.0)
-        
-        ranked_results.append({
-            "job_id": oid_str(job["_id"]),
-            "job_url": job.get("url", ""),
-            "title": job.get("title", ""),
-            "score": min(score, 100.0),
-            "breakdown": breakdown,
-            "budget": budget,
-            "proposals": proposals,
-            "skills": job.get("skills", []),
-        })
-    
-    # Sort by score (highest first)
-    ranked_results.sort(key=lambda x: x["score"], reverse=True)
+    ranked_results = await RankingService(db).rank(
+        jobs,
+        user_skills=payload.user_skills,
+        prioritize_budget=payload.prioritize_budget,
+        prioritize_low_competition=payload.prioritize_low_competition,
+    )
     
     return JobRankResponse(
         ranked_jobs=ranked_results,
@@ -167,27 +79,16 @@ async def rank_jobs(
     )
 
 
-@router.post("/generate-proposal")
-async def generate_proposal_ai(
-    payload: ProposalGenerateAIRequest,
-    db: AsyncIOMotorDatabase = Depends(get_db),
-):
+async def _prepare_ai_proposal(payload: ProposalGenerateAIRequest, db: AsyncIOMotorDatabase) -> dict[str, Any]:
     """
-    Generate AI-powered custom proposals with tone and length options.
-    
-    Uses job description + user profile to generate personalized proposals.
-    Supports different tones (professional, friendly, casual, formal) and
-    lengths (short, medium, long).
+    Load the job, portfolio and AI settings and build the tone/length prompt.
     """
-    from ..repositories.collections import JobsFilteredRepo, PortfoliosRepo, PromptTemplatesRepo, AISettingsRepo, ProposalsRepo
-    from ..services.audit import AuditService
+    from ..repositories.collections import JobsFilteredRepo, PortfoliosRepo, PromptTemplatesRepo, AISettingsRepo
     
     repo = JobsFilteredRepo(db)
     portfolios = PortfoliosRepo(db)
     prompts = PromptTemplatesRepo(db)
     ai_settings = AISettingsRepo(db)
-    proposals = ProposalsRepo(db)
-    audit = AuditService(db)
     
     # Get job
     job: Optional[dict[str, Any]] = None
@@ -210,6 +111,7 @@ async def generate_proposal_ai(
     ai_doc = await ai_settings.find_one({"_key": "ai"})
     if not ai_doc:
         raise HTTPException(status_code=400, detail="AI settings not configured")
+    configure_rate_limits(ai_doc.get("rate_limits"))
     
     model = ai_doc.get("model", "gpt-4")
     temperature = ai_doc.get("temperature", 0.7)
@@ -268,24 +170,31 @@ INSTRUCTIONS:
     
     prompt += "\nWrite the proposal now:"
     
-    # Generate proposal using AI service (OpenAI or Gemini)
-    try:
-        model_str = str(model).lower()
-        if 'gemini' in model_str or model_str == 'gemini-pro' or model_str == 'gemini':
-            from ..services.gemini_service import GeminiService
-            ai_service = GeminiService()
-        else:
-            ai_service = OpenAIService()
-        
-        proposal_text, meta = await ai_service.generate(
-            model=str(model),
-            temperature=float(temperature),
-            max_tokens=int(max_tokens),
-            prompt=prompt,
-        )
-    except Exception as e:
-        logger.error(f"AI generation failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to generate proposal: {str(e)}")
+    return {
+        "job": job,
+        "model": str(model),
+        "temperature": float(temperature),
+        "max_tokens": int(max_tokens),
+        "prompt": prompt,
+    }
+
+
+async def _store_ai_proposal(
+    payload: ProposalGenerateAIRequest,
+    db: AsyncIOMotorDatabase,
+    ctx: dict[str, Any],
+    *,
+    proposal_text: str,
+    meta: dict[str, Any],
+    cached: bool,
+) -> dict[str, Any]:
+    from ..repositories.collections import ProposalsRepo
+    from ..services.audit import AuditService
+    
+    proposals = ProposalsRepo(db)
+    audit = AuditService(db)
+    job = ctx["job"]
+    job_title = job.get("title", "")
     
     # Store proposal
     now = datetime.utcnow()
@@ -296,6 +205,7 @@ INSTRUCTIONS:
         "proposal_text": proposal_text,
         "model": meta.get("model"),
         "token_usage": meta.get("usage", {}),
+        "cached": cached,
         "prompt_template_id": payload.prompt_template_id,
         "portfolio_id": payload.portfolio_id,
         "metadata": {
@@ -331,6 +241,107 @@ INSTRUCTIONS:
         "length": payload.length,
         "model": meta.get("model"),
         "token_usage": meta.get("usage", {}),
+        "cached": cached,
         "created_at": now.isoformat(),
     }
 
+
+@router.post("/generate-proposal")
+async def generate_proposal_ai(
+    payload: ProposalGenerateAIRequest,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Generate AI-powered custom proposals with tone and length options.
+    
+    Uses job description + user profile to generate personalized proposals.
+    Supports different tones (professional, friendly, casual, formal) and
+    lengths (short, medium, long).
+    """
+    ctx = await _prepare_ai_proposal(payload, db)
+    
+    # Generate proposal using the shared AI client (OpenAI or Gemini), fronted by the response cache
+    try:
+        proposal_text, meta, cached = await LLMCache(db).generate(
+            model=ctx["model"],
+            temperature=ctx["temperature"],
+            max_tokens=ctx["max_tokens"],
+            prompt=ctx["prompt"],
+            use_cache=payload.use_cache,
+        )
+    except Exception as e:
+        logger.error(f"AI generation failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate proposal: {str(e)}")
+    
+    return await _store_ai_proposal(payload, db, ctx, proposal_text=proposal_text, meta=meta, cached=cached)
+
+
+@router.post("/generate-proposal/stream")
+async def generate_proposal_ai_stream(
+    payload: ProposalGenerateAIRequest,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Streaming variant of POST /ai/generate-proposal.
+    
+    Emits Server-Sent Events:
+    - token: {"text": "..."} for each chunk as the model produces it
+    - done: the same body as /ai/generate-proposal, after the proposal is persisted
+    - error: {"detail": "..."} if generation fails mid-stream
+    """
+    ctx = await _prepare_ai_proposal(payload, db)
+    
+    async def events():
+        parts: list[str] = []
+        try:
+            async for delta, meta in LLMCache(db).stream(
+                model=ctx["model"],
+                temperature=ctx["temperature"],
+                max_tokens=ctx["max_tokens"],
+                prompt=ctx["prompt"],
+                use_cache=payload.use_cache,
+            ):
+                if meta is None:
+                    parts.append(delta)
+                    yield sse_event("token", {"text": delta})
+                    continue
+                result = await _store_ai_proposal(
+                    payload,
+                    db,
+                    ctx,
+                    proposal_text="".join(parts),
+                    meta=meta,
+                    cached=bool(meta.get("cached")),
+                )
+                yield sse_event("done", result)
+        except Exception as e:
+            logger.error(f"AI streaming generation failed: {e}")
+            yield sse_event("error", {"detail": f"Failed to generate proposal: {str(e)}"})
+    
+    return StreamingResponse(events(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
+
+@router.get("/cache/stats")
+async def get_llm_cache_stats():
+    """
+    Hit/miss counters for the LLM response cache (this process only).
+    """
+    return cache_stats()
+
+
+@router.get("/gemini/stats")
+async def get_gemini_stats():
+    """
+    Queue-wait and call-duration timings for Gemini calls (this process only).
+    Use these to size GEMINI_EXECUTOR_WORKERS / LLM_GEMINI_MAX_CONCURRENCY.
+    """
+    return gemini_stats()
+
+
+@router.get("/limits/stats")
+async def get_llm_limit_stats():
+    """
+    Configured RPM/TPM budgets plus wait and retry counters (this process only).
+    """
+    return rate_limiter().stats()
+
@@ -5,31 +5,47 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from ..core.settings import settings
 from ..db.mongo import get_db
 from ..repositories.base import oid_str, to_object_id
 from ..repositories.collections import (
     AISettingsRepo,
     ClientRulesRepo,
+    FilterStateRepo,
     GeoFiltersRepo,
     JobRulesRepo,
     KeywordConfigRepo,
     NotificationsRepo,
     PromptTemplatesRepo,
+    RankProfilesRepo,
     RiskRulesRepo,
     SchedulerConfigRepo,
+    SchedulerRunsRepo,
 )
 from ..schemas.ai import AISettingsOut, AISettingsUpsert
 from ..schemas.geo import GeoFiltersOut, GeoFiltersUpsert
+from ..schemas.jobs import RankProfileOut, RankProfileUpsert
 from ..schemas.keywords import KeywordCreate, KeywordOut, KeywordSettingsUpsert, KeywordUpdate
 from ..schemas.notifications import NotificationsConfigOut, NotificationsConfigUpsert
 from ..schemas.prompts import PromptTemplateCreate, PromptTemplateOut, PromptTemplateUpdate
 from ..schemas.rules import RulesetOut, RulesetUpsert
 from ..schemas.scheduler import SchedulerConfigOut, SchedulerConfigUpsert
+from ..services.job_ranking import RankingService, schedule_ranking_rebuild
+from ..services.llm_rate_limit import configure_rate_limits
+from ..services.notification_outbox import outbox_stats
+from ..services.pipeline_scheduler import pipeline_runner
+from ..services.refilter_service import RefilterService, schedule_refilter
+from ..services.scoring_service import schedule_rescore
 
 
 router = APIRouter(prefix="/config", tags=["config"])
 
 
+def _filters_changed(db: AsyncIOMotorDatabase) -> None:
+    if settings.REFILTER_ON_CONFIG_CHANGE:
+        schedule_refilter(db)
+
+
 # ---------- Keywords ----------
 
 
@@ -40,6 +56,7 @@ async def create_keyword(payload: KeywordCreate, db: AsyncIOMotorDatabase = Depe
     _id = await repo.insert_one(doc)
     saved = await repo.find_by_id(_id)
     assert saved is not None
+    _filters_changed(db)
     return KeywordOut(id=oid_str(saved["_id"]), term=saved["term"], enabled=saved.get("enabled", True), metadata=saved.get("metadata") or {})
 
 
@@ -59,6 +76,7 @@ async def update_keyword(keyword_id: str, payload: KeywordUpdate, db: AsyncIOMot
     doc = await repo.find_by_id(keyword_id)
     if not doc:
         raise HTTPException(status_code=404, detail="keyword not found")
+    _filters_changed(db)
     return KeywordOut(id=oid_str(doc["_id"]), term=doc["term"], enabled=doc.get("enabled", True), metadata=doc.get("metadata") or {})
 
 
@@ -68,6 +86,7 @@ async def delete_keyword(keyword_id: str, db: AsyncIOMotorDatabase = Depends(get
     deleted = await repo.delete_one({"_id": to_object_id(keyword_id)})
     if not deleted:
         raise HTTPException(status_code=404, detail="keyword not found")
+    _filters_changed(db)
     return {"deleted": True}
 
 
@@ -77,6 +96,7 @@ async def upsert_keyword_settings(payload: KeywordSettingsUpsert, db: AsyncIOMot
     doc = {"doc_type": "settings", **payload.model_dump(mode="json"), "updated_at": datetime.utcnow()}
     await repo.update_one({"doc_type": "settings"}, {"$set": doc}, upsert=True)
     saved = await repo.find_one({"doc_type": "settings"})
+    _filters_changed(db)
     return {"id": oid_str(saved["_id"]), **payload.model_dump(mode="json")}
 
 
@@ -90,6 +110,7 @@ async def upsert_geo(payload: GeoFiltersUpsert, db: AsyncIOMotorDatabase = Depen
     await repo.update_one({"_key": "geo"}, {"$set": doc}, upsert=True)
     saved = await repo.find_one({"_key": "geo"})
     assert saved is not None
+    _filters_changed(db)
     return GeoFiltersOut(id=oid_str(saved["_id"]), excluded_countries=saved.get("excluded_countries") or [], metadata=saved.get("metadata") or {})
 
 
@@ -102,6 +123,25 @@ async def get_geo(db: AsyncIOMotorDatabase = Depends(get_db)):
     return GeoFiltersOut(id=oid_str(saved["_id"]), excluded_countries=saved.get("excluded_countries") or [], metadata=saved.get("metadata") or {})
 
 
+@router.post("/filters/refilter")
+async def refilter_jobs(full: bool = False, db: AsyncIOMotorDatabase = Depends(get_db)):
+    """
+    Re-evaluate stored jobs against the current keyword/geo filters now.
+    Only jobs affected by the config change are checked unless full=true.
+    """
+    return await RefilterService(db).refilter(full=full)
+
+
+@router.get("/filters/state")
+async def get_filter_state(db: AsyncIOMotorDatabase = Depends(get_db)):
+    """Filter config version that stored jobs were last re-filtered against."""
+    state = await FilterStateRepo(db).find_one({"_key": "filters"})
+    if not state:
+        raise HTTPException(status_code=404, detail="jobs have not been re-filtered yet")
+    state.pop("_id", None)
+    return state
+
+
 # ---------- Scheduler ----------
 
 
@@ -136,34 +176,63 @@ async def get_scheduler(db: AsyncIOMotorDatabase = Depends(get_db)):
     )
 
 
+@router.post("/scheduler/run")
+async def run_scheduler_now(db: AsyncIOMotorDatabase = Depends(get_db)):
+    """
+    Run the configured pipeline steps immediately (ignores enabled/interval).
+    Still respects the lease, so it won't overlap a run on another replica.
+    """
+    run = await pipeline_runner(db).run_once(force=True)
+    if run is None:
+        raise HTTPException(status_code=409, detail="scheduler not configured or a run is already in progress")
+    return run
+
+
+@router.get("/scheduler/runs")
+async def list_scheduler_runs(db: AsyncIOMotorDatabase = Depends(get_db), skip: int = 0, limit: int = 20):
+    repo = SchedulerRunsRepo(db)
+    docs = await repo.find_many({}, skip=skip, limit=limit, sort=[("started_at", -1)])
+    for d in docs:
+        d["id"] = oid_str(d["_id"])
+        d.pop("_id", None)
+    return docs
+
+
 # ---------- Rulesets ----------
 
 
 async def _upsert_ruleset(repo_cls, key: str, payload: RulesetUpsert, db: AsyncIOMotorDatabase):
     repo = repo_cls(db)
     doc = {"_key": key, **payload.model_dump(mode="json"), "updated_at": datetime.utcnow()}
-    await repo.update_one({"_key": key}, {"$set": doc}, upsert=True)
+    # Every save bumps the version; scores record the versions they were computed with.
+    await repo.update_one({"_key": key}, {"$set": doc, "$inc": {"version": 1}}, upsert=True)
     saved = await repo.find_one({"_key": key})
     assert saved is not None
+    if settings.RESCORE_ON_RULES_CHANGE:
+        schedule_rescore(db)
     return saved
 
 
+def _ruleset_out(saved: dict) -> RulesetOut:
+    return RulesetOut(id=oid_str(saved["_id"]), enabled=saved.get("enabled", True), rules=saved.get("rules") or [], aggregation=saved.get("aggregation") or "sum", metadata=saved.get("metadata") or {}, version=saved.get("version", 0))
+
+
 @router.put("/rules/client", response_model=RulesetOut)
 async def upsert_client_rules(payload: RulesetUpsert, db: AsyncIOMotorDatabase = Depends(get_db)):
     saved = await _upsert_ruleset(ClientRulesRepo, "client_rules", payload, db)
-    return RulesetOut(id=oid_str(saved["_id"]), enabled=saved.get("enabled", True), rules=saved.get("rules") or [], aggregation=saved.get("aggregation") or "sum", metadata=saved.get("metadata") or {})
+    return _ruleset_out(saved)
 
 
 @router.put("/rules/job", response_model=RulesetOut)
 async def upsert_job_rules(payload: RulesetUpsert, db: AsyncIOMotorDatabase = Depends(get_db)):
     saved = await _upsert_ruleset(JobRulesRepo, "job_rules", payload, db)
-    return RulesetOut(id=oid_str(saved["_id"]), enabled=saved.get("enabled", True), rules=saved.get("rules") or [], aggregation=saved.get("aggregation") or "sum", metadata=saved.get("metadata") or {})
+    return _ruleset_out(saved)
 
 
 @router.put("/rules/risk", response_model=RulesetOut)
 async def upsert_risk_rules(payload: RulesetUpsert, db: AsyncIOMotorDatabase = Depends(get_db)):
     saved = await _upsert_ruleset(RiskRulesRepo, "risk_rules", payload, db)
-    return RulesetOut(id=oid_str(saved["_id"]), enabled=saved.get("enabled", True), rules=saved.get("rules") or [], aggregation=saved.get("aggregation") or "sum", metadata=saved.get("metadata") or {})
+    return _ruleset_out(saved)
 
 
 # ---------- AI settings ----------
@@ -176,7 +245,8 @@ async def upsert_ai(payload: AISettingsUpsert, db: AsyncIOMotorDatabase = Depend
     await repo.update_one({"_key": "ai"}, {"$set": doc}, upsert=True)
     saved = await repo.find_one({"_key": "ai"})
     assert saved is not None
-    return AISettingsOut(id=oid_str(saved["_id"]), model=saved["model"], temperature=saved["temperature"], max_tokens=saved["max_tokens"], extra=saved.get("extra") or {}, updated_at=saved["updated_at"])
+    configure_rate_limits(saved.get("rate_limits"))
+    return AISettingsOut(id=oid_str(saved["_id"]), model=saved["model"], temperature=saved["temperature"], max_tokens=saved["max_tokens"], extra=saved.get("extra") or {}, rate_limits=saved.get("rate_limits") or {}, updated_at=saved["updated_at"])
 
 
 @router.get("/ai", response_model=AISettingsOut)
@@ -185,7 +255,7 @@ async def get_ai(db: AsyncIOMotorDatabase = Depends(get_db)):
     saved = await repo.find_one({"_key": "ai"})
     if not saved:
         raise HTTPException(status_code=404, detail="ai settings not configured")
-    return AISettingsOut(id=oid_str(saved["_id"]), model=saved["model"], temperature=saved["temperature"], max_tokens=saved["max_tokens"], extra=saved.get("extra") or {}, updated_at=saved["updated_at"])
+    return AISettingsOut(id=oid_str(saved["_id"]), model=saved["model"], temperature=saved["temperature"], max_tokens=saved["max_tokens"], extra=saved.get("extra") or {}, rate_limits=saved.get("rate_limits") or {}, updated_at=saved["updated_at"])
 
 
 # ---------- Prompt templates ----------
@@ -245,6 +315,59 @@ async def delete_prompt(prompt_id: str, db: AsyncIOMotorDatabase = Depends(get_d
     return {"deleted": True}
 
 
+# ---------- Rank profiles ----------
+
+
+def _rank_profile_out(d: dict) -> RankProfileOut:
+    return RankProfileOut(
+        id=oid_str(d["_id"]),
+        name=d["name"],
+        user_skills=d.get("user_skills") or [],
+        prioritize_budget=d.get("prioritize_budget", True),
+        prioritize_low_competition=d.get("prioritize_low_competition", True),
+        enabled=d.get("enabled", True),
+        created_at=d.get("created_at"),
+        updated_at=d.get("updated_at"),
+    )
+
+
+@router.post("/rank-profiles", response_model=RankProfileOut)
+async def create_rank_profile(payload: RankProfileUpsert, db: AsyncIOMotorDatabase = Depends(get_db)):
+    repo = RankProfilesRepo(db)
+    now = datetime.utcnow()
+    _id = await repo.insert_one({**payload.model_dump(mode="json"), "created_at": now, "updated_at": now})
+    saved = await repo.find_by_id(_id)
+    assert saved is not None
+    schedule_ranking_rebuild(db)
+    return _rank_profile_out(saved)
+
+
+@router.get("/rank-profiles", response_model=list[RankProfileOut])
+async def list_rank_profiles(db: AsyncIOMotorDatabase = Depends(get_db)):
+    docs = await RankProfilesRepo(db).find_many({}, limit=500, sort=[("name", 1)])
+    return [_rank_profile_out(d) for d in docs]
+
+
+@router.put("/rank-profiles/{profile_id}", response_model=RankProfileOut)
+async def update_rank_profile(profile_id: str, payload: RankProfileUpsert, db: AsyncIOMotorDatabase = Depends(get_db)):
+    repo = RankProfilesRepo(db)
+    await repo.update_one({"_id": to_object_id(profile_id)}, {"$set": {**payload.model_dump(mode="json"), "updated_at": datetime.utcnow()}})
+    doc = await repo.find_by_id(profile_id)
+    if not doc:
+        raise HTTPException(status_code=404, detail="rank profile not found")
+    schedule_ranking_rebuild(db)
+    return _rank_profile_out(doc)
+
+
+@router.delete("/rank-profiles/{profile_id}")
+async def delete_rank_profile(profile_id: str, db: AsyncIOMotorDatabase = Depends(get_db)):
+    deleted = await RankProfilesRepo(db).delete_one({"_id": to_object_id(profile_id)})
+    if not deleted:
+        raise HTTPException(status_code=404, detail="rank profile not found")
+    await RankingService(db).delete_profile(profile_id)
+    return {"deleted": True}
+
+
 # ---------- Notifications config ----------
 
 
@@ -267,3 +390,9 @@ async def get_notifications(db: AsyncIOMotorDatabase = Depends(get_db)):
     return NotificationsConfigOut(id=oid_str(saved["_id"]), enabled=saved.get("enabled", True), channels=saved.get("channels") or [], metadata=saved.get("metadata") or {}, updated_at=saved["updated_at"])
 
 
+@router.get("/notifications/outbox")
+async def get_notification_outbox_stats(db: AsyncIOMotorDatabase = Depends(get_db)):
+    """Outbox row counts by status (pending, sending, sent, failed)."""
+    return await outbox_stats(db)
+
+
@@ -1,64 +1,23 @@
 from datetime import datetime, timezone
-import re
 from typing import Any, Optional
 from xml.etree import ElementTree as ET
 
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from pymongo.errors import DuplicateKeyError
+from pydantic import ValidationError
 
 from ..core.settings import settings
 from ..core.logging import get_logger
+from ..core.ndjson import iter_ndjson_chunks
 from ..db.mongo import get_db
 from ..repositories.base import oid_str
-from ..repositories.collections import JobsFilteredRepo, JobsRawRepo
+from ..repositories.collections import JobsFilteredRepo
 from ..schemas.jobs import JobFilteredOut, JobIngestItem, JobIngestRequest, JobIngestResponse, RSSConvertRequest, UpworkJsonConvertRequest
-from ..services.filter_service import FilterService
-from ..services.audit import AuditService
-
-logger = get_logger(__name__)
-
-
-async def _update_feed_status(
-    db: AsyncIOMotorDatabase,
-    source: str,
-    success: bool = True,
-    new_jobs_count: int = 0,
-    error: Optional[str] = None,
-) -> None:
-    """Update feed status after ingestion - avoids circular import."""
-    from ..repositories.collections import FeedStatusRepo
-    
-    feed_repo = FeedStatusRepo(db)
-    now = datetime.utcnow()
-    
-    update_doc: dict[str, any] = {  # type: ignore
-        "source": source,
-        "last_fetch_at": now,
-        "updated_at": now,
-    }
-    
-    if success:
-        update_doc["last_successful_fetch_at"] = now
-        update_doc["error_count"] = 0
-        update_doc["last_error"] = None
-        if new_jobs_count > 0:
-            update_doc["metadata"] = {
-                **update_doc.get("metadata", {}),
-                "last_new_jobs": new_jobs_count,
-            }
-    else:
-        # Increment error count
-        existing = await feed_repo.find_one({"source": source})
-        error_count = (existing.get("error_count", 0) if existing else 0) + 1
-        update_doc["error_count"] = error_count
-        update_doc["last_error"] = error
-    
-    await feed_repo.update_one(
-        {"source": source},
-        {"$set": update_doc},
-        upsert=True
-    )
+from ..services.date_parser import parse_posted_at
+from ..services.job_ingest import JobIngestService
+from ..services.job_normalizer import RSS_BUDGET_RE, UPWORK_JSON_FIELDS, VOLLNA_INGEST_FIELDS, client_info
+from ..services.recent_urls import recent_url_stats
+from ..services.text_sanitizer import clean_description
 
 logger = get_logger(__name__)
 
@@ -98,31 +57,13 @@ def _normalize_vollna_payload(vollna_data: dict[str, Any], source: str = "vollna
             logger.warning(f"Skipping invalid job at index {idx}: not a dict")
             continue
         
-        # Extract and normalize fields
-        title = (
-            job.get("title") or 
-            job.get("jobTitle") or 
-            job.get("name") or 
-            job.get("subject") or 
-            ""
-        ).strip()
-        
-        description = (
-            job.get("description") or 
-            job.get("snippet") or 
-            job.get("body") or 
-            job.get("text") or 
-            ""
-        ).strip()
-        
-        url = (
-            job.get("url") or 
-            job.get("jobUrl") or 
-            job.get("link") or 
-            job.get("ciphertext") or
-            job.get("jobLink") or
-            ""
-        ).strip()
+        # Extract and normalize fields (see VOLLNA_INGEST_FIELDS for candidate keys)
+        fields = VOLLNA_INGEST_FIELDS.extract(job)
+        title = fields["title"]
+        description = clean_description(fields["description"])
+        url = fields["url"]
+        client_name = fields["client_name"]
+        budget = fields["budget"]
         
         # Normalize URL
         if url and not url.startswith("http"):
@@ -140,158 +81,33 @@ def _normalize_vollna_payload(vollna_data: dict[str, Any], source: str = "vollna
             logger.warning(f"Skipping job {idx}: missing URL")
             continue
         
-        # Client name validation (extracted above)
         if not client_name:
             logger.warning(f"Skipping job {idx}: missing client name")
             continue
         
-        # Budget validation (extracted above)
         if budget is None:
             logger.warning(f"Skipping job {idx}: missing budget")
             continue
         
-        # Validate budget is a positive number
-        try:
-            budget = float(budget)
-            if budget < 0:
-                logger.warning(f"Skipping job {idx}: invalid budget (must be positive): {budget}")
-                continue
-        except (ValueError, TypeError):
-            logger.warning(f"Skipping job {idx}: invalid budget format: {budget}")
+        if budget < 0:
+            logger.warning(f"Skipping job {idx}: invalid budget (must be positive): {budget}")
             continue
         
-        # Extract posted_at
-        posted_at = None
-        date_fields = ["postedOn", "posted_at", "createdAt", "publishedAt", "date", "pubDate", "created_at"]
-        for field in date_fields:
-            if field in job and job[field]:
-                try:
-                    date_value = job[field]
-                    if isinstance(date_value, (int, float)):
-                        # Unix timestamp
-                        if date_value > 1e12:  # milliseconds
-                            posted_at = datetime.fromtimestamp(date_value / 1000, tz=timezone.utc)
-                        else:  # seconds
-                            posted_at = datetime.fromtimestamp(date_value, tz=timezone.utc)
-                    elif isinstance(date_value, str):
-                        # ISO string
-                        try:
-                            posted_at = datetime.fromisoformat(date_value.replace('Z', '+00:00'))
-                        except ValueError:
-                            pass
-                    elif isinstance(date_value, datetime):
-                        posted_at = date_value
-                except (ValueError, TypeError, OSError):
-                    pass
-                if posted_at:
-                    break
-        
-        # Extract skills
-        skills = []
-        skills_fields = ["skills", "categories", "tags", "expertise", "technologies"]
-        for field in skills_fields:
-            if field in job:
-                skills_data = job[field]
-                if isinstance(skills_data, list):
-                    for skill in skills_data:
-                        if isinstance(skill, str):
-                            skills.append(skill.strip())
-                        elif isinstance(skill, dict):
-                            skill_name = skill.get("name") or skill.get("title") or skill.get("label")
-                            if skill_name:
-                                skills.append(str(skill_name).strip())
-                elif isinstance(skills_data, str):
-                    skills.extend([s.strip() for s in skills_data.split(",") if s.strip()])
-                break
-        
-        # Extract client name (required)
-        client_name = (
-            job.get("client_name") or
-            job.get("clientName") or
-            (job.get("client", {}).get("name") if isinstance(job.get("client"), dict) else None) or
-            (job.get("client", {}).get("clientName") if isinstance(job.get("client"), dict) else None) or
-            ""
-        ).strip()
-        
-        # Extract budget (required - normalize to float)
-        budget = None
-        budget_fields = ["budget", "hourlyRate", "fixedPrice", "rate", "price", "budgetValue", "budget_value"]
-        for field in budget_fields:
-            if field in job:
-                budget_value = job[field]
-                if isinstance(budget_value, (int, float)):
-                    budget = float(budget_value)
-                elif isinstance(budget_value, str):
-                    # Try to extract number from string like "$50-$100/hour" or "$5000"
-                    numbers = re.findall(r'\d+', budget_value.replace(',', ''))
-                    if numbers:
-                        # Take the first number or average if range
-                        if len(numbers) >= 2:
-                            budget = (float(numbers[0]) + float(numbers[1])) / 2
-                        else:
-                            budget = float(numbers[0])
-                if budget:
-                    break
-        
-        # Extract proposals count
-        proposals = None
-        proposal_fields = ["proposals", "proposalCount", "numProposals", "applicants", "applicantCount"]
-        for field in proposal_fields:
-            if field in job:
-                prop_value = job[field]
-                if isinstance(prop_value, (int, float)):
-                    proposals = int(prop_value)
-                elif isinstance(prop_value, str):
-                    try:
-                        proposals = int(prop_value)
-                    except ValueError:
-                        pass
-                if proposals is not None:
-                    break
-        
-        # Extract region
-        region = None
-        region_fields = ["country", "location", "region", "clientCountry", "clientLocation"]
-        for field in region_fields:
-            if field in job:
-                region_value = job[field]
-                if isinstance(region_value, str):
-                    region = region_value
-                elif isinstance(region_value, dict):
-                    region = region_value.get("name") or region_value.get("title") or region_value.get("country")
-                if region:
-                    break
-        
         # Extract client info
-        client = {}
-        if "client" in job and isinstance(job["client"], dict):
-            client_data = job["client"]
-            client = {
-                "name": client_name,  # Ensure name is in client dict
-                "payment_verified": client_data.get("paymentVerified", client_data.get("payment_verified", False)),
-                "phone_verified": client_data.get("phoneVerified", client_data.get("phone_verified", False)),
-                "rating": client_data.get("rating") or client_data.get("totalRating"),
-                "reviews": client_data.get("reviewsCount") or client_data.get("reviews"),
-                "total_spent": client_data.get("totalSpent") or client_data.get("total_spent"),
-                "hiring_rate": client_data.get("hiringRate") or client_data.get("hiring_rate"),
-            }
-            client = {k: v for k, v in client.items() if v is not None}
-        else:
-            # If no client dict, create one with name
-            client = {"name": client_name}
+        client = {"name": client_name, **client_info(job.get("client"))}
         
         # Create normalized item
         item = JobIngestItem(
             title=title,
             url=url,
             client_name=client_name,
-            budget=budget if budget is not None else 0.0,  # Budget is required, default to 0 if not found
+            budget=budget,
             description=description,  # Now optional
             source=source,
-            region=region,
-            posted_at=posted_at,
-            skills=list(set(skills)),  # Remove duplicates
-            proposals=proposals,
+            region=fields["region"],
+            posted_at=fields["posted_at"],
+            skills=list(set(fields["skills"] or [])),  # Remove duplicates
+            proposals=fields["proposals"],
             client=client,
             raw={
                 "original_vollna_payload": job,
@@ -418,216 +234,57 @@ async def ingest_jobs(
     """
     _check_n8n_secret(x_n8n_secret)
 
-    raw_repo = JobsRawRepo(db)
-    filtered_repo = JobsFilteredRepo(db)
-    filters = FilterService(db)
-    audit = AuditService(db)
-
-    settings_doc = await filters.load_keyword_settings()
-    keywords = await filters.load_keywords()
-    geo = await filters.load_geo()
-
-    received = len(payload.items)
-    inserted_raw = 0
-    inserted_filtered = 0
-    deduped = 0
-    errors: list[str] = []
-    sources_seen: set[str] = set()
-
-    logger.info(f"Starting job ingestion: {received} jobs received")
-
-    for idx, item in enumerate(payload.items):
-        try:
-            # Validate required fields: title, url, client_name, budget
-            if not item.title or not item.title.strip():
-                errors.append(f"Job {idx}: Missing or empty title")
-                continue
-            
-            if not item.url or not item.url.strip():
-                errors.append(f"Job {idx}: Missing or empty URL")
-                continue
-            
-            # Validate URL format
-            if not item.url.startswith(("http://", "https://")):
-                errors.append(f"Job {idx}: Invalid URL format: {item.url}")
-                continue
-            
-            # Validate client name
-            client_name = item.client_name if hasattr(item, 'client_name') else (item.client.get("name") if item.client and isinstance(item.client, dict) else None)
-            if not client_name or not str(client_name).strip():
-                errors.append(f"Job {idx}: Missing or empty client name")
-                continue
-            
-            # Validate budget
-            if item.budget is None:
-                errors.append(f"Job {idx}: Missing budget")
-                continue
-            
-            if not isinstance(item.budget, (int, float)) or item.budget < 0:
-                errors.append(f"Job {idx}: Invalid budget (must be a positive number): {item.budget}")
-                continue
-            
-            # Normalize URL (remove trailing slash, etc.)
-            normalized_url = item.url.rstrip("/")
-            
-            # Track sources
-            sources_seen.add(item.source)
-            
-            now = datetime.utcnow()
-            
-            # Extract client name (from client_name field or client.name)
-            client_name_value = item.client_name if hasattr(item, 'client_name') else (item.client.get("name") if item.client and isinstance(item.client, dict) else "")
-            
-            # Ensure client dict has name field
-            client_dict = item.client.copy() if item.client else {}
-            client_dict["name"] = client_name_value.strip()
-            
-            raw_doc = {
-                "title": item.title.strip(),
-                "description": (item.description or "").strip(),  # Description is now optional
-                "url": normalized_url,
-                "source": item.source,
-                "region": item.region,
-                "posted_at": item.posted_at,
-                "skills": [s.strip() for s in item.skills if s and s.strip()],  # Clean skills
-                "budget": float(item.budget),  # Budget is now required
-                "proposals": item.proposals,  # Store proposal count if provided
-                "client": client_dict,  # Client dict with name
-                "raw": item.raw,
-                "created_at": now,
-                "updated_at": now,
-                "last_seen_at": now,
-            }
-
-            raw_id: Optional[str] = None
-            try:
-                raw_id = await raw_repo.insert_one(raw_doc)
-                inserted_raw += 1
-                logger.debug(f"Inserted new job: {normalized_url}")
-            except DuplicateKeyError:
-                deduped += 1
-                # Update last_seen_at and payload for traceability
-                await raw_repo.update_one(
-                    {"url": normalized_url},
-                    {
-                        "$set": {
-                            "last_seen_at": now,
-                            "updated_at": now,
-                            "raw": item.raw,
-                            "client": item.client,
-                        }
-                    }
-                )
-                existing = await raw_repo.find_one({"url": normalized_url})
-                raw_id = oid_str(existing["_id"]) if existing else None
-                logger.debug(f"Deduplicated job: {normalized_url}")
-
-            ok_kw, reasons_kw = filters.keyword_match(item.model_dump(mode="json"), settings=settings_doc, keywords=keywords)
-            ok_geo, reasons_geo = filters.geo_match(item.model_dump(mode="json"), geo)
-            reasons = reasons_kw + reasons_geo
-
-            # Log filter results for debugging
-            logger.debug(
-                f"Job {idx} filter check: keyword_match={ok_kw} (reasons: {reasons_kw}), "
-                f"geo_match={ok_geo} (reasons: {reasons_geo}), "
-                f"settings={settings_doc}, keywords_count={len(keywords)}, geo={geo}"
-            )
+    ingest = JobIngestService(db)
+    await ingest.load_filters()
 
-            if ok_kw and ok_geo:
-                filtered_doc = {
-                    "raw_id": raw_id,
-                    "title": item.title.strip(),
-                    "description": item.description.strip(),
-                    "url": normalized_url,
-                    "source": item.source,
-                    "region": item.region,
-                    "posted_at": item.posted_at,
-                    "skills": [s.strip() for s in item.skills if s and s.strip()],
-                    "budget": item.budget,  # Store budget if provided
-                    "proposals": item.proposals,  # Store proposal count if provided
-                    "client": item.client,
-                    "filter_reasons": reasons,
-                    "metadata": {},
-                    "created_at": now,
-                    "updated_at": now,
-                }
-                # Upsert by url - fix MongoDB conflict by separating setOnInsert and set
-                await filtered_repo.update_one(
-                    {"url": normalized_url},
-                    {
-                        "$setOnInsert": {
-                            k: v for k, v in filtered_doc.items() if k != "updated_at"
-                        },
-                        "$set": {
-                            "updated_at": now,
-                            "raw_id": raw_id,
-                            "title": item.title.strip(),
-                            "description": item.description.strip(),
-                            "source": item.source,
-                            "region": item.region,
-                            "posted_at": item.posted_at,
-                            "skills": [s.strip() for s in item.skills if s and s.strip()],
-                            "budget": item.budget,
-                            "proposals": item.proposals,
-                            "client": item.client,
-                            "filter_reasons": reasons,
-                        }
-                    },
-                    upsert=True
-                )
-                inserted_filtered += 1
-
-            await audit.log(
-                action="job_ingested",
-                entity="jobs_raw",
-                entity_id=raw_id,
-                data={
-                    "url": normalized_url,
-                    "passed_filters": ok_kw and ok_geo,
-                    "reasons": reasons,
-                }
-            )
-        except Exception as e:
-            error_msg = f"Job {idx}: Error processing job - {str(e)}"
-            errors.append(error_msg)
-            logger.error(error_msg, exc_info=True)
-            continue
+    logger.info(f"Starting job ingestion: {len(payload.items)} jobs received")
+    await ingest.add(payload.items)
+    return await ingest.finish()
 
-    # Update feed status for each source
-    for source in sources_seen:
-        try:
-            await _update_feed_status(
-                db=db,
-                source=source,
-                success=len(errors) == 0,
-                new_jobs_count=inserted_raw,
-                error="; ".join(errors) if errors else None,
-            )
-        except Exception as e:
-            logger.error(f"Failed to update feed status for {source}: {e}")
 
-    logger.info(
-        f"Job ingestion completed: received={received}, "
-        f"inserted_raw={inserted_raw}, inserted_filtered={inserted_filtered}, "
-        f"deduped={deduped}, errors={len(errors)}, sources={list(sources_seen)}"
-    )
+@router.post("/jobs/stream", response_model=JobIngestResponse)
+async def ingest_jobs_stream(
+    request: Request,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    x_n8n_secret: Optional[str] = Header(default=None, alias="X-N8N-Secret"),
+):
+    """
+    Streaming variant of POST /ingest/jobs for large payloads.
     
-    # Log feed health summary
-    for source in sources_seen:
-        source_count = await raw_repo.col.count_documents({"source": source})
-        logger.info(f"Feed health - Source: {source}, Total jobs: {source_count}, New jobs this run: {inserted_raw}")
+    The body is newline-delimited JSON (Content-Type: application/x-ndjson),
+    one /ingest/jobs item per line. Lines are parsed as they arrive and go
+    through the same pipeline in chunks of INGEST_CHUNK_SIZE, so the payload is
+    never held in memory as a whole. Invalid lines are reported as errors.
+    """
+    _check_n8n_secret(x_n8n_secret)
 
-    if errors:
-        logger.warning(f"Ingestion errors: {errors}")
+    ingest = JobIngestService(db)
+    await ingest.load_filters()
 
-    return JobIngestResponse(
-        received=received,
-        inserted_raw=inserted_raw,
-        inserted_filtered=inserted_filtered,
-        deduped=deduped
+    chunks = iter_ndjson_chunks(
+        request.stream(),
+        settings.INGEST_CHUNK_SIZE,
+        on_error=lambda line_no, msg: ingest.skip(f"line {line_no}: {msg}"),
+        max_line_bytes=settings.INGEST_STREAM_MAX_LINE_BYTES,
     )
+    async for values in chunks:
+        items: list[JobIngestItem] = []
+        for value in values:
+            try:
+                items.append(JobIngestItem.model_validate(value))
+            except ValidationError as e:
+                ingest.skip(f"Invalid item: {e.errors()[0].get('msg')}")
+        await ingest.add(items)
+    return await ingest.finish()
 
-    return JobIngestResponse(received=received, inserted_raw=inserted_raw, inserted_filtered=inserted_filtered, deduped=deduped)
+
+@router.get("/dedup/stats")
+async def get_dedup_stats():
+    """
+    Hit and false-positive counters for the recent-url filters in front of the
+    dedup lookups (this process only).
+    """
+    return recent_url_stats()
 
 
 @router.get("/jobs/filtered", response_model=list[JobFilteredOut])
@@ -653,13 +310,97 @@ async def list_filtered_jobs(db: AsyncIOMotorDatabase = Depends(get_db), skip: i
     return out
 
 
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"
+_RSS_ITEM_TAGS = ("item", f"{_ATOM}entry", f"{_RSS1}item")
+# RSS feeds don't carry the client's name, which /ingest/jobs requires.
+RSS_CLIENT_NAME = "Unknown (RSS)"
+
+
+def _rss_child(item: ET.Element, *tags: str) -> Optional[ET.Element]:
+    """First child matching one of tags (Element truthiness reflects child count, so `a or b` can't be used)."""
+    for tag in tags:
+        found = item.find(tag)
+        if found is not None:
+            return found
+    return None
+
+
+def _rss_item_to_api(item: ET.Element, source: str) -> dict[str, Any]:
+    """One RSS 2.0 / RSS 1.0 / Atom item in POST /ingest/jobs item format."""
+    # Extract title
+    title_elem = _rss_child(item, 'title', f'{_ATOM}title', f'{_RSS1}title')
+    title = (title_elem.text or "").strip() if title_elem is not None else ""
+    
+    # Extract description
+    desc_elem = _rss_child(item, 'description', f'{_ATOM}summary', f'{_ATOM}content', f'{_RSS1}description')
+    description = ""
+    if desc_elem is not None:
+        if desc_elem.text:
+            description = desc_elem.text
+        elif desc_elem.find('{http://www.w3.org/1999/xhtml}div') is not None:
+            description = ET.tostring(desc_elem.find('{http://www.w3.org/1999/xhtml}div'), encoding='unicode', method='text')
+    
+    # Clean HTML tags and entities from description
+    description = clean_description(description)
+    
+    # Extract URL
+    link_elem = _rss_child(item, 'link', f'{_ATOM}link', f'{_RSS1}link')
+    url = ""
+    if link_elem is not None:
+        url = (link_elem.text or link_elem.get('href', '')).strip()
+    
+    # Extract date
+    date_elem = _rss_child(item, 'pubDate', 'published', f'{_ATOM}published', f'{_ATOM}updated')
+    posted_at = None
+    if date_elem is not None and date_elem.text:
+        dt = parse_posted_at(date_elem.text)
+        if dt is not None:
+            posted_at = dt.isoformat()
+    
+    # Extract budget from the description (Upwork: "Budget: $500" / "Hourly Range: $15.00-$40.00")
+    budget = None
+    budget_match = RSS_BUDGET_RE.search(description)
+    if budget_match:
+        budget = float((budget_match.group(2) or budget_match.group(1)).replace(",", ""))  # Use max rate
+    
+    # Extract skills from categories
+    skills = []
+    for cat in item.findall('category') or item.findall(f'{_ATOM}category'):
+        text = cat.text or cat.get('term')
+        if text and text.strip():
+            skills.append(text.strip())
+    
+    # Extract region (try to find in description or use default)
+    region = "United States"  # Default, can be overridden
+    
+    return {
+        "title": title,
+        "description": description,
+        "url": url,
+        "client_name": RSS_CLIENT_NAME,
+        "budget": budget,
+        "source": source,
+        "region": region,
+        "posted_at": posted_at,
+        "skills": skills,
+        "client": {},  # RSS usually doesn't have client data
+        "raw": {
+            "original_rss_title": title,
+            "original_rss_description": description,
+            "rss_source": source
+        }
+    }
+
+
 @router.post("/convert/rss")
 async def convert_rss_to_api_format(payload: RSSConvertRequest):
     """
     Converts Upwork RSS XML feed to API format.
     
     Paste your Upwork RSS XML here, and it will be converted to the format
-    needed for POST /ingest/jobs.
+    needed for POST /ingest/jobs. To ingest a feed directly (without the
+    conversion round trip), POST it to /ingest/rss instead.
     
     Steps:
     1. Get your Upwork RSS feed URL
@@ -671,85 +412,78 @@ async def convert_rss_to_api_format(payload: RSSConvertRequest):
     Returns:
         JSON payload ready for POST /ingest/jobs
     """
-    rss_xml = payload.rss_xml
-    source = payload.source
-    from email.utils import parsedate_to_datetime
-    
     try:
-        root = ET.fromstring(rss_xml)
+        root = ET.fromstring(payload.rss_xml)
     except ET.ParseError as e:
         raise HTTPException(status_code=400, detail=f"Invalid RSS XML: {str(e)}")
     
-    items = []
-    namespace = {'rss': 'http://www.w3.org/2005/Atom', 'default': 'http://purl.org/rss/1.0/'}
+    items = [_rss_item_to_api(item, payload.source) for item in root.iter() if item.tag in _RSS_ITEM_TAGS]
+    return {"items": items}
+
+
+@router.post("/rss", response_model=JobIngestResponse)
+async def ingest_rss_feed(
+    request: Request,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    x_n8n_secret: Optional[str] = Header(default=None, alias="X-N8N-Secret"),
+    source: str = Query("my_feed", description="Source identifier (my_feed, best_match, etc.)"),
+):
+    """
+    Ingest a raw RSS/Atom feed body (Content-Type: application/xml).
     
-    # Try different RSS formats
-    rss_items = root.findall('.//item') or root.findall('.//{http://www.w3.org/2005/Atom}entry')
+    The body is parsed incrementally as it arrives; each finished item is
+    normalized, then released, and items go through the /ingest/jobs pipeline
+    in chunks of INGEST_CHUNK_SIZE. Memory stays bounded for large feeds.
+    Items without a budget are reported as errors, as in /ingest/jobs.
+    """
+    _check_n8n_secret(x_n8n_secret)
     
-    for item in rss_items:
-        # Extract title
-        title_elem = item.find('title') or item.find('{http://www.w3.org/2005/Atom}title')
-        title = title_elem.text if title_elem is not None and title_elem.text else ""
-        
-        # Extract description
-        desc_elem = item.find('description') or item.find('{http://www.w3.org/2005/Atom}summary') or item.find('{http://purl.org/rss/1.0/}description')
-        description = ""
-        if desc_elem is not None:
-            if desc_elem.text:
-                description = desc_elem.text
-            elif desc_elem.find('{http://www.w3.org/1999/xhtml}div') is not None:
-                description = ET.tostring(desc_elem.find('{http://www.w3.org/1999/xhtml}div'), encoding='unicode', method='text')
-        
-        # Clean HTML tags from description
-        description = re.sub(r'<[^>]+>', '', description)
-        description = description.replace('&nbsp;', ' ').replace('&amp;', '&').strip()
-        
-        # Extract URL
-        link_elem = item.find('link') or item.find('{http://www.w3.org/2005/Atom}link')
-        url = ""
-        if link_elem is not None:
-            url = link_elem.text if link_elem.text else link_elem.get('href', '')
-        
-        # Extract date
-        date_elem = item.find('pubDate') or item.find('published') or item.find('{http://www.w3.org/2005/Atom}published')
-        posted_at = None
-        if date_elem is not None and date_elem.text:
-            try:
-                dt = parsedate_to_datetime(date_elem.text)
-                posted_at = dt.isoformat()
-            except (ValueError, TypeError):
-                pass
-        
-        # Extract skills from categories
-        skills = []
-        categories = item.findall('category') or item.findall('{http://www.w3.org/2005/Atom}category')
-        for cat in categories:
-            if cat.text:
-                skills.append(cat.text.strip())
-        
-        # Extract region (try to find in description or use default)
-        region = "United States"  # Default, can be overridden
-        
-        # Build the item
-        api_item = {
-            "title": title,
-            "description": description,
-            "url": url,
-            "source": source,
-            "region": region,
-            "posted_at": posted_at,
-            "skills": skills,
-            "client": {},  # RSS usually doesn't have client data
-            "raw": {
-                "original_rss_title": title,
-                "original_rss_description": description,
-                "rss_source": source
-            }
-        }
-        
-        items.append(api_item)
+    ingest = JobIngestService(db)
+    await ingest.load_filters()
     
-    return {"items": items}
+    parser = ET.XMLPullParser(events=("start", "end"))
+    open_elems: list[ET.Element] = []
+    chunk: list[JobIngestItem] = []
+    
+    def collect_items() -> None:
+        for event, elem in parser.read_events():
+            if event == "start":
+                open_elems.append(elem)
+                continue
+            open_elems.pop()
+            if elem.tag not in _RSS_ITEM_TAGS:
+                continue
+            api_item = _rss_item_to_api(elem, source)
+            if api_item["budget"] is None:
+                ingest.skip(f"Missing budget: {api_item['url'] or api_item['title']}")
+            else:
+                try:
+                    chunk.append(JobIngestItem(**api_item))
+                except ValidationError as e:
+                    ingest.skip(f"Invalid item: {e.errors()[0].get('msg')}")
+            # Drop the parsed item so the tree never holds more than one
+            elem.clear()
+            if open_elems:
+                open_elems[-1].remove(elem)
+    
+    try:
+        async for data in request.stream():
+            parser.feed(data)
+            collect_items()
+            while len(chunk) >= settings.INGEST_CHUNK_SIZE:
+                await ingest.add(chunk[:settings.INGEST_CHUNK_SIZE])
+                del chunk[:settings.INGEST_CHUNK_SIZE]
+        parser.close()
+        collect_items()
+    except ET.ParseError as e:
+        if not ingest.received and not chunk:
+            raise HTTPException(status_code=400, detail=f"Invalid RSS XML: {str(e)}")
+        # Keep what was parsed before the error
+        ingest.errors.append(f"Invalid RSS XML after {ingest.received + len(chunk)} items: {e}")
+    
+    if chunk:
+        await ingest.add(chunk)
+    return await ingest.finish()
 
 
 @router.post("/convert/upwork-json")
@@ -822,37 +556,15 @@ async def convert_upwork_json_to_api_format(payload: UpworkJsonConvertRequest):
         if not isinstance(job, dict):
             continue
         
-        # Extract title - try multiple possible field names
-        title = (
-            job.get("title") or 
-            job.get("jobTitle") or 
-            job.get("name") or 
-            job.get("subject") or 
-            ""
-        )
-        
-        # Extract description - try multiple possible field names
-        description = (
-            job.get("description") or 
-            job.get("snippet") or 
-            job.get("body") or 
-            job.get("text") or 
-            ""
-        )
+        # Extract fields (see UPWORK_JSON_FIELDS for candidate keys)
+        fields = UPWORK_JSON_FIELDS.extract(job)
+        title = fields["title"]
+        description = fields["description"]
         
         # Clean HTML from description if present
-        if description:
-            description = re.sub(r'<[^>]+>', '', description)
-            description = description.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>').strip()
+        description = clean_description(description)
         
-        # Extract URL - try multiple possible field names
-        url = (
-            job.get("url") or 
-            job.get("jobUrl") or 
-            job.get("link") or 
-            job.get("ciphertext") or
-            ""
-        )
+        url = fields["url"]
         
         # If URL is relative, make it absolute
         if url and not url.startswith("http"):
@@ -861,82 +573,10 @@ async def convert_upwork_json_to_api_format(payload: UpworkJsonConvertRequest):
             else:
                 url = f"https://www.upwork.com/jobs/{url}"
         
-        # Extract posted_at - try multiple possible field names and formats
-        posted_at = None
-        date_fields = ["postedOn", "createdAt", "publishedAt", "date", "pubDate", "posted_at", "created_at"]
-        for field in date_fields:
-            if field in job and job[field]:
-                try:
-                    date_value = job[field]
-                    # Handle Unix timestamp (milliseconds or seconds)
-                    if isinstance(date_value, (int, float)):
-                        if date_value > 1e12:  # milliseconds
-                            posted_at = datetime.fromtimestamp(date_value / 1000, tz=timezone.utc).isoformat()
-                        else:  # seconds
-                            posted_at = datetime.fromtimestamp(date_value, tz=timezone.utc).isoformat()
-                    # Handle ISO string
-                    elif isinstance(date_value, str):
-                        # Try parsing ISO format
-                        try:
-                            dt = datetime.fromisoformat(date_value.replace('Z', '+00:00'))
-                            posted_at = dt.isoformat()
-                        except ValueError:
-                            pass
-                    # Handle datetime object
-                    elif isinstance(date_value, datetime):
-                        posted_at = date_value.isoformat()
-                except (ValueError, TypeError, OSError):
-                    pass
-                if posted_at:
-                    break
-        
-        # Extract skills - try multiple possible field names
-        skills = []
-        skills_fields = ["skills", "categories", "tags", "expertise", "technologies"]
-        for field in skills_fields:
-            if field in job:
-                skills_data = job[field]
-                if isinstance(skills_data, list):
-                    for skill in skills_data:
-                        if isinstance(skill, str):
-                            skills.append(skill.strip())
-                        elif isinstance(skill, dict):
-                            # Handle { "name": "Python" } or { "title": "Python" } format
-                            skill_name = skill.get("name") or skill.get("title") or skill.get("label")
-                            if skill_name:
-                                skills.append(str(skill_name).strip())
-                elif isinstance(skills_data, str):
-                    # Comma-separated string
-                    skills.extend([s.strip() for s in skills_data.split(",") if s.strip()])
-                break
-        
-        # Extract region - try multiple possible field names
-        region = None
-        region_fields = ["country", "location", "region", "clientCountry", "clientLocation"]
-        for field in region_fields:
-            if field in job:
-                region_value = job[field]
-                if isinstance(region_value, str):
-                    region = region_value
-                elif isinstance(region_value, dict):
-                    region = region_value.get("name") or region_value.get("title") or region_value.get("country")
-                if region:
-                    break
-        
-        # Extract client info if available
-        client = {}
-        if "client" in job and isinstance(job["client"], dict):
-            client_data = job["client"]
-            client = {
-                "payment_verified": client_data.get("paymentVerified", client_data.get("payment_verified", False)),
-                "phone_verified": client_data.get("phoneVerified", client_data.get("phone_verified", False)),
-                "rating": client_data.get("rating") or client_data.get("totalRating"),
-                "reviews": client_data.get("reviewsCount") or client_data.get("reviews"),
-                "total_spent": client_data.get("totalSpent") or client_data.get("total_spent"),
-                "hiring_rate": client_data.get("hiringRate") or client_data.get("hiring_rate"),
-            }
-            # Remove None values
-            client = {k: v for k, v in client.items() if v is not None}
+        posted_at = fields["posted_at"].isoformat() if fields["posted_at"] else None
+        skills = fields["skills"] or []
+        region = fields["region"]
+        client = client_info(job.get("client"))
         
         # Build the API item
         api_item = {
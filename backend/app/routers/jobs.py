@@ -2,14 +2,14 @@
 Jobs router - provides endpoints for querying and filtering jobs.
 """
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from ..db.mongo import get_db
 from ..repositories.base import oid_str
-from ..repositories.collections import JobsRawRepo, JobsFilteredRepo
+from ..repositories.collections import JobsRawRepo, JobsFilteredRepo, RankProfilesRepo
 from ..schemas.jobs import (
     JobOut, 
     JobFilterRequest, 
@@ -19,6 +19,7 @@ from ..schemas.jobs import (
     JobRankRequest, 
     JobRankResponse
 )
+from ..services.job_ranking import RankingService
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 api_router = APIRouter(prefix="/api", tags=["api"])
@@ -387,6 +388,7 @@ async def recommend_jobs(
     user_skills: Optional[list[str]] = None,
     prioritize_budget: bool = True,
     prioritize_low_competition: bool = True,
+    profile_id: Optional[str] = None,
 ):
     """
     AI-powered job recommendations based on filtered search results.
@@ -396,8 +398,15 @@ async def recommend_jobs(
     2. Ranks filtered jobs using AI scoring
     3. Returns top recommendations with scores
     
+    With profile_id (a saved rank profile), results are read directly from the
+    materialized job_rankings view instead of being scored on the fly; keyword
+    filters need descriptions and fall back to the on-the-fly path.
+    
     Use this endpoint from the chatbot to get personalized job recommendations.
     """
+    if profile_id and not payload.keywords:
+        return await _recommend_from_rankings(profile_id, payload, db)
+    
     # First, get filtered jobs
     search_result = await search_jobs(payload, db)
     
@@ -425,3 +434,47 @@ async def recommend_jobs(
     from ..routers.ai import rank_jobs
     return await rank_jobs(rank_request, db)
 
+
+async def _recommend_from_rankings(profile_id: str, payload: JobSearchRequest, db: AsyncIOMotorDatabase) -> JobRankResponse:
+    try:
+        profile = await RankProfilesRepo(db).find_by_id(profile_id)
+    except Exception:
+        profile = None
+    if not profile:
+        raise HTTPException(status_code=404, detail="rank profile not found")
+    
+    # Only filters on fields denormalized into job_rankings
+    query: dict[str, Any] = {}
+    if payload.source:
+        query["source"] = payload.source
+    if payload.min_budget is not None or payload.max_budget is not None:
+        query["budget"] = {}
+        if payload.min_budget is not None:
+            query["budget"]["$gte"] = payload.min_budget
+        if payload.max_budget is not None:
+            query["budget"]["$lte"] = payload.max_budget
+    if payload.max_proposals is not None:
+        query["proposals"] = {"$lte": payload.max_proposals}
+    if payload.skills:
+        query["skills"] = {"$in": payload.skills}
+    
+    ranked = await RankingService(db).top(profile_id, query=query, skip=payload.skip, limit=payload.limit)
+    return JobRankResponse(
+        ranked_jobs=ranked,
+        scoring_breakdown={
+            "max_score": 100.0,
+            "profile_id": profile_id,
+            "profile": profile.get("name"),
+            "prioritize_budget": profile.get("prioritize_budget", True),
+            "prioritize_low_competition": profile.get("prioritize_low_competition", True),
+            "filters_applied": query,
+            "materialized": True,
+        }
+    )
+
+
+@router.post("/rankings/rebuild")
+async def rebuild_rankings(profile_id: Optional[str] = None, db: AsyncIOMotorDatabase = Depends(get_db)):
+    """Recompute job_rankings now (one profile, or all) and drop rows for old or removed jobs."""
+    return await RankingService(db).rebuild(profile_id)
+
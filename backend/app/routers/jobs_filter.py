@@ -11,6 +11,7 @@ from pydantic import BaseModel, Field
 from ..db.mongo import get_db
 from ..repositories.vollna_jobs import VollnaJobsRepo
 from ..core.logging import get_logger
+from ..services.job_payloads import JobPayloadStore
 
 logger = get_logger(__name__)
 
@@ -59,6 +60,7 @@ async def filter_jobs(
     filters: JobFilterRequest,
     db: AsyncIOMotorDatabase = Depends(get_db),
     limit: int = Query(1000, ge=1, le=1000, description="Maximum number of jobs to return"),
+    include_raw: bool = Query(False, description="Include the original payload as raw (fetched from job_payloads)"),
 ):
     """
     Apply filters to jobs from Vollna and return matching jobs.
@@ -264,12 +266,15 @@ async def filter_jobs(
         logger.debug(f"MongoDB query: {query}")
         
         # Execute query
-        docs = await repo.col.find(query).sort([
+        docs = await repo.col.find(query, {"raw": 0}).sort([
             ("created_at", -1),
             ("received_at", -1),
             ("_id", -1)
         ]).limit(limit).to_list(length=limit)
         
+        if include_raw:
+            await JobPayloadStore(db).attach(docs)
+        
         # Convert ObjectId to string
         jobs = []
         for doc in docs:
@@ -305,7 +310,7 @@ async def preview_filters(
         total_count = await repo.col.count_documents({})
         
         # Get sample jobs for preview
-        sample_jobs = await repo.col.find({}).limit(10).to_list(length=10)
+        sample_jobs = await repo.col.find({}, {"raw": 0}).limit(10).to_list(length=10)
         
         # Extract unique values for filter suggestions
         platforms = await repo.col.distinct("platform")
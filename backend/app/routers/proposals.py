@@ -3,25 +3,48 @@ from __future__ import annotations
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from ..core.logging import get_logger
+from ..core.sse import SSE_HEADERS, SSE_MEDIA_TYPE, sse_event
 from ..db.mongo import get_db
 from ..repositories.base import oid_str, to_object_id
-from ..repositories.collections import ProposalsRepo
-from ..schemas.proposals import ProposalGenerateRequest, ProposalGenerateResponse, ProposalOut, ProposalStatusUpdate
+from ..repositories.collections import ProposalTasksRepo, ProposalsRepo
+from ..schemas.proposals import (
+    ProposalBatchOut,
+    ProposalBatchRequest,
+    ProposalGenerateRequest,
+    ProposalGenerateResponse,
+    ProposalOut,
+    ProposalStatusUpdate,
+    ProposalTaskOut,
+)
 from ..services.audit import AuditService
+from ..services.notification_outbox import enqueue_proposal_notification
 from ..services.notification_service import NotificationService
+from ..services.proposal_batch import ProposalBatchService
 from ..services.proposal_service import ProposalService
 
 
+logger = get_logger(__name__)
+
 router = APIRouter(prefix="/proposals", tags=["proposals"])
 
 
 @router.post("/generate", response_model=ProposalGenerateResponse)
 async def generate_proposal(payload: ProposalGenerateRequest, db: AsyncIOMotorDatabase = Depends(get_db)):
+    if payload.enqueue:
+        # Celery is only needed when the worker path is used.
+        from ..tasks import celery_enabled, enqueue_proposal
+
+        if not celery_enabled():
+            raise HTTPException(status_code=400, detail="enqueue requested but no Celery broker is configured")
+        task_id = await enqueue_proposal(db, payload)
+        return JSONResponse(status_code=202, content={"task_id": task_id, "status": "queued"})
+
     svc = ProposalService(db)
     audit = AuditService(db)
-    notif = NotificationService(db)
 
     try:
         res = await svc.generate(payload)
@@ -31,15 +54,116 @@ async def generate_proposal(payload: ProposalGenerateRequest, db: AsyncIOMotorDa
     await audit.log(action="proposal_generated", entity="proposals", entity_id=res.proposal_id, data={"job_id": payload.job_id, "job_url": payload.job_url})
 
     # Module 9: trigger notifications after generation (configurable).
+    # Queued in the outbox; delivery and retries happen in the background.
     try:
-        await notif.notify_proposal(res.proposal_id)
-    except Exception:
-        # notification failures should not block proposal creation
-        pass
+        await enqueue_proposal_notification(db, res.proposal_id)
+    except Exception as e:
+        logger.warning(f"Failed to queue notifications for proposal {res.proposal_id}: {e}")
 
     return res
 
 
+@router.get("/tasks/{task_id}", response_model=ProposalTaskOut)
+async def get_proposal_task(task_id: str, db: AsyncIOMotorDatabase = Depends(get_db)):
+    try:
+        d = await ProposalTasksRepo(db).find_by_id(task_id)
+    except Exception:
+        d = None
+    if not d:
+        raise HTTPException(status_code=404, detail="task not found")
+    return ProposalTaskOut(
+        task_id=oid_str(d["_id"]),
+        status=d.get("status") or "queued",
+        proposal_id=d.get("proposal_id"),
+        error=d.get("error"),
+        created_at=d.get("created_at"),
+        started_at=d.get("started_at"),
+        finished_at=d.get("finished_at"),
+    )
+
+
+@router.post("/generate/stream")
+async def generate_proposal_stream(payload: ProposalGenerateRequest, db: AsyncIOMotorDatabase = Depends(get_db)):
+    """
+    Streaming variant of POST /proposals/generate.
+
+    Emits Server-Sent Events:
+    - token: {"text": "..."} for each chunk as the model produces it
+    - done: the same body as /proposals/generate, after the proposal is persisted
+    - error: {"detail": "..."} if generation fails mid-stream
+    """
+    svc = ProposalService(db)
+    audit = AuditService(db)
+
+    try:
+        ctx = await svc.prepare(payload)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        try:
+            async for delta, res in svc.stream(payload, ctx):
+                if res is None:
+                    yield sse_event("token", {"text": delta})
+                    continue
+                await audit.log(action="proposal_generated", entity="proposals", entity_id=res.proposal_id, data={"job_id": payload.job_id, "job_url": payload.job_url, "streamed": True})
+                yield sse_event("done", res.model_dump(mode="json"))
+                try:
+                    await enqueue_proposal_notification(db, res.proposal_id)
+                except Exception as e:
+                    logger.warning(f"Failed to queue notifications for proposal {res.proposal_id}: {e}")
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(events(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
+
+@router.post("/generate/batch")
+async def generate_proposal_batch(payload: ProposalBatchRequest, db: AsyncIOMotorDatabase = Depends(get_db)):
+    """
+    Generate proposals for many jobs in the background.
+
+    Jobs come from payload.job_ids, or from the top_n results of a /jobs/recommend query.
+    Returns immediately with a batch id; poll GET /proposals/batches/{batch_id} for progress.
+    """
+    job_ids = list(dict.fromkeys(payload.job_ids))
+    if not job_ids and payload.recommend is not None:
+        from .jobs import recommend_jobs
+
+        ranked = await recommend_jobs(payload.recommend, db, payload.user_skills or None, True, True)
+        job_ids = [j["job_id"] for j in ranked.ranked_jobs[: payload.top_n] if j.get("job_id")]
+    if not job_ids:
+        raise HTTPException(status_code=400, detail="no jobs to generate proposals for (pass job_ids or a recommend query)")
+
+    svc = ProposalBatchService(db)
+    batch_id = await svc.create(payload, job_ids)
+    svc.start(batch_id, payload, job_ids)
+
+    await AuditService(db).log(action="proposal_batch_started", entity="proposal_batches", entity_id=batch_id, data={"total": len(job_ids)})
+    return {"batch_id": batch_id, "status": "queued", "total": len(job_ids)}
+
+
+@router.get("/batches/{batch_id}", response_model=ProposalBatchOut)
+async def get_proposal_batch(batch_id: str, db: AsyncIOMotorDatabase = Depends(get_db)):
+    try:
+        d = await ProposalBatchService(db).get(batch_id)
+    except Exception:
+        d = None
+    if not d:
+        raise HTTPException(status_code=404, detail="batch not found")
+    return ProposalBatchOut(
+        id=oid_str(d["_id"]),
+        status=d.get("status") or "queued",
+        total=d.get("total") or 0,
+        completed=d.get("completed") or 0,
+        failed=d.get("failed") or 0,
+        results=d.get("results") or [],
+        created_at=d.get("created_at"),
+        updated_at=d.get("updated_at"),
+        finished_at=d.get("finished_at"),
+    )
+
+
 @router.get("", response_model=list[ProposalOut])
 async def list_proposals(db: AsyncIOMotorDatabase = Depends(get_db), skip: int = 0, limit: int = 50):
     repo = ProposalsRepo(db)
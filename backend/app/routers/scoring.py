@@ -34,18 +34,27 @@ async def score_job(payload: ScoreRequest, db: AsyncIOMotorDatabase = Depends(ge
     if not job:
         raise HTTPException(status_code=404, detail="job not found")
 
-    result = await scorer.score_job(job)
-    score_id = await scorer.persist_score(job_url=job.get("url"), job_id=job_id, result=result)
+    rulesets = await scorer.load_rulesets()
+    versions = scorer.ruleset_versions(rulesets)
+    result = await scorer.score_job(job, rulesets)
+    score_id = await scorer.persist_score(job_url=job.get("url"), job_id=job_id, result=result, rule_versions=versions)
 
-    await audit.log(action="job_scored", entity="job_scores", entity_id=score_id, data={"job_url": job.get("url"), "passed": result.passed})
+    await audit.log(action="job_scored", entity="job_scores", entity_id=score_id, data={"job_url": job.get("url"), "passed": result.passed, "rule_versions": versions})
 
-    return JobScoreOut(id=score_id, job_url=job.get("url"), job_id=job_id, result=result, created_at=datetime.utcnow())
+    now = datetime.utcnow()
+    return JobScoreOut(id=score_id, job_url=job.get("url"), job_id=job_id, result=result, rule_versions=versions, created_at=now, updated_at=now)
+
+
+@router.post("/scores/rescore")
+async def rescore_stale(db: AsyncIOMotorDatabase = Depends(get_db)):
+    """Recompute scores produced by older ruleset versions."""
+    return await ScoringService(db).rescore_stale()
 
 
 @router.get("/scores")
 async def list_scores(db: AsyncIOMotorDatabase = Depends(get_db), skip: int = 0, limit: int = 50):
     repo = JobScoresRepo(db)
-    docs = await repo.find_many({}, skip=skip, limit=limit, sort=[("created_at", -1)])
+    docs = await repo.find_many({}, skip=skip, limit=limit, sort=[("updated_at", -1)])
     for d in docs:
         d["id"] = oid_str(d["_id"])
         d.pop("_id", None)
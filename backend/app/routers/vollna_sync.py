@@ -11,6 +11,7 @@ from ..core.settings import settings
 from ..core.logging import get_logger
 from ..db.mongo import get_db
 from ..repositories.collections import KeywordConfigRepo, GeoFiltersRepo
+from ..services.refilter_service import schedule_refilter
 from ..schemas.keywords import KeywordCreate, KeywordSettingsUpsert
 from ..schemas.geo import GeoFiltersUpsert
 
@@ -183,6 +184,9 @@ async def sync_vollna_filters(
             )
             synced_geo = True
         
+        if (synced_settings or synced_geo) and settings.REFILTER_ON_CONFIG_CHANGE:
+            schedule_refilter(db)
+
         logger.info(
             f"Vollna filters synced: keywords={synced_keywords}, "
             f"settings={synced_settings}, geo={synced_geo}"
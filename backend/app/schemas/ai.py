@@ -15,6 +15,10 @@ class AISettingsUpsert(BaseModel):
     temperature: float
     max_tokens: int
     extra: dict[str, Any] = Field(default_factory=dict, description="Any future OpenAI params")
+    rate_limits: dict[str, dict[str, int]] = Field(
+        default_factory=dict,
+        description='Client-side budgets keyed by provider or model, e.g. {"openai": {"rpm": 500, "tpm": 200000}}',
+    )
 
 
 class AISettingsOut(BaseModel):
@@ -23,6 +27,7 @@ class AISettingsOut(BaseModel):
     temperature: float
     max_tokens: int
     extra: dict[str, Any]
+    rate_limits: dict[str, dict[str, int]] = Field(default_factory=dict)
     updated_at: datetime
 
 
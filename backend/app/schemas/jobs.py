@@ -28,6 +28,7 @@ class JobIngestResponse(BaseModel):
     inserted_raw: int
     inserted_filtered: int
     deduped: int
+    unchanged: int = 0  # deduped jobs resent without content changes (only last_seen_at updated)
 
 
 class JobFilteredOut(BaseModel):
@@ -144,6 +145,21 @@ class JobRankResponse(BaseModel):
     scoring_breakdown: dict[str, Any] = Field(default_factory=dict, description="Scoring methodology")
 
 
+class RankProfileUpsert(BaseModel):
+    """Saved ranking profile; job_rankings keeps a score per profile and job"""
+    name: str = Field(..., description="Profile name")
+    user_skills: list[str] = Field(default_factory=list, description="User's skills for relevance matching")
+    prioritize_budget: bool = Field(True, description="Prioritize higher budgets")
+    prioritize_low_competition: bool = Field(True, description="Prioritize jobs with fewer proposals")
+    enabled: bool = Field(True, description="Maintain rankings for this profile")
+
+
+class RankProfileOut(RankProfileUpsert):
+    id: str
+    created_at: datetime
+    updated_at: datetime
+
+
 class ProposalGenerateAIRequest(BaseModel):
     """AI proposal generation request with options"""
     job_id: Optional[str] = Field(None, description="Job ID from database")
@@ -153,5 +169,6 @@ class ProposalGenerateAIRequest(BaseModel):
     length: str = Field("medium", description="Proposal length: short, medium, long")
     custom_message: Optional[str] = Field(None, description="Custom message to include")
     prompt_template_id: Optional[str] = Field(None, description="Custom prompt template ID")
+    use_cache: bool = Field(True, description="Reuse a cached completion for an identical prompt if available")
 
 
@@ -3,8 +3,12 @@ from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+from .jobs import JobSearchRequest
+
 
 ProposalStatus = Literal["generated", "reviewed", "approved", "submitted", "skipped"]
+BatchStatus = Literal["queued", "running", "completed", "failed", "interrupted"]
+TaskStatus = Literal["queued", "running", "completed", "failed"]
 
 
 class ProposalGenerateRequest(BaseModel):
@@ -13,6 +17,8 @@ class ProposalGenerateRequest(BaseModel):
     prompt_template_id: Optional[str] = None
     portfolio_id: Optional[str] = None
     metadata: dict[str, Any] = Field(default_factory=dict)
+    use_cache: bool = Field(True, description="Reuse a cached completion for an identical prompt if available")
+    enqueue: bool = Field(False, description="Generate on a Celery worker; returns a task id to poll instead of the proposal")
 
 
 class ProposalGenerateResponse(BaseModel):
@@ -21,6 +27,17 @@ class ProposalGenerateResponse(BaseModel):
     model: Optional[str] = None
     token_usage: dict[str, Any] = Field(default_factory=dict)
     proposal_text: str
+    cached: bool = False
+
+
+class ProposalTaskOut(BaseModel):
+    task_id: str
+    status: TaskStatus
+    proposal_id: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
 
 class ProposalStatusUpdate(BaseModel):
@@ -43,3 +60,38 @@ class ProposalOut(BaseModel):
     updated_at: datetime
 
 
+class ProposalBatchRequest(BaseModel):
+    """
+    Generate proposals for many jobs at once.
+    Either pass job_ids explicitly or a /jobs/recommend query (top_n results are used).
+    """
+
+    job_ids: list[str] = Field(default_factory=list)
+    recommend: Optional[JobSearchRequest] = Field(None, description="Same body as POST /jobs/recommend")
+    user_skills: list[str] = Field(default_factory=list, description="Skills used to rank recommend results")
+    top_n: int = Field(50, ge=1, le=200, description="How many recommended jobs to generate for")
+    prompt_template_id: Optional[str] = None
+    portfolio_id: Optional[str] = None
+    metadata: dict[str, Any] = Field(default_factory=dict)
+    use_cache: bool = True
+    concurrency: Optional[int] = Field(None, ge=1, le=32, description="Worker count (defaults to PROPOSAL_BATCH_CONCURRENCY)")
+
+
+class ProposalBatchItem(BaseModel):
+    job_id: str
+    status: Literal["generated", "failed"]
+    proposal_id: Optional[str] = None
+    cached: bool = False
+    error: Optional[str] = None
+
+
+class ProposalBatchOut(BaseModel):
+    id: str
+    status: BatchStatus
+    total: int
+    completed: int = 0
+    failed: int = 0
+    results: list[ProposalBatchItem] = Field(default_factory=list)
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
@@ -51,5 +51,6 @@ class RulesetOut(BaseModel):
     rules: list[Rule]
     aggregation: str
     metadata: dict[str, Any]
+    version: int = 0
 
 
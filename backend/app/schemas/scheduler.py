@@ -8,8 +8,14 @@ from pydantic import BaseModel, Field
 class SchedulerConfigUpsert(BaseModel):
     enabled: bool = False
     interval_seconds: int = Field(..., description="Execution interval in seconds")
-    steps: list[str] = Field(default_factory=list, description="Enabled pipeline step names")
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    steps: list[str] = Field(
+        default_factory=list,
+        description="Enabled pipeline step names, run in order: filter, rescore, rank, generate, notify",
+    )
+    metadata: dict[str, Any] = Field(
+        default_factory=dict,
+        description='Per-step options keyed by step name, e.g. {"generate": {"top_n": 5}}',
+    )
 
 
 class SchedulerConfigOut(BaseModel):
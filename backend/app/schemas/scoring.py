@@ -28,6 +28,8 @@ class JobScoreOut(BaseModel):
     job_url: str
     job_id: Optional[str] = None
     result: ScoreResult
+    rule_versions: dict[str, int] = Field(default_factory=dict)
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
 
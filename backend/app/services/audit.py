@@ -1,11 +1,140 @@
+import asyncio
+import random
 from datetime import datetime
 from typing import Any, Optional
 
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
 
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..repositories.base import oid_str
 from ..repositories.collections import AuditLogsRepo
 
 
+logger = get_logger(__name__)
+
+
+class AuditBuffer:
+    """
+    In-memory audit sink.
+    Events are appended without touching Mongo and written with insert_many(ordered=False)
+    when either the size or the time threshold is reached.
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        *,
+        max_events: int,
+        flush_interval: float,
+        max_buffered: int,
+    ):
+        self.repo = AuditLogsRepo(db)
+        self.max_events = max_events
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.dropped = 0
+        self._events: list[dict[str, Any]] = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, doc: dict[str, Any]) -> None:
+        self._events.append(doc)
+        overflow = len(self._events) - self.max_buffered
+        if overflow > 0:
+            # Never let audit grow without bound if Mongo is unavailable.
+            del self._events[:overflow]
+            self.dropped += overflow
+        if len(self._events) >= self.max_events:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            batch, self._events = self._events, []
+            if not batch:
+                return 0
+            try:
+                res = await self.repo.col.insert_many(batch, ordered=False)
+                return len(res.inserted_ids)
+            except BulkWriteError as e:
+                written = e.details.get("nInserted", 0)
+                failed = len(e.details.get("writeErrors", []))
+                self.dropped += failed
+                logger.error(f"Audit flush partially failed: {failed} of {len(batch)} events not written")
+                return written
+            except Exception as e:
+                logger.error(f"Audit flush failed, dropping {len(batch)} events: {e}")
+                self.dropped += len(batch)
+                return 0
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self._stopping:
+                return
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Let the writer finish its current insert, flush what is left and exit."""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        # Events added while the last flush was running
+        await self.flush()
+
+
+_buffer: Optional[AuditBuffer] = None
+
+
+async def start_audit_writer(db: AsyncIOMotorDatabase) -> None:
+    """Start the background audit writer (called from the FastAPI lifespan)."""
+    global _buffer
+    if not settings.AUDIT_BUFFER_ENABLED or _buffer is not None:
+        return
+    _buffer = AuditBuffer(
+        db,
+        max_events=settings.AUDIT_FLUSH_MAX_EVENTS,
+        flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        max_buffered=settings.AUDIT_MAX_BUFFERED_EVENTS,
+    )
+    _buffer.start()
+    logger.info("Audit writer started")
+
+
+async def stop_audit_writer() -> None:
+    """Flush pending audit events and stop the writer."""
+    global _buffer
+    if _buffer is None:
+        return
+    await _buffer.stop()
+    if _buffer.dropped:
+        logger.warning(f"Audit writer dropped {_buffer.dropped} events during this run")
+    _buffer = None
+    logger.info("Audit writer stopped")
+
+
+def _sampled_out(action: str) -> bool:
+    rate = settings.AUDIT_SAMPLE_RATES.get(action)
+    if rate is None or rate >= 1.0:
+        return False
+    return random.random() >= rate
+
+
 class AuditService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.repo = AuditLogsRepo(db)
@@ -18,8 +147,15 @@ class AuditService:
         entity_id: Optional[str] = None,
         actor: Optional[str] = None,
         data: Optional[dict[str, Any]] = None,
-    ) -> str:
+    ) -> Optional[str]:
+        """
+        Record an audit event.
+        Returns the event id, or None when the action was sampled out.
+        """
+        if _sampled_out(action):
+            return None
         doc = {
+            "_id": ObjectId(),
             "ts": datetime.utcnow(),
             "action": action,
             "entity": entity,
@@ -27,6 +163,7 @@ class AuditService:
             "actor": actor,
             "data": data or {},
         }
+        if _buffer is not None:
+            _buffer.add(doc)
+            return oid_str(doc["_id"])
         return await self.repo.insert_one(doc)
-
-
@@ -0,0 +1,145 @@
+"""
+posted_at normalization for ingested jobs.
+
+parse_posted_at() accepts what the feeds send:
+- unix seconds or milliseconds (numbers or digit strings)
+- ISO-8601 ("2025-01-15T10:00:00Z", "2025-01-15 10:00:00+02:00", "2025-01-15")
+- RFC 2822 ("Wed, 15 Jan 2025 10:00:00 +0000", as in RSS pubDate)
+- relative times ("5 minutes ago", "2h ago", "an hour ago", "just now")
+- datetimes
+
+It always returns a timezone-aware UTC datetime, or None when the value isn't
+a recognizable time. The format is picked from the string's shape with
+compiled patterns instead of trying parsers until one stops raising.
+
+String parses are memoized in a bounded LRU because one batch tends to repeat
+the same values. Relative strings are cached as offsets, so "5 minutes ago"
+is always resolved against the current time.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import mktime_tz, parsedate_tz
+from functools import lru_cache
+from typing import Any, Optional
+
+CACHE_SIZE = 4096
+
+# Values above this are treated as unix milliseconds.
+_MS_THRESHOLD = 1e12
+
+_ISO_RE = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})"
+    r"(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,6})\d*)?)?)?"
+    r"\s*(Z|[+-]\d{2}(?::?\d{2})?)?",
+    re.IGNORECASE,
+)
+_RFC_RE = re.compile(r"(?:[a-z]{3},\s*)?\d{1,2}\s+[a-z]{3}\s+\d{2,4}\s+\d{1,2}:\d{2}", re.IGNORECASE)
+_RELATIVE_RE = re.compile(
+    r"(\d+|an?)\s*(seconds?|secs?|s|minutes?|mins?|m|hours?|hrs?|h|days?|d|weeks?|wks?|w|months?|mo|years?|yrs?|y)\s+ago\b"
+)
+
+_UNIT_SECONDS = {
+    "s": 1,
+    "m": 60,
+    "h": 3600,
+    "d": 86400,
+    "w": 7 * 86400,
+    "mo": 30 * 86400,
+    "y": 365 * 86400,
+}
+
+
+def _unit(token: str) -> str:
+    if token.startswith("mo"):
+        return "mo"
+    if token.startswith("mi") or token == "m":
+        return "m"
+    return token[0]
+
+
+def _from_epoch(value: float) -> Optional[datetime]:
+    if value < 0:
+        return None
+    seconds = value / 1000 if value > _MS_THRESHOLD else value
+    if seconds > 253402300799:  # past year 9999
+        return None
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=seconds)
+
+
+def _iso(m: re.Match) -> Optional[datetime]:
+    year, month, day, hour, minute, second, fraction, tz = m.groups()
+    month_i, day_i = int(month), int(day)
+    hour_i, minute_i, second_i = int(hour or 0), int(minute or 0), int(second or 0)
+    if not (1 <= month_i <= 12 and 1 <= day_i <= 31 and hour_i <= 23 and minute_i <= 59 and second_i <= 60):
+        return None
+    offset = timedelta(0)
+    if tz and tz.upper() != "Z":
+        digits = tz[1:].replace(":", "")
+        offset = timedelta(hours=int(digits[:2]), minutes=int(digits[2:4] or 0))
+        if tz[0] == "-":
+            offset = -offset
+    try:
+        # Only day-of-month overflow (e.g. Feb 30) can still fail here.
+        dt = datetime(int(year), month_i, day_i, hour_i, minute_i, min(second_i, 59), int((fraction or "0").ljust(6, "0")), tzinfo=timezone.utc)
+    except ValueError:
+        return None
+    return dt - offset
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_text(text: str) -> Optional[tuple[str, Any]]:
+    """("abs", datetime) or ("rel", timedelta before now), or None."""
+    s = text.strip()
+    if not s:
+        return None
+    first = s[0]
+
+    if first.isdigit():
+        if s.isascii() and s.isdigit():
+            dt = _from_epoch(float(s))
+            return ("abs", dt) if dt else None
+        m = _ISO_RE.fullmatch(s)
+        if m:
+            dt = _iso(m)
+            return ("abs", dt) if dt else None
+
+    lowered = s.lower()
+    if lowered.endswith("ago") or "ago " in lowered:
+        m = _RELATIVE_RE.search(lowered)
+        if m:
+            amount = 1 if m.group(1) in ("a", "an") else int(m.group(1))
+            return ("rel", timedelta(seconds=amount * _UNIT_SECONDS[_unit(m.group(2))]))
+        return None
+    if lowered in ("just now", "now"):
+        return ("rel", timedelta(0))
+
+    if _RFC_RE.match(s):
+        parsed = parsedate_tz(s)
+        if parsed is not None:
+            return ("abs", _from_epoch(mktime_tz(parsed)))
+    return None
+
+
+def parse_posted_at(value: Any, *, now: Optional[datetime] = None) -> Optional[datetime]:
+    """Normalize a posted time to an aware UTC datetime (None if unrecognized)."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    if isinstance(value, (int, float)):
+        return _from_epoch(float(value))
+    if not isinstance(value, str):
+        return None
+
+    parsed = _parse_text(value)
+    if parsed is None:
+        return None
+    kind, v = parsed
+    if kind == "abs":
+        return v
+    return (now or datetime.now(timezone.utc)) - v
+
+
+def cache_info() -> dict[str, int]:
+    info = _parse_text.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize or 0}
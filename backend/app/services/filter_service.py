@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import json
 from typing import Any
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -7,6 +9,16 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from ..repositories.collections import GeoFiltersRepo, KeywordConfigRepo
 
 
+def normalize_region(value: Any) -> str:
+    """Region / excluded country as geo_match compares it (surrounding whitespace dropped)."""
+    return str(value or "").strip()
+
+
+def excluded_regions(geo: dict[str, Any]) -> list[str]:
+    """Normalized, de-duplicated excluded_countries of a geo filters document."""
+    return sorted({normalize_region(c) for c in geo.get("excluded_countries") or []} - {""})
+
+
 class FilterService:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.keywords = KeywordConfigRepo(db)
@@ -23,6 +35,26 @@ class FilterService:
         doc = await self.geo.find_one({"_key": "geo"})
         return doc or {}
 
+    async def load_rules(self) -> tuple[dict[str, Any], list[dict[str, Any]], dict[str, Any]]:
+        """Keyword settings, enabled keywords and geo filters in one call."""
+        return await self.load_keyword_settings(), await self.load_keywords(), await self.load_geo()
+
+    @staticmethod
+    def rules_snapshot(settings: dict[str, Any], keywords: list[dict[str, Any]], geo: dict[str, Any]) -> dict[str, Any]:
+        """The parts of the filter config that affect keyword_match/geo_match."""
+        return {
+            "match_mode": settings.get("match_mode"),
+            "match_locations": sorted(settings.get("match_locations") or []),
+            "terms": sorted({str(k.get("term") or "").lower() for k in keywords if k.get("term")}),
+            "excluded_countries": excluded_regions(geo),
+        }
+
+    @staticmethod
+    def rules_version(snapshot: dict[str, Any]) -> str:
+        """Stable short hash of a rules snapshot, recorded on each evaluated job."""
+        material = json.dumps(snapshot, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
     def keyword_match(self, job: dict[str, Any], *, settings: dict[str, Any], keywords: list[dict[str, Any]]) -> tuple[bool, list[str]]:
         """
         Applies keyword rules from Mongo.
@@ -59,8 +91,8 @@ class FilterService:
         return False, ["no_keywords_matched"]
 
     def geo_match(self, job: dict[str, Any], geo: dict[str, Any]) -> tuple[bool, list[str]]:
-        excluded = geo.get("excluded_countries") or []
-        region = (job.get("region") or "").strip()
+        excluded = excluded_regions(geo)
+        region = normalize_region(job.get("region"))
         if not excluded or not region:
             return True, []
         if region in excluded:
@@ -1,5 +1,7 @@
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Callable, Optional
 import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
 
 from ..core.settings import settings
@@ -7,6 +9,38 @@ from ..core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Process-wide timings for Gemini calls, used to size GEMINI_EXECUTOR_WORKERS.
+_stats: dict[str, float] = {
+    "calls": 0,
+    "errors": 0,
+    "in_flight": 0,
+    "queue_wait_total_ms": 0.0,
+    "queue_wait_max_ms": 0.0,
+    "call_total_ms": 0.0,
+    "call_max_ms": 0.0,
+}
+
+
+def gemini_stats() -> dict[str, Any]:
+    calls = _stats["calls"]
+    return {
+        **_stats,
+        "mode": "async" if settings.GEMINI_USE_ASYNC else "executor",
+        "executor_workers": settings.GEMINI_EXECUTOR_WORKERS,
+        "queue_wait_avg_ms": (_stats["queue_wait_total_ms"] / calls) if calls else 0.0,
+        "call_avg_ms": (_stats["call_total_ms"] / calls) if calls else 0.0,
+    }
+
+
+def _record(queue_wait_ms: float, call_ms: float, ok: bool) -> None:
+    _stats["calls"] += 1
+    if not ok:
+        _stats["errors"] += 1
+    _stats["queue_wait_total_ms"] += queue_wait_ms
+    _stats["queue_wait_max_ms"] = max(_stats["queue_wait_max_ms"], queue_wait_ms)
+    _stats["call_total_ms"] += call_ms
+    _stats["call_max_ms"] = max(_stats["call_max_ms"], call_ms)
+
 
 class GeminiService:
     def __init__(self, *, api_key: Optional[str] = None):
@@ -15,11 +49,72 @@ class GeminiService:
             raise RuntimeError("GEMINI_API_KEY is not configured")
         genai.configure(api_key=key)
         self.model = genai.GenerativeModel('gemini-pro')
+        # Own pool so slow Gemini calls don't starve asyncio's default executor.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if not settings.GEMINI_USE_ASYNC:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.GEMINI_EXECUTOR_WORKERS,
+                thread_name_prefix="gemini",
+            )
+
+    async def _call(self, fn: Callable[[], Any]) -> Any:
+        """Run a blocking SDK call on the Gemini pool, recording queue wait and duration."""
+        submitted = time.perf_counter()
+        started: list[float] = []
+
+        def timed() -> Any:
+            started.append(time.perf_counter())
+            return fn()
+
+        _stats["in_flight"] += 1
+        ok = False
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+            ok = True
+            return result
+        finally:
+            _stats["in_flight"] -= 1
+            done = time.perf_counter()
+            start = started[0] if started else done
+            _record((start - submitted) * 1000, (done - start) * 1000, ok)
+
+    async def _call_async(self, full_prompt: str, generation_config: Any) -> Any:
+        started = time.perf_counter()
+        _stats["in_flight"] += 1
+        ok = False
+        try:
+            result = await self.model.generate_content_async(
+                full_prompt,
+                generation_config=generation_config,
+            )
+            ok = True
+            return result
+        finally:
+            _stats["in_flight"] -= 1
+            _record(0.0, (time.perf_counter() - started) * 1000, ok)
+
+    @staticmethod
+    def _usage(response: Any) -> dict[str, Any]:
+        usage = {}
+        if hasattr(response, 'usage_metadata') and response.usage_metadata:
+            usage = {
+                "prompt_tokens": getattr(response.usage_metadata, 'prompt_token_count', 0),
+                "completion_tokens": getattr(response.usage_metadata, 'completion_token_count', 0),
+                "total_tokens": getattr(response.usage_metadata, 'total_token_count', 0),
+            }
+        return usage
+
+    @staticmethod
+    def _finish_reason(response: Any) -> str:
+        if response.candidates and len(response.candidates) > 0:
+            return str(response.candidates[0].finish_reason)
+        return "unknown"
 
     async def generate(self, *, model: str, temperature: float, max_tokens: int, prompt: str) -> tuple[str, dict[str, Any]]:
         """
         Generate text using Google Gemini API.
-        Note: Gemini SDK is synchronous, so we run it in a thread pool.
+        Uses the SDK's async client, or the dedicated thread pool when
+        GEMINI_USE_ASYNC is disabled.
         """
         try:
             # Configure generation parameters
@@ -27,44 +122,64 @@ class GeminiService:
                 temperature=temperature,
                 max_output_tokens=max_tokens,
             )
-            
+
             # Combine system message and user prompt
             full_prompt = f"You are an Upwork proposal assistant.\n\n{prompt}"
-            
-            # Run synchronous Gemini call in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.model.generate_content(
-                    full_prompt,
-                    generation_config=generation_config,
+
+            if self._executor is None:
+                response = await self._call_async(full_prompt, generation_config)
+            else:
+                response = await self._call(
+                    lambda: self.model.generate_content(
+                        full_prompt,
+                        generation_config=generation_config,
+                    )
                 )
-            )
-            
+
             text = response.text or ""
-            
-            # Extract usage info if available
-            usage = {}
-            if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                usage = {
-                    "prompt_tokens": getattr(response.usage_metadata, 'prompt_token_count', 0),
-                    "completion_tokens": getattr(response.usage_metadata, 'completion_token_count', 0),
-                    "total_tokens": getattr(response.usage_metadata, 'total_token_count', 0),
-                }
-            
-            # Get candidate finish reason
-            finish_reason = "unknown"
-            if response.candidates and len(response.candidates) > 0:
-                finish_reason = str(response.candidates[0].finish_reason)
-            
+
             meta = {
-                "id": finish_reason,
+                "id": self._finish_reason(response),
                 "model": "gemini-pro",
-                "usage": usage,
+                "usage": self._usage(response),
             }
-            
+
             return text, meta
         except Exception as e:
             logger.error(f"Gemini API error: {e}", exc_info=True)
-            raise RuntimeError(f"Failed to generate with Gemini: {str(e)}")
+            raise RuntimeError(f"Failed to generate with Gemini: {str(e)}") from e
+
+    async def stream(self, *, model: str, temperature: float, max_tokens: int, prompt: str) -> AsyncIterator[tuple[str, Optional[dict[str, Any]]]]:
+        """
+        Stream text from Gemini using generate_content(stream=True).
+        Yields (text_delta, None) per chunk, then ("", meta) once the stream ends.
+        """
+        generation_config = genai.types.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+        )
+        full_prompt = f"You are an Upwork proposal assistant.\n\n{prompt}"
+        try:
+            response = await self.model.generate_content_async(
+                full_prompt,
+                generation_config=generation_config,
+                stream=True,
+            )
+            async for chunk in response:
+                text = getattr(chunk, "text", "") or ""
+                if text:
+                    yield text, None
+        except Exception as e:
+            logger.error(f"Gemini streaming error: {e}", exc_info=True)
+            raise RuntimeError(f"Failed to stream with Gemini: {str(e)}") from e
+
+        yield "", {
+            "id": self._finish_reason(response),
+            "model": "gemini-pro",
+            "usage": self._usage(response),
+        }
 
+    async def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,58 @@
+"""
+Ranking features computed once when a job is stored.
+
+rank_jobs only needs a handful of numbers per job; keeping them in a compact
+`features` sub-document lets it read that projection instead of pulling and
+rescanning full descriptions on every call.
+"""
+from typing import Any, Iterable, Optional
+
+FEATURES_VERSION = 1
+
+QUALITY_INDICATORS = ("experience", "requirements", "skills", "project", "deliverables")
+
+# Budgets at or above this count as the top of the range for ranking.
+BUDGET_CAP = 200.0
+
+
+def normalize_skill(skill: str) -> str:
+    return skill.strip().lower()
+
+
+def normalize_skills(skills: Optional[Iterable[str]]) -> list[str]:
+    """Lowercased, de-duplicated skill ids in first-seen order."""
+    return list(dict.fromkeys(normalize_skill(s) for s in skills or [] if s and s.strip()))
+
+
+def normalize_budget(budget: Optional[float]) -> Optional[float]:
+    """Budget scaled to 0-1 against BUDGET_CAP (None when there is no budget)."""
+    return min(budget / BUDGET_CAP, 1.0) if budget is not None else None
+
+
+def compute_features(
+    *,
+    description: Optional[str],
+    skills: Optional[Iterable[str]],
+    budget: Optional[float],
+    proposals: Optional[int],
+) -> dict[str, Any]:
+    text = description or ""
+    lowered = text.lower()
+    return {
+        "v": FEATURES_VERSION,
+        "word_count": len(text.split()),
+        "indicator_hits": sum(1 for indicator in QUALITY_INDICATORS if indicator in lowered),
+        "skills": normalize_skills(skills),
+        "budget_normalized": normalize_budget(budget),
+        "proposals": proposals,
+    }
+
+
+def features_for(job: dict[str, Any]) -> dict[str, Any]:
+    """Features for a stored job document (used to backfill older documents)."""
+    return compute_features(
+        description=job.get("description"),
+        skills=job.get("skills"),
+        budget=job.get("budget"),
+        proposals=job.get("proposals"),
+    )
@@ -0,0 +1,403 @@
+"""
+The /ingest/jobs pipeline: validate, store in jobs_raw (deduplicated by job_key)
+with the original payload in job_payloads, filter into jobs_filtered and audit
+each item.
+
+JobIngestService is fed items in one or more chunks via add(), so large or
+streamed payloads can be ingested without materializing them first.
+finish() schedules ranking updates, updates feed status and returns the
+JobIngestResponse totals for the whole run.
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..repositories.base import oid_str, to_object_id
+from ..repositories.collections import FeedStatusRepo, JobsFilteredRepo, JobsRawRepo
+from ..schemas.jobs import JobIngestItem, JobIngestResponse
+from .audit import AuditService
+from .filter_service import FilterService
+from .job_features import compute_features
+from .job_key import canonical_job_key
+from .job_payloads import JobPayloadStore
+from .job_ranking import schedule_ranking_update
+from .recent_urls import recent_urls
+
+logger = get_logger(__name__)
+
+# Fields whose change makes a re-ingested job worth rewriting, re-filtering and rescoring
+# (job_key rather than url, so tracking-parameter variants of a url are no change).
+# posted_at is left out: feeds send relative times ("5 minutes ago") that parse to
+# a different instant on every resend. It is still rewritten when other content changes.
+CONTENT_FIELDS = ("title", "description", "job_key", "source", "region", "skills", "budget", "proposals", "client")
+
+
+def content_hash(doc: dict[str, Any]) -> str:
+    """Stable hash of a job's CONTENT_FIELDS (key order and the raw payload don't matter)."""
+    material = json.dumps({k: doc.get(k) for k in CONTENT_FIELDS}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+async def update_feed_status(
+    db: AsyncIOMotorDatabase,
+    source: str,
+    success: bool = True,
+    new_jobs_count: int = 0,
+    error: Optional[str] = None,
+) -> None:
+    """Update feed status after ingestion."""
+    feed_repo = FeedStatusRepo(db)
+    now = datetime.utcnow()
+    
+    update_doc: dict[str, any] = {  # type: ignore
+        "source": source,
+        "last_fetch_at": now,
+        "updated_at": now,
+    }
+    
+    if success:
+        update_doc["last_successful_fetch_at"] = now
+        update_doc["error_count"] = 0
+        update_doc["last_error"] = None
+        if new_jobs_count > 0:
+            update_doc["metadata"] = {
+                **update_doc.get("metadata", {}),
+                "last_new_jobs": new_jobs_count,
+            }
+    else:
+        # Increment error count
+        existing = await feed_repo.find_one({"source": source})
+        error_count = (existing.get("error_count", 0) if existing else 0) + 1
+        update_doc["error_count"] = error_count
+        update_doc["last_error"] = error
+    
+    await feed_repo.update_one(
+        {"source": source},
+        {"$set": update_doc},
+        upsert=True
+    )
+
+
+class JobIngestService:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.raw_repo = JobsRawRepo(db)
+        self.filtered_repo = JobsFilteredRepo(db)
+        self.filters = FilterService(db)
+        self.audit = AuditService(db)
+        self.payloads = JobPayloadStore(db)
+
+        self.settings_doc: dict[str, Any] = {}
+        self.keywords: list[dict[str, Any]] = []
+        self.geo: dict[str, Any] = {}
+        self.filter_version = ""
+
+        self.received = 0
+        self.inserted_raw = 0
+        self.inserted_filtered = 0
+        self.deduped = 0
+        self.unchanged = 0
+        self.errors: list[str] = []
+        self.sources_seen: set[str] = set()
+        self.ranked_urls: list[str] = []
+
+    async def load_filters(self) -> None:
+        """Load keyword/geo filters once for the whole run."""
+        self.settings_doc, self.keywords, self.geo = await self.filters.load_rules()
+        self.filter_version = FilterService.rules_version(FilterService.rules_snapshot(self.settings_doc, self.keywords, self.geo))
+
+    def skip(self, reason: str) -> None:
+        """Count an item that couldn't be turned into a JobIngestItem."""
+        self.errors.append(f"Job {self.received}: {reason}")
+        self.received += 1
+
+    async def add(self, items: Iterable[JobIngestItem]) -> None:
+        """
+        Ingest a chunk of items; job numbers in errors continue across chunks.
+        Jobs are deduplicated by job_key (see services.job_key), so the same
+        job under another url updates the stored one, which keeps its url.
+        Items whose content hash and filter version match the stored job only
+        get last_seen_at bumped. Stored jobs are looked up in one query per
+        chunk, skipping keys the recent-url filter has not seen.
+        """
+        items = list(items)
+        keys: dict[str, str] = {}  # job_key -> url
+        for item in items:
+            url = item.url.strip().rstrip("/") if item.url else ""
+            key = canonical_job_key(url)
+            if key is not None:
+                keys.setdefault(key, url)
+        # Keys the recent-url filter has never seen are new: no lookup needed
+        recent = recent_urls("jobs_raw")
+        if recent is not None:
+            keys = {key: url for key, url in keys.items() if recent.might_contain(key)}
+        known: dict[str, dict[str, Any]] = {}
+        if keys:
+            # Jobs stored before job_key existed are only found by url
+            query = {"$or": [{"job_key": {"$in": list(keys)}}, {"url": {"$in": list(keys.values())}}]}
+            async for d in self.raw_repo.col.find(query, {"url": 1, "job_key": 1, "content_hash": 1, "filter_version": 1}):
+                known[d.get("job_key") or canonical_job_key(d["url"])] = d
+        if recent is not None:
+            for key in keys:
+                recent.record_lookup(key in known)
+        unchanged: list[Any] = []
+        payloads: dict[Any, dict[str, Any]] = {}  # job _id -> payload, written to job_payloads once per chunk
+
+        for item in items:
+            idx = self.received
+            self.received += 1
+            try:
+                # Validate required fields: title, url, client_name, budget
+                if not item.title or not item.title.strip():
+                    self.errors.append(f"Job {idx}: Missing or empty title")
+                    continue
+                
+                if not item.url or not item.url.strip():
+                    self.errors.append(f"Job {idx}: Missing or empty URL")
+                    continue
+                
+                # Validate URL format
+                if not item.url.startswith(("http://", "https://")):
+                    self.errors.append(f"Job {idx}: Invalid URL format: {item.url}")
+                    continue
+                
+                # Validate client name
+                client_name = item.client_name if hasattr(item, 'client_name') else (item.client.get("name") if item.client and isinstance(item.client, dict) else None)
+                if not client_name or not str(client_name).strip():
+                    self.errors.append(f"Job {idx}: Missing or empty client name")
+                    continue
+                
+                # Validate budget
+                if item.budget is None:
+                    self.errors.append(f"Job {idx}: Missing budget")
+                    continue
+                
+                if not isinstance(item.budget, (int, float)) or item.budget < 0:
+                    self.errors.append(f"Job {idx}: Invalid budget (must be a positive number): {item.budget}")
+                    continue
+                
+                # Normalize URL (remove trailing slash, etc.)
+                normalized_url = item.url.strip().rstrip("/")
+                job_key = canonical_job_key(normalized_url)
+                if job_key is None:
+                    self.errors.append(f"Job {idx}: Invalid URL format: {item.url}")
+                    continue
+                
+                # Track sources
+                self.sources_seen.add(item.source)
+                
+                now = datetime.utcnow()
+                
+                # Extract client name (from client_name field or client.name)
+                client_name_value = item.client_name if hasattr(item, 'client_name') else (item.client.get("name") if item.client and isinstance(item.client, dict) else "")
+                
+                # Ensure client dict has name field
+                client_dict = item.client.copy() if item.client else {}
+                client_dict["name"] = client_name_value.strip()
+
+                content = {
+                    "title": item.title.strip(),
+                    "description": (item.description or "").strip(),  # Description is now optional
+                    "url": normalized_url,
+                    "job_key": job_key,
+                    "source": item.source,
+                    "region": item.region,
+                    "posted_at": item.posted_at,
+                    "skills": [s.strip() for s in item.skills if s and s.strip()],  # Clean skills
+                    "budget": float(item.budget),  # Budget is now required
+                    "proposals": item.proposals,  # Store proposal count if provided
+                    "client": client_dict,  # Client dict with name
+                }
+                digest = content_hash(content)
+
+                # Resent without changes: nothing to rewrite, re-filter or rescore
+                stored = known.get(job_key)
+                if stored and stored.get("content_hash") == digest and stored.get("filter_version") == self.filter_version:
+                    self.deduped += 1
+                    self.unchanged += 1
+                    unchanged.append(stored["_id"])
+                    if recent is not None:
+                        recent.add(job_key)
+                    logger.debug(f"Unchanged job: {job_key}")
+                    continue
+
+                ok_kw, reasons_kw = self.filters.keyword_match(item.model_dump(mode="json"), settings=self.settings_doc, keywords=self.keywords)
+                ok_geo, reasons_geo = self.filters.geo_match(item.model_dump(mode="json"), self.geo)
+                reasons = reasons_kw + reasons_geo
+                features = compute_features(
+                    description=item.description,
+                    skills=item.skills,
+                    budget=float(item.budget),
+                    proposals=item.proposals,
+                )
+                
+                raw_doc = {
+                    **content,
+                    "features": features,
+                    "content_hash": digest,
+                    "filter_version": self.filter_version,
+                    "filter_passed": ok_kw and ok_geo,
+                    "filter_reasons": reasons,
+                    "created_at": now,
+                    "updated_at": now,
+                    "last_seen_at": now,
+                }
+
+                raw_id: Optional[str] = None
+                if stored is None:
+                    try:
+                        raw_id = await self.raw_repo.insert_one(raw_doc)
+                        self.inserted_raw += 1
+                        logger.debug(f"Inserted new job: {normalized_url}")
+                    except DuplicateKeyError:
+                        # Inserted concurrently since the lookup above
+                        stored = await self.raw_repo.col.find_one(
+                            {"$or": [{"job_key": job_key}, {"url": normalized_url}]}, {"_id": 1, "url": 1}
+                        )
+                if stored is not None:
+                    self.deduped += 1
+                    # Content (or the filters) changed: rewrite everything but url and created_at
+                    await self.raw_repo.update_one(
+                        {"_id": stored["_id"]},
+                        {
+                            "$set": {k: v for k, v in raw_doc.items() if k not in ("url", "created_at")},
+                            "$unset": {"raw": ""},  # embedded payload from before job_payloads
+                        },
+                    )
+                    raw_id = oid_str(stored["_id"])
+                    normalized_url = stored["url"]
+                    logger.debug(f"Deduplicated job (content changed): {job_key}")
+                if raw_id is not None:
+                    # Repeats of this job later in the chunk compare against what was just written
+                    known[job_key] = {"_id": to_object_id(raw_id), "url": normalized_url, "content_hash": digest, "filter_version": self.filter_version}
+                    payloads[to_object_id(raw_id)] = item.raw
+                    if recent is not None:
+                        recent.add(job_key)
+
+                # Log filter results for debugging
+                logger.debug(
+                    f"Job {idx} filter check: keyword_match={ok_kw} (reasons: {reasons_kw}), "
+                    f"geo_match={ok_geo} (reasons: {reasons_geo}), "
+                    f"settings={self.settings_doc}, keywords_count={len(self.keywords)}, geo={self.geo}"
+                )
+
+                if ok_kw and ok_geo:
+                    filtered_doc = {
+                        "raw_id": raw_id,
+                        "title": content["title"],
+                        "description": content["description"],
+                        "url": normalized_url,
+                        "job_key": job_key,
+                        "source": item.source,
+                        "region": item.region,
+                        "posted_at": item.posted_at,
+                        "skills": content["skills"],
+                        "budget": item.budget,  # Store budget if provided
+                        "proposals": item.proposals,  # Store proposal count if provided
+                        "client": item.client,
+                        "filter_reasons": reasons,
+                        "features": features,
+                        "metadata": {},
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    # Upsert by the stored job's url - $setOnInsert only carries fields $set doesn't touch
+                    filtered_set = {
+                        "updated_at": now,
+                        "raw_id": raw_id,
+                        "job_key": job_key,
+                        "title": content["title"],
+                        "description": content["description"],
+                        "source": item.source,
+                        "region": item.region,
+                        "posted_at": item.posted_at,
+                        "skills": content["skills"],
+                        "budget": item.budget,
+                        "proposals": item.proposals,
+                        "client": item.client,
+                        "filter_reasons": reasons,
+                        "features": features,
+                        "content_hash": digest,
+                        "filter_version": self.filter_version,
+                    }
+                    await self.filtered_repo.update_one(
+                        {"url": normalized_url},
+                        {
+                            "$setOnInsert": {k: v for k, v in filtered_doc.items() if k not in filtered_set},
+                            "$set": filtered_set,
+                        },
+                        upsert=True
+                    )
+                    self.inserted_filtered += 1
+                    self.ranked_urls.append(normalized_url)
+                elif stored is not None:
+                    # Changed job no longer passes: drop the stale jobs_filtered row (as RefilterService does)
+                    await self.filtered_repo.col.delete_one({"url": normalized_url})
+                    self.ranked_urls.append(normalized_url)
+
+                await self.audit.log(
+                    action="job_ingested",
+                    entity="jobs_raw",
+                    entity_id=raw_id,
+                    data={
+                        "url": normalized_url,
+                        "passed_filters": ok_kw and ok_geo,
+                        "reasons": reasons,
+                    }
+                )
+            except Exception as e:
+                error_msg = f"Job {idx}: Error processing job - {str(e)}"
+                self.errors.append(error_msg)
+                logger.error(error_msg, exc_info=True)
+                continue
+
+        if payloads:
+            await self.payloads.save_many("jobs_raw", payloads.items())
+        if unchanged:
+            await self.raw_repo.col.update_many({"_id": {"$in": unchanged}}, {"$set": {"last_seen_at": datetime.utcnow()}})
+
+    async def finish(self) -> JobIngestResponse:
+        """Post-run bookkeeping (rankings, feed status, logging) and the run totals."""
+        if self.ranked_urls and settings.RANKING_UPDATE_ON_INGEST:
+            schedule_ranking_update(self.db, self.ranked_urls)
+
+        # Update feed status for each source
+        for source in self.sources_seen:
+            try:
+                await update_feed_status(
+                    db=self.db,
+                    source=source,
+                    success=len(self.errors) == 0,
+                    new_jobs_count=self.inserted_raw,
+                    error="; ".join(self.errors) if self.errors else None,
+                )
+            except Exception as e:
+                logger.error(f"Failed to update feed status for {source}: {e}")
+
+        logger.info(
+            f"Job ingestion completed: received={self.received}, "
+            f"inserted_raw={self.inserted_raw}, inserted_filtered={self.inserted_filtered}, "
+            f"deduped={self.deduped}, unchanged={self.unchanged}, errors={len(self.errors)}, sources={list(self.sources_seen)}"
+        )
+        
+        # Log feed health summary
+        for source in self.sources_seen:
+            source_count = await self.raw_repo.col.count_documents({"source": source})
+            logger.info(f"Feed health - Source: {source}, Total jobs: {source_count}, New jobs this run: {self.inserted_raw}")
+
+        if self.errors:
+            logger.warning(f"Ingestion errors: {self.errors}")
+
+        return JobIngestResponse(
+            received=self.received,
+            inserted_raw=self.inserted_raw,
+            inserted_filtered=self.inserted_filtered,
+            deduped=self.deduped,
+            unchanged=self.unchanged,
+        )
@@ -0,0 +1,44 @@
+"""
+Canonical job keys for deduplicating jobs across sources.
+
+The same Upwork job arrives under many URLs: /jobs/~01..., /jobs/Title_~01...,
+/freelance-jobs/apply/..., with ?source=rss or referrer params, with the tilde
+percent-encoded, or wrapped in a Vollna go?url= tracking link. All of them
+carry the job's ciphertext id, so the key is "upwork:~<id>". Other URLs fall
+back to the URL without tracking parameters, fragment or trailing slash.
+
+jobs_raw, jobs_filtered and vollna_jobs store the key as job_key (unique).
+"""
+import re
+from typing import Optional
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+_CIPHERTEXT_RE = re.compile(r"~(0[0-9a-f]{8,})", re.IGNORECASE)
+_TRACKING_PARAMS = {"ref", "referrer", "source", "src", "frkscc", "fbclid", "gclid", "mc_cid", "mc_eid"}
+
+
+def canonical_job_key(url: Optional[str]) -> Optional[str]:
+    """Stable dedup key for a job URL, or None when there is no usable URL (no host)."""
+    if not isinstance(url, str) or not url.strip():
+        return None
+    # Twice: Vollna tracking links double-encode the target URL
+    text = unquote(unquote(url.strip()))
+    if "upwork" in text.lower():
+        match = _CIPHERTEXT_RE.search(text)
+        if match:
+            return f"upwork:~{match.group(1).lower()}"
+
+    try:
+        parts = urlsplit(text)
+    except ValueError:
+        return None  # e.g. an unbalanced IPv6 bracket
+    host = parts.netloc.lower()
+    if not host:
+        return None
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/"), urlencode(query), ""))
@@ -0,0 +1,264 @@
+"""
+Table-driven field extraction for third-party job payloads (Vollna, Upwork JSON).
+
+Each source declares, per output field, the candidate keys to probe in
+priority order and how to coerce the raw value. FieldTable compiles that
+once into per-candidate getters. It also memoizes, per payload shape (the
+job's key tuple), which candidates are present at all. Jobs in a batch
+usually share a shape, so later jobs only look at keys that exist.
+
+Dotted candidates ("client.name") read nested dicts; their presence is decided
+by the top-level key.
+"""
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from .date_parser import parse_posted_at
+
+_NUMBER_RE = re.compile(r"\d+")
+# "Job Title (Hourly Rate: 3 - 10 USD)" -> ("3", "10")
+TITLE_RATE_RE = re.compile(r"\(.*?:\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)")
+# Upwork RSS descriptions: "Budget: $500" / "Hourly Range: $15.00-$40.00"
+RSS_BUDGET_RE = re.compile(r"(?:budget|hourly range)\s*:\s*\$?([\d,]+(?:\.\d+)?)(?:\s*-\s*\$?([\d,]+(?:\.\d+)?))?", re.IGNORECASE)
+
+_MISSING = object()
+_MAX_SHAPES = 256
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _not_none(value: Any) -> bool:
+    return value is not None
+
+
+def stripped(value: Any) -> Optional[str]:
+    return value.strip() if isinstance(value, str) else None
+
+
+def number(value: Any) -> Optional[float]:
+    """50 / "50" / "$5,000" -> float; a "$50-$100" range averages the first two numbers."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        numbers = _NUMBER_RE.findall(value.replace(",", ""))
+        if len(numbers) >= 2:
+            return (float(numbers[0]) + float(numbers[1])) / 2
+        if numbers:
+            return float(numbers[0])
+    return None
+
+
+def count(value: Any) -> Optional[int]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def place(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return value.get("name") or value.get("title") or value.get("country")
+    return None
+
+
+def skill_list(value: Any) -> Optional[list[str]]:
+    """["Python", {"name": "Go"}] or "Python, Go" -> ["Python", "Go"]."""
+    if isinstance(value, list):
+        skills = []
+        for skill in value:
+            if isinstance(skill, str):
+                skills.append(skill.strip())
+            elif isinstance(skill, dict):
+                name = skill.get("name") or skill.get("title") or skill.get("label")
+                if name:
+                    skills.append(str(name).strip())
+        return skills
+    if isinstance(value, str):
+        return [s.strip() for s in value.split(",") if s.strip()]
+    return None
+
+
+def timestamp(value: Any) -> Optional[datetime]:
+    """Unix seconds/milliseconds, ISO-8601/RFC 2822/relative strings or datetimes, as aware UTC."""
+    return parse_posted_at(value)
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """
+    candidates: keys probed in priority order.
+    coerce: raw value -> normalized value (None when unusable).
+    accept: whether a coerced value ends the search (default: truthy).
+    allow_falsy: also coerce falsy raw values (e.g. a proposal count of 0);
+        otherwise they are skipped, like the `a or b or c` chains this replaces.
+    first_present: stop at the first candidate present in the job, even if it
+        yields nothing.
+    keep_rejected: when no candidate is accepted, use the first coerced value
+        that was rejected (e.g. a budget of 0 a later key didn't improve on)
+        instead of the default.
+    """
+
+    candidates: tuple[str, ...]
+    coerce: Callable[[Any], Any] = _identity
+    accept: Callable[[Any], bool] = bool
+    allow_falsy: bool = False
+    first_present: bool = False
+    keep_rejected: bool = False
+    default: Any = None
+
+
+def _getter(candidate: str) -> Callable[[dict[str, Any]], Any]:
+    if "." not in candidate:
+        return lambda job: job.get(candidate, _MISSING)
+    parts = candidate.split(".")
+
+    def get(job: dict[str, Any]) -> Any:
+        cur: Any = job
+        for part in parts:
+            if not isinstance(cur, dict) or part not in cur:
+                return _MISSING
+            cur = cur[part]
+        return cur
+
+    return get
+
+
+@dataclass
+class FieldTable:
+    rules: dict[str, FieldRule]
+    _getters: dict[str, Callable[[dict[str, Any]], Any]] = field(default_factory=dict, init=False, repr=False)
+    _plans: dict[tuple, list[tuple[str, FieldRule, tuple[str, ...]]]] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for rule in self.rules.values():
+            for candidate in rule.candidates:
+                self._getters.setdefault(candidate, _getter(candidate))
+
+    def _plan(self, shape: tuple) -> list[tuple[str, FieldRule, tuple[str, ...]]]:
+        plan = self._plans.get(shape)
+        if plan is None:
+            keys = set(shape)
+            plan = [
+                (name, rule, tuple(c for c in rule.candidates if c.split(".", 1)[0] in keys))
+                for name, rule in self.rules.items()
+            ]
+            if len(self._plans) >= _MAX_SHAPES:
+                self._plans.clear()
+            self._plans[shape] = plan
+        return plan
+
+    def extract(self, job: dict[str, Any], *, winners: Optional[dict[str, str]] = None) -> dict[str, Any]:
+        """
+        Normalized values for every field in the table. If `winners` is given it
+        receives the candidate key each value came from.
+        """
+        out: dict[str, Any] = {}
+        for name, rule, present in self._plan(tuple(job)):
+            value = rule.default
+            rejected: Optional[tuple[str, Any]] = None
+            for candidate in present:
+                raw = self._getters[candidate](job)
+                if raw is _MISSING:
+                    continue
+                coerced = rule.coerce(raw) if raw or (rule.allow_falsy and raw is not None) else None
+                if coerced is not None and rule.accept(coerced):
+                    value = coerced
+                    if winners is not None:
+                        winners[name] = candidate
+                    rejected = None
+                    break
+                if coerced is not None and rule.keep_rejected and rejected is None:
+                    rejected = (candidate, coerced)
+                if rule.first_present:
+                    break
+            if rejected is not None:
+                value = rejected[1]
+                if winners is not None:
+                    winners[name] = rejected[0]
+            out[name] = value
+        return out
+
+
+_SKILL_KEYS = ("skills", "categories", "tags", "expertise", "technologies")
+_REGION_KEYS = ("country", "location", "region", "clientCountry", "clientLocation")
+
+# /ingest/vollna (n8n-forwarded Vollna payloads)
+VOLLNA_INGEST_FIELDS = FieldTable(
+    {
+        "title": FieldRule(("title", "jobTitle", "name", "subject"), stripped, default=""),
+        "description": FieldRule(("description", "snippet", "body", "text"), stripped, default=""),
+        "url": FieldRule(("url", "jobUrl", "link", "ciphertext", "jobLink"), stripped, default=""),
+        "posted_at": FieldRule(("postedOn", "posted_at", "createdAt", "publishedAt", "date", "pubDate", "created_at"), timestamp),
+        "skills": FieldRule(_SKILL_KEYS, skill_list, accept=_not_none, first_present=True),
+        "client_name": FieldRule(("client_name", "clientName", "client.name", "client.clientName"), stripped, default=""),
+        # A budget of 0 is real; it only loses to a non-zero budget under a later key
+        "budget": FieldRule(("budget", "hourlyRate", "fixedPrice", "rate", "price", "budgetValue", "budget_value"), number, allow_falsy=True, keep_rejected=True),
+        "proposals": FieldRule(("proposals", "proposalCount", "numProposals", "applicants", "applicantCount"), count, accept=_not_none, allow_falsy=True),
+        "region": FieldRule(_REGION_KEYS, place),
+    }
+)
+
+# /ingest/convert/upwork-json (Upwork web API responses)
+UPWORK_JSON_FIELDS = FieldTable(
+    {
+        "title": FieldRule(("title", "jobTitle", "name", "subject"), default=""),
+        "description": FieldRule(("description", "snippet", "body", "text"), default=""),
+        "url": FieldRule(("url", "jobUrl", "link", "ciphertext"), default=""),
+        "posted_at": FieldRule(("postedOn", "createdAt", "publishedAt", "date", "pubDate", "posted_at", "created_at"), timestamp),
+        "skills": FieldRule(_SKILL_KEYS, skill_list, accept=_not_none, first_present=True),
+        "region": FieldRule(_REGION_KEYS, place),
+    }
+)
+
+_present = {"accept": _not_none, "allow_falsy": True, "first_present": True}
+
+# Client sub-object shared by the Vollna ingest and Upwork JSON paths
+CLIENT_FIELDS = FieldTable(
+    {
+        "payment_verified": FieldRule(("paymentVerified", "payment_verified"), default=False, **_present),
+        "phone_verified": FieldRule(("phoneVerified", "phone_verified"), default=False, **_present),
+        "rating": FieldRule(("rating", "totalRating")),
+        "reviews": FieldRule(("reviewsCount", "reviews")),
+        "total_spent": FieldRule(("totalSpent", "total_spent")),
+        "hiring_rate": FieldRule(("hiringRate", "hiring_rate")),
+    }
+)
+
+
+def client_info(client: Any) -> dict[str, Any]:
+    """Normalized client fields with missing values dropped."""
+    if not isinstance(client, dict):
+        return {}
+    return {k: v for k, v in CLIENT_FIELDS.extract(client).items() if v is not None}
+
+
+WEBHOOK_TIME_KEYS = (
+    "posted_at", "posted_on", "created_at", "pubDate", "published",
+    "published_at", "published_time", "time", "published_time_ago",
+    "posted_time", "date", "timestamp", "published_date",
+)
+
+# /webhook/vollna (Vollna extension alerts, stored as-is in vollna_jobs)
+VOLLNA_WEBHOOK_FIELDS = FieldTable(
+    {
+        "title": FieldRule(("title", "job_title", "name"), default=""),
+        "url": FieldRule(("url", "job_url", "link"), default=""),
+        "description": FieldRule(("description", "job_description"), default=""),
+        "skills": FieldRule(("skills", "job_skills")),
+        "categories": FieldRule(("categories",)),
+        "budget": FieldRule(("budget", "formatted_budget", "budget_value", "hourly_rate", "fixed_price"), default=0.0),
+        # Top-level time fields win over the same fields nested under "raw".
+        "posted_at": FieldRule(WEBHOOK_TIME_KEYS + tuple(f"raw.{k}" for k in WEBHOOK_TIME_KEYS)),
+        "client_name": FieldRule(("client_name", "client.name"), default=""),
+        "proposals": FieldRule(("proposals", "proposal_count", "num_proposals")),
+        "location": FieldRule(("location", "country", "region")),
+        "job_type": FieldRule(("job_type", "type")),
+    }
+)
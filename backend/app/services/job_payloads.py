@@ -0,0 +1,102 @@
+"""
+Cold storage for original job payloads.
+
+jobs_raw and vollna_jobs documents used to embed the full source payload under
+"raw", often several times the size of the normalized fields. Payloads now
+live in job_payloads, one document per job keyed by the job's _id:
+
+    {_id, collection, encoding: "bson" | "zstd", data, updated_at}
+
+With JOB_PAYLOAD_COMPRESSION=zstd, data is the BSON-encoded payload
+compressed with zstandard (BinData) and size is its uncompressed length.
+Otherwise data is the payload document itself. Payloads are only read back
+for include_raw=true requests. Documents written before the move still carry
+"raw" until migrate_job_payloads.py has run, so attach() keeps an embedded
+payload when the store has none.
+"""
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+import bson
+from bson import Binary, ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..repositories.collections import JobPayloadsRepo
+
+logger = get_logger(__name__)
+
+LOOKUP_BATCH_SIZE = 1000
+
+_zstd_compressor: Any = None
+_zstd_decompressor: Any = None
+
+
+def _zstd() -> tuple[Any, Any]:
+    # zstandard is only needed when compression is on (or compressed payloads are read)
+    global _zstd_compressor, _zstd_decompressor
+    if _zstd_compressor is None:
+        import zstandard
+
+        _zstd_compressor = zstandard.ZstdCompressor(level=settings.JOB_PAYLOAD_ZSTD_LEVEL)
+        _zstd_decompressor = zstandard.ZstdDecompressor()
+    return _zstd_compressor, _zstd_decompressor
+
+
+def encode_payload(payload: dict[str, Any]) -> dict[str, Any]:
+    """Fields stored for one payload (encoding, data and, when compressed, size)."""
+    if settings.JOB_PAYLOAD_COMPRESSION == "zstd":
+        compressor, _ = _zstd()
+        encoded = bson.encode(payload)
+        return {"encoding": "zstd", "data": Binary(compressor.compress(encoded)), "size": len(encoded)}
+    return {"encoding": "bson", "data": payload}
+
+
+def decode_payload(doc: dict[str, Any]) -> dict[str, Any]:
+    if doc.get("encoding") == "zstd":
+        _, decompressor = _zstd()
+        return bson.decode(decompressor.decompress(bytes(doc["data"])))
+    return doc.get("data") or {}
+
+
+class JobPayloadStore:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.repo = JobPayloadsRepo(db)
+
+    async def save_many(self, collection: str, payloads: Iterable[tuple[ObjectId, dict[str, Any]]]) -> int:
+        """Upsert (job _id, payload) pairs for jobs in `collection`; returns how many were written."""
+        now = datetime.utcnow()
+        ops = [
+            UpdateOne(
+                {"_id": job_id},
+                {"$set": {"collection": collection, **encode_payload(payload), "updated_at": now}},
+                upsert=True,
+            )
+            for job_id, payload in payloads
+        ]
+        if ops:
+            await self.repo.col.bulk_write(ops, ordered=False)
+        return len(ops)
+
+    async def get_many(self, job_ids: Iterable[ObjectId]) -> dict[ObjectId, dict[str, Any]]:
+        ids = list(job_ids)
+        out: dict[ObjectId, dict[str, Any]] = {}
+        for start in range(0, len(ids), LOOKUP_BATCH_SIZE):
+            async for doc in self.repo.col.find({"_id": {"$in": ids[start:start + LOOKUP_BATCH_SIZE]}}):
+                try:
+                    out[doc["_id"]] = decode_payload(doc)
+                except Exception as e:
+                    logger.error(f"Failed to decode payload for job {doc['_id']}: {e}")
+        return out
+
+    async def attach(self, docs: list[dict[str, Any]]) -> None:
+        """Set doc["raw"] on job documents (call before _id is stringified)."""
+        payloads = await self.get_many(doc["_id"] for doc in docs if "_id" in doc)
+        for doc in docs:
+            payload: Optional[dict[str, Any]] = payloads.get(doc.get("_id"))
+            if payload is not None:
+                doc["raw"] = payload
+            else:
+                doc.setdefault("raw", {})
@@ -0,0 +1,334 @@
+"""
+Job ranking and the materialized job_rankings view.
+
+score_job_features() is the 0-100 heuristic behind /ai/rank-jobs. For each
+saved rank profile (user skills + priorities) the score of every recent
+filtered job is kept in job_rankings, indexed by (profile_id, score desc), so
+recommendations are a single range read.
+
+Rows are upserted as jobs are ingested, re-filtered or rescored. A full
+rebuild (scheduler "rankings" step, profile changes, or
+POST /jobs/rankings/rebuild) recomputes every profile and drops rows for jobs
+older than RANKING_MAX_AGE_DAYS or no longer in jobs_filtered.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from ..core.background import SingleFlight
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..repositories.base import oid_str, to_object_id
+from ..repositories.collections import JobRankingsRepo, JobsFilteredRepo, RankProfilesRepo
+from .job_features import FEATURES_VERSION, features_for, normalize_budget, normalize_skills
+
+logger = get_logger(__name__)
+
+RANK_PROJECTION = {"url": 1, "title": 1, "source": 1, "posted_at": 1, "created_at": 1, "budget": 1, "proposals": 1, "skills": 1, "features": 1}
+
+_pending_urls: set[str] = set()
+_updates = SingleFlight("ranking update")
+_rebuilds = SingleFlight("ranking rebuild")
+
+
+def score_job_features(
+    job: dict[str, Any],
+    *,
+    user_skills: list[str],
+    prioritize_budget: bool = True,
+    prioritize_low_competition: bool = True,
+) -> tuple[float, dict[str, Any]]:
+    """
+    Score one job (0-100) from its precomputed features.
+    user_skills must already be normalized (see normalize_skills).
+    """
+    features = job["features"]
+    score = 0.0
+    breakdown: dict[str, Any] = {
+        "budget_score": 0.0,
+        "competition_score": 0.0,
+        "skill_relevance_score": 0.0,
+        "description_quality_score": 0.0,
+    }
+
+    # 1. Budget scoring (0-30 points)
+    budget = job.get("budget")
+    if budget is not None and prioritize_budget:
+        # Normalized at ingest: higher budget = higher score, capped at $200.
+        # Features stored before the budget was known have None; derive it here.
+        normalized = features.get("budget_normalized")
+        if normalized is None:
+            normalized = normalize_budget(budget)
+        budget_score = normalized * 30.0
+        breakdown["budget_score"] = budget_score
+        score += budget_score
+    elif budget is not None:
+        # Still give some points for having budget info
+        breakdown["budget_score"] = 5.0
+        score += 5.0
+
+    # 2. Competition scoring (0-25 points)
+    proposals = features.get("proposals")
+    if proposals is not None and prioritize_low_competition:
+        # Lower proposals = higher score
+        # Normalize: 0 proposals = 25 points, 50+ proposals = 0 points
+        if proposals == 0:
+            competition_score = 25.0
+        elif proposals <= 50:
+            competition_score = 25.0 * (1.0 - (proposals / 50.0))
+        else:
+            competition_score = 0.0
+        breakdown["competition_score"] = competition_score
+        score += competition_score
+    elif proposals is not None:
+        # Still give some points for having proposal info
+        breakdown["competition_score"] = 5.0
+        score += 5.0
+
+    # 3. Skill relevance scoring (0-25 points)
+    job_skills = features.get("skills") or []
+    if user_skills and job_skills:
+        matched = set(user_skills) & set(job_skills)
+        skill_score = len(matched) / len(user_skills) * 25.0
+        breakdown["skill_relevance_score"] = skill_score
+        breakdown["matched_skills"] = sorted(matched)
+        score += skill_score
+
+    # 4. Description quality scoring (0-20 points)
+    word_count = features.get("word_count") or 0
+    if word_count:
+        # Simple heuristic: longer, more detailed descriptions score higher
+        if word_count < 50:
+            quality_score = 5.0
+        elif word_count < 200:
+            quality_score = 10.0
+        elif word_count < 500:
+            quality_score = 15.0
+        else:
+            quality_score = 20.0
+        # Key indicators of quality (counted at ingest), up to 5 bonus points
+        quality_score += min(features.get("indicator_hits", 0) * 1.0, 5.0)
+        breakdown["description_quality_score"] = min(quality_score, 20.0)
+        score += min(quality_score, 20.0)
+
+    # Total score (0-100)
+    breakdown["total_score"] = min(score, 100.0)
+    return min(score, 100.0), breakdown
+
+
+async def ensure_features(jobs: JobsFilteredRepo, docs: list[dict[str, Any]]) -> None:
+    """
+    Fill in `features` for documents stored before features existed (or with
+    an older version), backfilling them so this happens only once per job.
+    """
+    stale = [d["_id"] for d in docs if (d.get("features") or {}).get("v") != FEATURES_VERSION]
+    if not stale:
+        return
+    by_id = {d["_id"]: d for d in docs}
+    backfill = []
+    async for d in jobs.col.find({"_id": {"$in": stale}}, {"description": 1, "skills": 1, "budget": 1, "proposals": 1}):
+        by_id[d["_id"]]["features"] = features_for(d)
+        backfill.append(UpdateOne({"_id": d["_id"]}, {"$set": {"features": by_id[d["_id"]]["features"]}}))
+    if backfill:
+        await jobs.col.bulk_write(backfill, ordered=False)
+        logger.info(f"Backfilled ranking features for {len(backfill)} jobs")
+
+
+def ranked_job(job: dict[str, Any], score: float, breakdown: dict[str, Any]) -> dict[str, Any]:
+    """The per-job entry returned in JobRankResponse.ranked_jobs."""
+    return {
+        "job_id": oid_str(job["_id"]),
+        "job_url": job.get("url", ""),
+        "title": job.get("title", ""),
+        "score": score,
+        "breakdown": breakdown,
+        "budget": job.get("budget"),
+        "proposals": job.get("proposals"),
+        "skills": job.get("skills", []),
+    }
+
+
+class RankingService:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.jobs = JobsFilteredRepo(db)
+        self.profiles = RankProfilesRepo(db)
+        self.rankings = JobRankingsRepo(db)
+
+    async def rank(
+        self,
+        docs: list[dict[str, Any]],
+        *,
+        user_skills: Optional[list[str]] = None,
+        prioritize_budget: bool = True,
+        prioritize_low_competition: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        Score jobs_filtered documents (at least RANK_PROJECTION) for one ad-hoc
+        profile, highest score first. Used by /ai/rank-jobs and the scheduler.
+        """
+        await ensure_features(self.jobs, docs)
+        skills = normalize_skills(user_skills)
+        ranked: list[dict[str, Any]] = []
+        for job in docs:
+            score, breakdown = score_job_features(
+                job,
+                user_skills=skills,
+                prioritize_budget=prioritize_budget,
+                prioritize_low_competition=prioritize_low_competition,
+            )
+            ranked.append(ranked_job(job, score, breakdown))
+        ranked.sort(key=lambda x: x["score"], reverse=True)
+        return ranked
+
+    @staticmethod
+    def _window() -> dict[str, Any]:
+        """Jobs recent enough to be ranked."""
+        cutoff = datetime.utcnow() - timedelta(days=settings.RANKING_MAX_AGE_DAYS)
+        return {"$or": [{"posted_at": {"$gte": cutoff}}, {"posted_at": None, "created_at": {"$gte": cutoff}}]}
+
+    async def _load_profiles(self, profile_id: Optional[str] = None) -> list[dict[str, Any]]:
+        query: dict[str, Any] = {"enabled": {"$ne": False}}
+        if profile_id:
+            query["_id"] = to_object_id(profile_id)
+        profiles = await self.profiles.find_many(query, limit=None)
+        for p in profiles:
+            p["_skills"] = normalize_skills(p.get("user_skills"))
+        return profiles
+
+    def _row_ops(self, profiles: list[dict[str, Any]], docs: list[dict[str, Any]], now: datetime) -> list[UpdateOne]:
+        ops: list[UpdateOne] = []
+        for profile in profiles:
+            profile_id = oid_str(profile["_id"])
+            for job in docs:
+                score, breakdown = score_job_features(
+                    job,
+                    user_skills=profile["_skills"],
+                    prioritize_budget=profile.get("prioritize_budget", True),
+                    prioritize_low_competition=profile.get("prioritize_low_competition", True),
+                )
+                job_id = oid_str(job["_id"])
+                ops.append(
+                    UpdateOne(
+                        {"profile_id": profile_id, "job_id": job_id},
+                        {
+                            "$set": {
+                                **ranked_job(job, score, breakdown),
+                                "profile_id": profile_id,
+                                "source": job.get("source"),
+                                "posted_at": job.get("posted_at"),
+                                "updated_at": now,
+                            }
+                        },
+                        upsert=True,
+                    )
+                )
+        return ops
+
+    async def _upsert_matching(self, query: dict[str, Any], profiles: list[dict[str, Any]], now: datetime) -> set[str]:
+        """Upsert rows for every job matching query; returns the urls seen."""
+        seen: set[str] = set()
+        batch: list[dict[str, Any]] = []
+
+        async def flush() -> None:
+            await ensure_features(self.jobs, batch)
+            ops = self._row_ops(profiles, batch, now)
+            if ops:
+                await self.rankings.col.bulk_write(ops, ordered=False)
+            batch.clear()
+
+        async for job in self.jobs.col.find({"$and": [query, self._window()]}, RANK_PROJECTION).batch_size(settings.RANKING_BATCH_SIZE):
+            seen.add(job.get("url"))
+            batch.append(job)
+            if len(batch) >= settings.RANKING_BATCH_SIZE:
+                await flush()
+        if batch:
+            await flush()
+        return seen
+
+    async def update_urls(self, urls: Iterable[str]) -> dict[str, int]:
+        """Refresh rows for specific jobs; jobs gone from jobs_filtered (or too old) are removed."""
+        urls = list(set(urls))
+        if not urls:
+            return {"updated": 0, "removed": 0}
+        profiles = await self._load_profiles()
+        seen = await self._upsert_matching({"url": {"$in": urls}}, profiles, datetime.utcnow()) if profiles else set()
+        gone = [u for u in urls if u not in seen]
+        removed = 0
+        if gone:
+            res = await self.rankings.col.delete_many({"job_url": {"$in": gone}})
+            removed = res.deleted_count
+        return {"updated": len(seen), "removed": removed}
+
+    async def refresh(self, query: dict[str, Any]) -> dict[str, int]:
+        """Refresh rows for jobs_filtered documents matching query."""
+        profiles = await self._load_profiles()
+        if not profiles:
+            return {"updated": 0}
+        return {"updated": len(await self._upsert_matching(query, profiles, datetime.utcnow()))}
+
+    async def rebuild(self, profile_id: Optional[str] = None) -> dict[str, Any]:
+        """
+        Recompute rankings for one or all profiles. Rows not touched by the
+        rebuild (old or deleted jobs, removed profiles) are dropped.
+        """
+        started = datetime.utcnow()
+        profiles = await self._load_profiles(profile_id)
+        jobs = await self._upsert_matching({}, profiles, started) if profiles else set()
+
+        stale: dict[str, Any] = {"updated_at": {"$lt": started}}
+        if profile_id:
+            stale["profile_id"] = profile_id
+        else:
+            stale = {"$or": [stale, {"profile_id": {"$nin": [oid_str(p["_id"]) for p in profiles]}}]}
+        res = await self.rankings.col.delete_many(stale)
+
+        summary = {
+            "profiles": len(profiles),
+            "jobs": len(jobs),
+            "removed": res.deleted_count,
+            "duration_seconds": (datetime.utcnow() - started).total_seconds(),
+        }
+        logger.info(f"Rankings rebuilt: {summary}")
+        return summary
+
+    async def top(
+        self,
+        profile_id: str,
+        *,
+        query: Optional[dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 50,
+    ) -> list[dict[str, Any]]:
+        """Highest scored jobs for a profile, read straight from the (profile_id, score) index."""
+        cursor = (
+            self.rankings.col.find({"profile_id": profile_id, **(query or {})}, {"_id": 0, "profile_id": 0, "updated_at": 0})
+            .sort([("score", -1)])
+            .skip(skip)
+            .limit(limit)
+        )
+        return await cursor.to_list(length=limit)
+
+    async def delete_profile(self, profile_id: str) -> int:
+        res = await self.rankings.col.delete_many({"profile_id": profile_id})
+        return res.deleted_count
+
+
+def schedule_ranking_update(db: AsyncIOMotorDatabase, urls: Iterable[str]) -> None:
+    """Refresh rankings for these jobs in the background; bursts are merged into one pass."""
+    _pending_urls.update(u for u in urls if u)
+    if not _pending_urls:
+        return
+
+    async def drain() -> None:
+        while _pending_urls:
+            batch = [_pending_urls.pop() for _ in range(min(len(_pending_urls), settings.RANKING_BATCH_SIZE))]
+            await RankingService(db).update_urls(batch)
+
+    _updates.trigger(drain)
+
+
+def schedule_ranking_rebuild(db: AsyncIOMotorDatabase) -> None:
+    """Rebuild every profile's rankings in the background (e.g. after a profile change)."""
+    _rebuilds.trigger(lambda: RankingService(db).rebuild())
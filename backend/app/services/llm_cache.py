@@ -0,0 +1,186 @@
+"""
+Content-addressed cache for LLM completions.
+
+Keys are a hash of the rendered prompt plus the generation parameters, so the
+same job/template/portfolio/model/temperature combination is only paid for once
+within the TTL. A small in-process LRU sits in front of the Mongo collection.
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..repositories.collections import LLMCacheRepo
+from .llm_registry import llm_registry
+
+logger = get_logger(__name__)
+
+# key -> (expires_at monotonic, text, meta)
+_lru: "OrderedDict[str, tuple[float, str, dict[str, Any]]]" = OrderedDict()
+_stats: dict[str, int] = {"memory_hits": 0, "db_hits": 0, "misses": 0, "bypassed": 0}
+
+
+def cache_key(*, prompt: str, model: str, temperature: float, max_tokens: int) -> str:
+    material = json.dumps(
+        {"prompt": prompt, "model": model, "temperature": temperature, "max_tokens": max_tokens},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def cache_stats() -> dict[str, Any]:
+    hits = _stats["memory_hits"] + _stats["db_hits"]
+    lookups = hits + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": (hits / lookups) if lookups else 0.0,
+        "memory_entries": len(_lru),
+    }
+
+
+def _zero_usage(usage: dict[str, Any]) -> dict[str, Any]:
+    return {
+        k: _zero_usage(v) if isinstance(v, dict) else 0 if isinstance(v, (int, float)) else v
+        for k, v in usage.items()
+    }
+
+
+def _hit_meta(meta: dict[str, Any]) -> dict[str, Any]:
+    """
+    Meta for a cache hit: usage is zeroed so token accounting only counts calls
+    that reached the provider; the original figures stay under cached_usage.
+    """
+    usage = meta.get("usage") or {}
+    return {
+        **meta,
+        "usage": _zero_usage(usage),
+        "cached_usage": usage,
+        "cached": True,
+    }
+
+
+def _remember(key: str, text: str, meta: dict[str, Any]) -> None:
+    _lru[key] = (time.monotonic() + settings.LLM_CACHE_TTL_SECONDS, text, meta)
+    _lru.move_to_end(key)
+    while len(_lru) > settings.LLM_CACHE_MAX_MEMORY_ENTRIES:
+        _lru.popitem(last=False)
+
+
+class LLMCache:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.repo = LLMCacheRepo(db)
+
+    async def get(self, key: str) -> Optional[tuple[str, dict[str, Any]]]:
+        entry = _lru.get(key)
+        if entry is not None:
+            expires_at, text, meta = entry
+            if expires_at > time.monotonic():
+                _lru.move_to_end(key)
+                _stats["memory_hits"] += 1
+                return text, meta
+            _lru.pop(key, None)
+
+        # TTL monitor only runs periodically, so guard against stale docs here too.
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.LLM_CACHE_TTL_SECONDS)
+        doc = await self.repo.find_one({"_id": key, "created_at": {"$gte": cutoff}})
+        if doc:
+            _stats["db_hits"] += 1
+            text, meta = doc.get("text") or "", doc.get("meta") or {}
+            _remember(key, text, meta)
+            return text, meta
+
+        _stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, text: str, meta: dict[str, Any]) -> None:
+        _remember(key, text, meta)
+        try:
+            await self.repo.update_one(
+                {"_id": key},
+                {"$set": {"text": text, "meta": meta, "created_at": datetime.utcnow()}},
+                upsert=True,
+            )
+        except Exception as e:
+            # A cache write failure must never fail the generation.
+            logger.warning(f"Failed to persist LLM cache entry: {e}")
+
+    async def generate(
+        self,
+        *,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        prompt: str,
+        use_cache: bool = True,
+    ) -> tuple[str, dict[str, Any], bool]:
+        """
+        Cached wrapper around the shared LLM registry.
+        Returns (text, meta, cached); a hit reports zero usage (see _hit_meta).
+        """
+        if not settings.LLM_CACHE_ENABLED or not use_cache:
+            _stats["bypassed"] += 1
+            text, meta = await llm_registry().generate(
+                model=model, temperature=temperature, max_tokens=max_tokens, prompt=prompt
+            )
+            return text, meta, False
+
+        key = cache_key(prompt=prompt, model=model, temperature=temperature, max_tokens=max_tokens)
+        hit = await self.get(key)
+        if hit is not None:
+            return hit[0], _hit_meta(hit[1]), True
+
+        text, meta = await llm_registry().generate(
+            model=model, temperature=temperature, max_tokens=max_tokens, prompt=prompt
+        )
+        if text:
+            await self.put(key, text, meta)
+        return text, meta, False
+
+    async def stream(
+        self,
+        *,
+        model: str,
+        temperature: float,
+        max_tokens: int,
+        prompt: str,
+        use_cache: bool = True,
+    ) -> AsyncIterator[tuple[str, Optional[dict[str, Any]]]]:
+        """
+        Cached wrapper around LLMProviderRegistry.stream.
+        A hit is replayed as a single chunk. The final meta carries "cached"
+        (and zero usage on a hit, see _hit_meta).
+        """
+        if not settings.LLM_CACHE_ENABLED or not use_cache:
+            _stats["bypassed"] += 1
+            async for delta, meta in llm_registry().stream(
+                model=model, temperature=temperature, max_tokens=max_tokens, prompt=prompt
+            ):
+                yield delta, ({**meta, "cached": False} if meta is not None else None)
+            return
+
+        key = cache_key(prompt=prompt, model=model, temperature=temperature, max_tokens=max_tokens)
+        hit = await self.get(key)
+        if hit is not None:
+            yield hit[0], None
+            yield "", _hit_meta(hit[1])
+            return
+
+        parts: list[str] = []
+        async for delta, meta in llm_registry().stream(
+            model=model, temperature=temperature, max_tokens=max_tokens, prompt=prompt
+        ):
+            if meta is None:
+                parts.append(delta)
+                yield delta, None
+                continue
+            text = "".join(parts)
+            if text:
+                await self.put(key, text, meta)
+            yield "", {**meta, "cached": False}
@@ -0,0 +1,202 @@
+"""
+Client-side rate limiting and retry scheduling for LLM providers.
+
+Budgets come from ai_settings.rate_limits, keyed by provider ("openai",
+"gemini") or by model name, e.g. {"openai": {"rpm": 500, "tpm": 200000}}.
+Callers wait for budget instead of failing, and retryable provider errors
+(429/5xx/timeouts) are retried with jittered exponential backoff that honors
+Retry-After.
+"""
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+_stats: dict[str, float] = {"acquired": 0, "waited": 0, "wait_total_ms": 0.0, "retries": 0, "gave_up": 0}
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `per_minute / 60` per second.
+    Waiters are served in arrival order.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Take `amount` tokens, sleeping until they are available. Returns seconds waited."""
+        # A single request larger than the whole budget would otherwise never fit.
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def refund(self, amount: float) -> None:
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class LLMRateLimiter:
+    def __init__(self):
+        self._limits: dict[str, dict[str, Any]] = {}
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+
+    def configure(self, limits: Optional[dict[str, Any]]) -> None:
+        """
+        Apply rate_limits from ai_settings. Cheap when nothing changed, so it is
+        called on every settings read; buckets are rebuilt only for changed keys.
+        """
+        limits = limits or {}
+        if limits == self._limits:
+            return
+        for key in set(self._limits) | set(limits):
+            if self._limits.get(key) != limits.get(key):
+                self._buckets.pop((key, "rpm"), None)
+                self._buckets.pop((key, "tpm"), None)
+                budget = limits.get(key) or {}
+                for kind in ("rpm", "tpm"):
+                    if budget.get(kind):
+                        self._buckets[(key, kind)] = TokenBucket(float(budget[kind]))
+        self._limits = dict(limits)
+        logger.info(f"LLM rate limits configured: {self._limits}")
+
+    def _buckets_for(self, provider: str, model: str, kind: str) -> list[TokenBucket]:
+        return [b for b in (self._buckets.get((provider, kind)), self._buckets.get((model, kind))) if b is not None]
+
+    async def acquire(self, *, provider: str, model: str, tokens: int) -> None:
+        waited = 0.0
+        for bucket in self._buckets_for(provider, model, "rpm"):
+            waited += await bucket.acquire(1)
+        for bucket in self._buckets_for(provider, model, "tpm"):
+            waited += await bucket.acquire(tokens)
+        _stats["acquired"] += 1
+        if waited > 0:
+            _stats["waited"] += 1
+            _stats["wait_total_ms"] += waited * 1000
+
+    def settle(self, *, provider: str, model: str, estimated: int, actual: Optional[int]) -> None:
+        """Give back tokens reserved beyond what the provider actually billed."""
+        if not actual or actual >= estimated:
+            return
+        for bucket in self._buckets_for(provider, model, "tpm"):
+            bucket.refund(estimated - actual)
+
+    def stats(self) -> dict[str, Any]:
+        return {**_stats, "limits": self._limits}
+
+
+_limiter = LLMRateLimiter()
+
+
+def rate_limiter() -> LLMRateLimiter:
+    return _limiter
+
+
+def configure_rate_limits(limits: Optional[dict[str, Any]]) -> None:
+    _limiter.configure(limits)
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough upper bound used to reserve TPM budget (~4 chars per token)."""
+    return len(prompt) // 4 + int(max_tokens)
+
+
+def _status(exc: BaseException) -> Optional[int]:
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    raw = headers.get("retry-after-ms")
+    if raw:
+        try:
+            return float(raw) / 1000.0
+        except ValueError:
+            pass
+    raw = headers.get("retry-after")
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    name = type(exc).__name__
+    if name in ("APIConnectionError", "APITimeoutError", "ReadTimeout", "ConnectTimeout"):
+        return True
+    status = _status(exc)
+    return status in RETRYABLE_STATUS
+
+
+def _root(exc: BaseException) -> BaseException:
+    # Provider wrappers re-raise as RuntimeError(...) from the SDK error.
+    return exc.__cause__ or exc
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff; Retry-After (when given) is a floor."""
+    cap = settings.LLM_RETRY_MAX_DELAY_SECONDS
+    delay = random.uniform(0, min(cap, settings.LLM_RETRY_BASE_DELAY_SECONDS * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, cap))
+    return delay
+
+
+async def with_retries(call: Callable[[], Awaitable[T]], *, label: str) -> T:
+    attempts = max(1, settings.LLM_RETRY_MAX_ATTEMPTS)
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except Exception as e:
+            root = _root(e)
+            if attempt + 1 >= attempts or not _is_retryable(root):
+                if attempt:
+                    _stats["gave_up"] += 1
+                raise
+            delay = backoff_delay(attempt, _retry_after(root))
+            _stats["retries"] += 1
+            logger.warning(f"{label}: retryable error ({root!r}), retry {attempt + 1}/{attempts - 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    raise RuntimeError("unreachable")
@@ -0,0 +1,215 @@
+"""
+Process-wide LLM provider registry.
+
+Clients are created once (at startup) and reused so that proposal requests
+don't pay for client construction and TLS handshakes. Each provider has its
+own concurrency semaphore, and calls go through the RPM/TPM limiter and
+retry scheduler in llm_rate_limit.
+"""
+import asyncio
+import weakref
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from .llm_rate_limit import estimate_tokens, rate_limiter, with_retries
+
+logger = get_logger(__name__)
+
+
+def provider_for_model(model: str) -> str:
+    """Map an ai_settings model name to a provider key."""
+    model_str = str(model).lower()
+    if "gemini" in model_str:
+        return "gemini"
+    return "openai"
+
+
+class LLMProviderRegistry:
+    def __init__(self):
+        self._clients: dict[str, Any] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {
+            "openai": asyncio.Semaphore(settings.LLM_OPENAI_MAX_CONCURRENCY),
+            "gemini": asyncio.Semaphore(settings.LLM_GEMINI_MAX_CONCURRENCY),
+        }
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=settings.LLM_HTTP_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_HTTP_MAX_KEEPALIVE,
+                ),
+            )
+        return self._http
+
+    def client(self, provider: str) -> Any:
+        """
+        Return the shared client for a provider, creating it on first use.
+        Raises RuntimeError if the provider's API key is not configured.
+        """
+        existing = self._clients.get(provider)
+        if existing is not None:
+            return existing
+        if provider == "gemini":
+            from .gemini_service import GeminiService
+
+            created: Any = GeminiService()
+        else:
+            from .openai_service import OpenAIService
+
+            created = OpenAIService(http_client=self._http_client())
+        self._clients[provider] = created
+        return created
+
+    def client_for_model(self, model: str) -> Any:
+        return self.client(provider_for_model(model))
+
+    def semaphore(self, provider: str) -> asyncio.Semaphore:
+        return self._semaphores[provider]
+
+    def warm(self) -> None:
+        """Create clients for every provider that has credentials configured."""
+        if settings.OPENAI_API_KEY:
+            self.client("openai")
+        if settings.GEMINI_API_KEY:
+            self.client("gemini")
+
+    async def generate(self, *, model: str, temperature: float, max_tokens: int, prompt: str) -> tuple[str, dict[str, Any]]:
+        provider = provider_for_model(model)
+        client = self.client(provider)
+        limiter = rate_limiter()
+        estimated = estimate_tokens(prompt, max_tokens)
+
+        async def attempt() -> tuple[str, dict[str, Any]]:
+            # Wait for budget before taking a concurrency slot.
+            await limiter.acquire(provider=provider, model=model, tokens=estimated)
+            async with self._semaphores[provider]:
+                return await client.generate(
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    prompt=prompt,
+                )
+
+        text, meta = await with_retries(attempt, label=f"{provider}:{model}")
+        limiter.settle(provider=provider, model=model, estimated=estimated, actual=(meta.get("usage") or {}).get("total_tokens"))
+        return text, meta
+
+    async def stream(self, *, model: str, temperature: float, max_tokens: int, prompt: str) -> AsyncIterator[tuple[str, Optional[dict[str, Any]]]]:
+        """
+        Stream a completion; the provider slot is held from the successful
+        attempt until the stream ends, but not across retry backoff.
+        Yields (text_delta, None) per chunk, then ("", meta).
+        Only failures before the first chunk are retried.
+        """
+        provider = provider_for_model(model)
+        client = self.client(provider)
+        limiter = rate_limiter()
+        estimated = estimate_tokens(prompt, max_tokens)
+        semaphore = self._semaphores[provider]
+
+        async def open_stream() -> tuple[Any, tuple[str, Optional[dict[str, Any]]]]:
+            # Wait for budget before taking a concurrency slot (as in generate()).
+            await limiter.acquire(provider=provider, model=model, tokens=estimated)
+            await semaphore.acquire()
+            chunks = None
+            try:
+                chunks = client.stream(
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    prompt=prompt,
+                )
+                first = await chunks.__anext__()
+            except BaseException:
+                if chunks is not None:
+                    await chunks.aclose()
+                semaphore.release()
+                raise
+            return chunks, first
+
+        chunks, first = await with_retries(open_stream, label=f"{provider}:{model}")
+        try:
+            delta, meta = first
+            while True:
+                if meta is not None:
+                    limiter.settle(provider=provider, model=model, estimated=estimated, actual=(meta.get("usage") or {}).get("total_tokens"))
+                yield delta, meta
+                try:
+                    delta, meta = await chunks.__anext__()
+                except StopAsyncIteration:
+                    break
+        finally:
+            try:
+                await chunks.aclose()
+            finally:
+                semaphore.release()
+
+    async def close(self) -> None:
+        for client in self._clients.values():
+            close = getattr(client, "close", None)
+            if close is not None:
+                await close()
+        self._clients.clear()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+_registry: Optional[LLMProviderRegistry] = None
+# Registries for event loops other than the app's (e.g. one per Celery worker
+# thread): semaphores and the httpx client only work on the loop they first ran on.
+_loop_registries: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMProviderRegistry]" = weakref.WeakKeyDictionary()
+
+
+def init_llm_registry() -> None:
+    """Create the shared registry (called from the FastAPI lifespan)."""
+    global _registry
+    if _registry is not None:
+        return
+    _registry = LLMProviderRegistry()
+    _registry.warm()
+    logger.info("LLM provider registry initialized")
+
+
+def bind_loop_registry() -> LLMProviderRegistry:
+    """Create (once) a registry owned by the running event loop; llm_registry() returns it on that loop."""
+    loop = asyncio.get_running_loop()
+    registry = _loop_registries.get(loop)
+    if registry is None:
+        registry = _loop_registries[loop] = LLMProviderRegistry()
+        registry.warm()
+        logger.info("LLM provider registry initialized for worker event loop")
+    return registry
+
+
+async def close_llm_registry() -> None:
+    global _registry
+    if _registry is not None:
+        await _registry.close()
+        logger.info("LLM provider registry closed")
+    _registry = None
+
+
+def llm_registry() -> LLMProviderRegistry:
+    """
+    Get the LLM registry for the running event loop (see bind_loop_registry),
+    falling back to the shared one.
+    Raises RuntimeError if not initialized.
+    """
+    try:
+        bound = _loop_registries.get(asyncio.get_running_loop())
+    except RuntimeError:
+        bound = None
+    if bound is not None:
+        return bound
+    if _registry is None:
+        raise RuntimeError(
+            "LLM registry not initialized. Ensure the FastAPI lifespan startup event ran."
+        )
+    return _registry
@@ -0,0 +1,245 @@
+"""
+Durable notification outbox.
+
+Proposal creation writes one notification_outbox row per enabled channel; a
+background dispatcher claims due rows in batches and delivers them. Rows for
+the same Slack channel claimed together are coalesced into one digest
+message. Failed deliveries are retried with exponential backoff until
+NOTIFY_OUTBOX_MAX_ATTEMPTS, then left as status "failed" (with failed_at and
+no next_attempt_at) for inspection.
+"""
+import asyncio
+import random
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..repositories.base import to_object_id
+from ..repositories.collections import NotificationOutboxRepo, NotificationsRepo, ProposalsRepo
+from .notification_service import NotificationService, schedule_proposal_notification
+
+logger = get_logger(__name__)
+
+
+def _channel_key(ch: dict[str, Any]) -> str:
+    conf = ch.get("config") or {}
+    return f"{ch.get('type')}:{conf.get('webhook_url') or conf.get('url') or ''}"
+
+
+def _backoff(attempts: int) -> timedelta:
+    delay = min(
+        settings.NOTIFY_OUTBOX_BACKOFF_MAX_SECONDS,
+        settings.NOTIFY_OUTBOX_BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)),
+    )
+    # +/-20% jitter so retries from one burst don't land together.
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+async def enqueue_proposal_notification(db: AsyncIOMotorDatabase, proposal_id: str) -> int:
+    """
+    Record pending notifications for a proposal; returns the number of rows written.
+    Falls back to direct background delivery when the outbox is disabled.
+    """
+    if not settings.NOTIFY_OUTBOX_ENABLED:
+        schedule_proposal_notification(db, proposal_id)
+        return 0
+
+    cfg = await NotificationsRepo(db).find_one({"_key": "notifications"})
+    if not cfg or not cfg.get("enabled", True):
+        return 0
+
+    proposal = await ProposalsRepo(db).find_by_id(proposal_id)
+    if not proposal:
+        raise RuntimeError("proposal not found")
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "proposal_id": proposal_id,
+            "job_title": proposal.get("job_title"),
+            "job_url": proposal.get("job_url"),
+            "channel": ch,
+            "channel_key": _channel_key(ch),
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for ch in cfg.get("channels") or []
+        if ch.get("enabled", True)
+    ]
+    if rows:
+        await NotificationOutboxRepo(db).col.insert_many(rows, ordered=False)
+    return len(rows)
+
+
+class OutboxDispatcher:
+    def __init__(self, db: AsyncIOMotorDatabase, *, batch_size: int, poll_interval: float):
+        self.outbox = NotificationOutboxRepo(db)
+        self.proposals = ProposalsRepo(db)
+        self.notifier = NotificationService(db)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def claim(self) -> list[dict[str, Any]]:
+        """
+        Claim up to batch_size due rows. Rows stuck in "sending" past their lease
+        (e.g. a crashed worker) are due again. Safe with several dispatchers.
+        """
+        now = datetime.utcnow()
+        due = {
+            "$or": [
+                {"status": "pending", "next_attempt_at": {"$lte": now}},
+                {"status": "sending", "lease_until": {"$lte": now}},
+            ]
+        }
+        ids = [d["_id"] async for d in self.outbox.col.find(due, {"_id": 1}).sort("next_attempt_at", 1).limit(self.batch_size)]
+        if not ids:
+            return []
+        claim_id = uuid.uuid4().hex
+        await self.outbox.col.update_many(
+            {"_id": {"$in": ids}, **due},
+            {
+                "$set": {
+                    "status": "sending",
+                    "claim_id": claim_id,
+                    "lease_until": now + timedelta(seconds=settings.NOTIFY_OUTBOX_LEASE_SECONDS),
+                    "updated_at": now,
+                }
+            },
+        )
+        return await self.outbox.col.find({"claim_id": claim_id}).to_list(length=None)
+
+    async def _deliver_group(self, rows: list[dict[str, Any]]) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+        ch = rows[0]["channel"]
+        if ch.get("type") == "slack" and len(rows) > 1:
+            req = self.notifier.build_digest(ch, rows)
+            if req is None:
+                return [(r, {"ok": False, "error": "channel misconfigured"}) for r in rows]
+            res = await self.notifier.deliver(ch, *req)
+            return [(r, res) for r in rows]
+
+        proposal_ids = [r["proposal_id"] for r in rows]
+        proposals = {
+            str(p["_id"]): p
+            async for p in self.proposals.col.find({"_id": {"$in": [self._oid(i) for i in proposal_ids]}})
+        }
+
+        async def one(row: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+            proposal = proposals.get(row["proposal_id"])
+            if proposal is None:
+                return row, {"ok": False, "error": "proposal not found", "permanent": True}
+            req = self.notifier.build_request(ch, row["proposal_id"], proposal)
+            if req is None:
+                return row, {"ok": False, "error": "channel misconfigured", "permanent": True}
+            return row, await self.notifier.deliver(ch, *req)
+
+        return list(await asyncio.gather(*(one(r) for r in rows)))
+
+    @staticmethod
+    def _oid(id_str: str) -> Any:
+        try:
+            return to_object_id(id_str)
+        except Exception:
+            return id_str
+
+    def _settle(self, row: dict[str, Any], res: dict[str, Any]) -> UpdateOne:
+        now = datetime.utcnow()
+        unset = {"claim_id": "", "lease_until": ""}
+        if res.get("ok"):
+            update = {"status": "sent", "sent_at": now, "updated_at": now}
+        else:
+            attempts = row.get("attempts", 0) + 1
+            dead = res.get("permanent") or attempts >= settings.NOTIFY_OUTBOX_MAX_ATTEMPTS
+            update = {"attempts": attempts, "last_error": res.get("error"), "updated_at": now}
+            if dead:
+                # No retry follows, so drop next_attempt_at rather than schedule one
+                update.update(status="failed", failed_at=now)
+                unset["next_attempt_at"] = ""
+            else:
+                update.update(status="pending", next_attempt_at=now + _backoff(attempts))
+        return UpdateOne(
+            {"_id": row["_id"], "claim_id": row.get("claim_id")},
+            {"$set": update, "$unset": unset},
+        )
+
+    async def dispatch_once(self) -> int:
+        rows = await self.claim()
+        if not rows:
+            return 0
+        groups: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            groups[row["channel_key"]].append(row)
+
+        outcomes = await asyncio.gather(*(self._deliver_group(g) for g in groups.values()))
+        ops = [self._settle(row, res) for group in outcomes for row, res in group]
+        await self.outbox.col.bulk_write(ops, ordered=False)
+        logger.info(f"Outbox dispatched {len(rows)} notifications over {len(groups)} channels")
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Drain quickly while there is a backlog, then fall back to polling.
+                while await self.dispatch_once() >= self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox dispatch failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_dispatcher: Optional[OutboxDispatcher] = None
+
+
+async def start_outbox_dispatcher(db: AsyncIOMotorDatabase) -> None:
+    """Start the background outbox dispatcher (called from the FastAPI lifespan)."""
+    global _dispatcher
+    if not settings.NOTIFY_OUTBOX_ENABLED or _dispatcher is not None:
+        return
+    _dispatcher = OutboxDispatcher(
+        db,
+        batch_size=settings.NOTIFY_OUTBOX_BATCH_SIZE,
+        poll_interval=settings.NOTIFY_OUTBOX_POLL_SECONDS,
+    )
+    _dispatcher.start()
+    logger.info("Notification outbox dispatcher started")
+
+
+async def stop_outbox_dispatcher() -> None:
+    global _dispatcher
+    if _dispatcher is None:
+        return
+    await _dispatcher.stop()
+    _dispatcher = None
+    logger.info("Notification outbox dispatcher stopped")
+
+
+async def outbox_stats(db: AsyncIOMotorDatabase) -> dict[str, Any]:
+    counts = {
+        d["_id"]: d["count"]
+        async for d in NotificationOutboxRepo(db).col.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}])
+    }
+    return {"pending": 0, "sending": 0, "sent": 0, "failed": 0, **counts}
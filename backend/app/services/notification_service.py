@@ -1,11 +1,69 @@
+import asyncio
+import json
 from datetime import datetime
 from typing import Any, Optional
 
 import httpx
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from ..core.logging import get_logger
+from ..core.settings import settings
 from ..repositories.collections import NotificationsRepo, ProposalsRepo
 
+logger = get_logger(__name__)
+
+# One pooled client per process; per-channel timeouts are applied per request.
+_client: Optional[httpx.AsyncClient] = None
+# Background deliveries, kept referenced until they finish.
+_pending: set[asyncio.Task] = set()
+
+
+def _http_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=settings.NOTIFY_CHANNEL_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.NOTIFY_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.NOTIFY_HTTP_MAX_CONNECTIONS,
+            ),
+        )
+    return _client
+
+
+def init_notification_client() -> None:
+    """Create the shared notification HTTP client (called from the FastAPI lifespan)."""
+    _http_client()
+    logger.info("Notification HTTP client initialized")
+
+
+async def close_notification_client() -> None:
+    """Let in-flight deliveries finish (bounded), then close the shared client."""
+    global _client
+    if _pending:
+        await asyncio.wait(list(_pending), timeout=settings.NOTIFY_CHANNEL_TIMEOUT_SECONDS)
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("Notification HTTP client closed")
+
+
+def schedule_proposal_notification(db: AsyncIOMotorDatabase, proposal_id: str) -> None:
+    """
+    Deliver proposal notifications in the background so the caller doesn't
+    wait on Slack/webhook round trips. Failures are logged, never raised.
+    """
+
+    async def deliver() -> None:
+        try:
+            await NotificationService(db).notify_proposal(proposal_id)
+        except Exception as e:
+            logger.warning(f"Notification for proposal {proposal_id} failed: {e}")
+
+    task = asyncio.create_task(deliver())
+    _pending.add(task)
+    task.add_done_callback(_pending.discard)
+
 
 class NotificationService:
     def __init__(self, db: AsyncIOMotorDatabase):
@@ -15,6 +73,48 @@ class NotificationService:
     async def _get_config(self) -> Optional[dict[str, Any]]:
         return await self.notifications.find_one({"_key": "notifications"})
 
+    def build_request(self, ch: dict[str, Any], proposal_id: str, proposal: dict[str, Any]) -> Optional[tuple[str, dict[str, Any]]]:
+        """(url, JSON body) notifying one channel about one proposal, or None if the channel is misconfigured."""
+        ctype = ch.get("type")
+        conf = ch.get("config") or {}
+        if ctype == "slack":
+            url = conf.get("webhook_url")
+            if not url:
+                return None
+            return url, {"text": f"Proposal generated for: {proposal.get('job_title') or proposal.get('job_url')}"}
+        if ctype == "webhook":
+            url = conf.get("url")
+            if not url:
+                return None
+            # ObjectId/datetime fields aren't JSON serializable as-is.
+            body = json.loads(json.dumps({"proposal_id": proposal_id, "proposal": proposal}, default=str))
+            return url, body
+        return None
+
+    def build_digest(self, ch: dict[str, Any], proposals: list[dict[str, Any]]) -> Optional[tuple[str, dict[str, Any]]]:
+        """One Slack message summarizing several proposals."""
+        url = (ch.get("config") or {}).get("webhook_url")
+        if ch.get("type") != "slack" or not url:
+            return None
+        limit = settings.NOTIFY_DIGEST_MAX_LINES
+        lines = [f"• {p.get('job_title') or p.get('job_url')}" for p in proposals[:limit]]
+        if len(proposals) > limit:
+            lines.append(f"…and {len(proposals) - limit} more")
+        return url, {"text": f"{len(proposals)} proposals generated:\n" + "\n".join(lines)}
+
+    async def deliver(self, ch: dict[str, Any], url: str, body: dict[str, Any]) -> dict[str, Any]:
+        """POST a request from build_request/build_digest; the result has ok plus status_code or error."""
+        conf = ch.get("config") or {}
+        timeout = float(conf.get("timeout_seconds") or settings.NOTIFY_CHANNEL_TIMEOUT_SECONDS)
+        try:
+            resp = await asyncio.wait_for(_http_client().post(url, json=body, timeout=timeout), timeout=timeout)
+            resp.raise_for_status()
+            return {"type": ch.get("type"), "ok": True, "status_code": resp.status_code}
+        except asyncio.TimeoutError:
+            return {"type": ch.get("type"), "ok": False, "error": f"timed out after {timeout}s"}
+        except Exception as e:
+            return {"type": ch.get("type"), "ok": False, "error": str(e)}
+
     async def notify_proposal(self, proposal_id: str) -> dict[str, Any]:
         cfg = await self._get_config()
         if not cfg or not cfg.get("enabled", True):
@@ -24,29 +124,19 @@ class NotificationService:
         if not proposal:
             raise RuntimeError("proposal not found")
 
-        channels = cfg.get("channels") or []
-        sent = 0
-
-        async with httpx.AsyncClient(timeout=15) as client:
-            for ch in channels:
-                if not ch.get("enabled", True):
-                    continue
-                ctype = ch.get("type")
-                conf = ch.get("config") or {}
-                if ctype == "slack":
-                    url = conf.get("webhook_url")
-                    if not url:
-                        continue
-                    payload = {"text": f"Proposal generated for: {proposal.get('job_title') or proposal.get('job_url')}"}
-                    await client.post(url, json=payload)
-                    sent += 1
-                elif ctype == "webhook":
-                    url = conf.get("url")
-                    if not url:
-                        continue
-                    await client.post(url, json={"proposal_id": proposal_id, "proposal": proposal})
-                    sent += 1
-
-        return {"sent": sent, "skipped": False}
+        deliveries = []
+        for ch in cfg.get("channels") or []:
+            if not ch.get("enabled", True):
+                continue
+            req = self.build_request(ch, proposal_id, proposal)
+            if req is None:
+                continue
+            deliveries.append(self.deliver(ch, *req))
 
+        results = await asyncio.gather(*deliveries)
+        sent = sum(1 for r in results if r["ok"])
+        for r in results:
+            if not r["ok"]:
+                logger.warning(f"Notification channel {r['type']} failed for proposal {proposal_id}: {r['error']}")
 
+        return {"sent": sent, "failed": len(results) - sent, "skipped": False, "channels": results, "at": datetime.utcnow().isoformat()}
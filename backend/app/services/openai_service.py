@@ -1,16 +1,18 @@
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
+import httpx
 from openai import AsyncOpenAI
 
 from ..core.settings import settings
 
 
 class OpenAIService:
-    def __init__(self, *, api_key: Optional[str] = None):
+    def __init__(self, *, api_key: Optional[str] = None, http_client: Optional[httpx.AsyncClient] = None):
         key = api_key or settings.OPENAI_API_KEY
         if not key:
             raise RuntimeError("OPENAI_API_KEY is not configured")
-        self.client = AsyncOpenAI(api_key=key)
+        # Retries are scheduled by llm_rate_limit so they respect the shared budget.
+        self.client = AsyncOpenAI(api_key=key, http_client=http_client, max_retries=0)
 
     async def generate(self, *, model: str, temperature: float, max_tokens: int, prompt: str) -> tuple[str, dict[str, Any]]:
         """
@@ -30,4 +32,35 @@ class OpenAIService:
         meta = {"id": resp.id, "model": resp.model, "usage": usage}
         return text, meta
 
+    async def stream(self, *, model: str, temperature: float, max_tokens: int, prompt: str) -> AsyncIterator[tuple[str, Optional[dict[str, Any]]]]:
+        """
+        Streaming ChatCompletions wrapper.
+        Yields (text_delta, None) per chunk, then ("", meta) once the stream ends.
+        """
+        stream = await self.client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": "You are an Upwork proposal assistant."},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        resp_id = None
+        resp_model = model
+        usage: dict[str, Any] = {}
+        async for chunk in stream:
+            resp_id = chunk.id or resp_id
+            resp_model = chunk.model or resp_model
+            if chunk.usage:
+                usage = chunk.usage.model_dump()
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta, None
+        yield "", {"id": resp_id, "model": resp_model, "usage": usage}
 
+    async def close(self) -> None:
+        await self.client.close()
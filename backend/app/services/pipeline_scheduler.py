@@ -0,0 +1,342 @@
+"""
+In-process runner for the pipeline described by scheduler_config.
+
+Every SCHEDULER_POLL_SECONDS the runner re-reads scheduler_config and, when
+enabled and due, takes a lease in scheduler_locks so only one replica runs
+the tick. A heartbeat renews the lease (keyed by owner) while the run is in
+progress; if a renewal fails another replica may have taken over, so the run
+stops before its next step and is recorded as "aborted". The configured steps
+run in order; each run (and each step's duration) is recorded in
+scheduler_runs.
+
+Per-step options come from scheduler_config.metadata[<step>], e.g.
+{"rank": {"user_skills": ["python"], "limit": 200}, "generate": {"top_n": 5}}.
+The "rankings" step fully rebuilds job_rankings; schedule it periodically so
+old jobs age out.
+"""
+import asyncio
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..repositories.base import to_object_id
+from ..repositories.collections import (
+    JobsFilteredRepo,
+    ProposalsRepo,
+    SchedulerConfigRepo,
+    SchedulerLocksRepo,
+    SchedulerRunsRepo,
+)
+from ..schemas.proposals import ProposalBatchRequest
+from .job_ranking import RANK_PROJECTION, RankingService
+from .notification_outbox import OutboxDispatcher
+from .proposal_batch import ProposalBatchService
+from .refilter_service import RefilterService
+from .scoring_service import ScoringService
+
+logger = get_logger(__name__)
+
+LOCK_ID = "pipeline"
+
+StepFn = Callable[["PipelineRunner", dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+async def _step_filter(runner: "PipelineRunner", ctx: dict[str, Any]) -> dict[str, Any]:
+    """Re-apply keyword/geo filters to raw jobs added or changed since the previous run."""
+    # Unchanged re-ingests only bump last_seen_at, so they don't trigger a re-filter/rescore here.
+    return await RefilterService(runner.db).process({"updated_at": {"$gte": ctx["since"]}})
+
+
+async def _step_rescore(runner: "PipelineRunner", ctx: dict[str, Any]) -> dict[str, Any]:
+    """Score filtered jobs touched since the previous run, then refresh stale scores and their rankings."""
+    scorer = ScoringService(runner.db)
+    query = {"updated_at": {"$gte": ctx["since"]}}
+    summary = await scorer.score_jobs(query)
+    stale = await scorer.rescore_stale()
+    ranked = await RankingService(runner.db).refresh(query)
+    return {**summary, "rescored": stale["rescored"], "removed": stale["removed"], "ranked": ranked["updated"]}
+
+
+async def _step_rankings(runner: "PipelineRunner", ctx: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild job_rankings for every saved profile, dropping jobs past RANKING_MAX_AGE_DAYS."""
+    return await RankingService(runner.db).rebuild()
+
+
+async def _step_rank(runner: "PipelineRunner", ctx: dict[str, Any]) -> dict[str, Any]:
+    """Rank recent filtered jobs; the ordering feeds the generate step."""
+    opts = ctx["options"].get("rank") or {}
+    cursor = (
+        JobsFilteredRepo(runner.db).col.find({"created_at": {"$gte": ctx["since"]}}, RANK_PROJECTION)
+        .sort([("created_at", -1)])
+        .limit(int(opts.get("limit", 200)))
+    )
+    docs = await cursor.to_list(length=None)
+    ranked = await RankingService(runner.db).rank(
+        docs,
+        user_skills=opts.get("user_skills"),
+        prioritize_budget=opts.get("prioritize_budget", True),
+        prioritize_low_competition=opts.get("prioritize_low_competition", True),
+    )
+    ctx["ranked_job_ids"] = [j["job_id"] for j in ranked]
+    return {"ranked": len(ctx["ranked_job_ids"])}
+
+
+async def _step_generate(runner: "PipelineRunner", ctx: dict[str, Any]) -> dict[str, Any]:
+    """Generate proposals for the top ranked jobs that don't have one yet."""
+    opts = ctx["options"].get("generate") or {}
+    candidates = ctx.get("ranked_job_ids") or []
+    if not candidates:
+        return {"generated": 0, "reason": "nothing ranked"}
+
+    jobs = JobsFilteredRepo(runner.db)
+    proposals = ProposalsRepo(runner.db)
+    job_ids: list[str] = []
+    for job_id in candidates:
+        if len(job_ids) >= int(opts.get("top_n", 5)):
+            break
+        job = await jobs.find_by_id(job_id)
+        if job and not await proposals.find_one({"job_url": job.get("url")}):
+            job_ids.append(job_id)
+    if not job_ids:
+        return {"generated": 0, "reason": "top jobs already have proposals"}
+
+    req = ProposalBatchRequest(
+        job_ids=job_ids,
+        prompt_template_id=opts.get("prompt_template_id"),
+        portfolio_id=opts.get("portfolio_id"),
+        metadata={"scheduler_run_id": ctx["run_id"]},
+    )
+    svc = ProposalBatchService(runner.db)
+    batch_id = await svc.create(req, job_ids)
+    await svc.run(batch_id, req, job_ids)
+    return {"batch_id": batch_id, "jobs": len(job_ids)}
+
+
+async def _step_notify(runner: "PipelineRunner", ctx: dict[str, Any]) -> dict[str, Any]:
+    """Drain due notification_outbox rows now rather than waiting for the dispatcher poll."""
+    dispatcher = OutboxDispatcher(runner.db, batch_size=settings.NOTIFY_OUTBOX_BATCH_SIZE, poll_interval=0)
+    total = 0
+    while True:
+        n = await dispatcher.dispatch_once()
+        total += n
+        if n < settings.NOTIFY_OUTBOX_BATCH_SIZE:
+            return {"dispatched": total}
+
+
+STEPS: dict[str, StepFn] = {
+    "filter": _step_filter,
+    "rescore": _step_rescore,
+    "rank": _step_rank,
+    "rankings": _step_rankings,
+    "generate": _step_generate,
+    "notify": _step_notify,
+}
+
+
+class PipelineRunner:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.config = SchedulerConfigRepo(db)
+        self.locks = SchedulerLocksRepo(db)
+        self.runs = SchedulerRunsRepo(db)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._running = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _lease_seconds(interval: int) -> int:
+        return max(settings.SCHEDULER_LEASE_SECONDS, interval)
+
+    async def _acquire(self, interval: int, *, force: bool = False) -> Optional[datetime]:
+        """
+        Take the pipeline lease if it is free and the interval has elapsed.
+        Returns the previous run's start time (the "since" cursor) or None if not acquired.
+        """
+        now = datetime.utcnow()
+        query: dict[str, Any] = {"_id": LOCK_ID, "lease_until": {"$lte": now}}
+        if not force:
+            query["last_run_at"] = {"$lte": now - timedelta(seconds=interval)}
+        try:
+            prev = await self.locks.col.find_one_and_update(
+                query,
+                {
+                    "$set": {
+                        "owner": self.owner,
+                        "lease_until": now + timedelta(seconds=self._lease_seconds(interval)),
+                        "last_run_at": now,
+                    }
+                },
+                upsert=True,
+                return_document=ReturnDocument.BEFORE,
+            )
+        except DuplicateKeyError:
+            # Lock doc exists but is held or not yet due.
+            return None
+        if prev is None:
+            # First run ever: look back one interval.
+            return now - timedelta(seconds=interval)
+        return prev.get("last_run_at") or now - timedelta(seconds=interval)
+
+    async def _renew(self, lease_seconds: int) -> bool:
+        """Extend the lease if this runner still owns it; False means it was lost."""
+        now = datetime.utcnow()
+        res = await self.locks.col.update_one(
+            {"_id": LOCK_ID, "owner": self.owner, "lease_until": {"$gt": now}},
+            {"$set": {"lease_until": now + timedelta(seconds=lease_seconds)}},
+        )
+        return res.matched_count == 1
+
+    async def _heartbeat(self, lease_seconds: int, lost: asyncio.Event) -> None:
+        # Renew well before expiry so a slow step doesn't let another replica in
+        while not lost.is_set():
+            await asyncio.sleep(max(lease_seconds / 3, 1))
+            try:
+                renewed = await self._renew(lease_seconds)
+            except Exception as e:
+                logger.error(f"Scheduler lease renewal failed: {e}", exc_info=True)
+                renewed = False
+            if not renewed:
+                logger.error("Scheduler lease lost; aborting the run before its next step")
+                lost.set()
+
+    async def _release(self) -> None:
+        await self.locks.update_one(
+            {"_id": LOCK_ID, "owner": self.owner},
+            {"$set": {"lease_until": datetime.utcnow()}},
+        )
+
+    async def run_once(self, *, force: bool = False) -> Optional[dict[str, Any]]:
+        """
+        Run the configured steps if enabled, due and not already running.
+        Returns the run record, or None when the tick was skipped.
+        """
+        cfg = await self.config.find_one({"_key": "scheduler"})
+        if not cfg or (not cfg.get("enabled", False) and not force):
+            return None
+        if self._running.locked():
+            logger.info("Scheduler tick skipped: previous run still in progress")
+            return None
+
+        async with self._running:
+            interval = int(cfg.get("interval_seconds") or 0)
+            since = await self._acquire(interval, force=force)
+            if since is None:
+                return None
+
+            started = datetime.utcnow()
+            run = {
+                "owner": self.owner,
+                "steps_requested": cfg.get("steps") or [],
+                "status": "running",
+                "started_at": started,
+                "since": since,
+                "steps": [],
+            }
+            run_id = await self.runs.insert_one(run)
+            ctx: dict[str, Any] = {"since": since, "options": cfg.get("metadata") or {}, "run_id": run_id}
+
+            results: list[dict[str, Any]] = []
+            lease_seconds = self._lease_seconds(interval)
+            lost = asyncio.Event()
+            heartbeat = asyncio.create_task(self._heartbeat(lease_seconds, lost))
+            try:
+                for name in cfg.get("steps") or []:
+                    if not lost.is_set() and not await self._renew(lease_seconds):
+                        lost.set()
+                    if lost.is_set():
+                        results.append({"name": name, "ok": False, "error": "scheduler lease lost", "duration_seconds": 0.0})
+                        break
+                    fn = STEPS.get(name)
+                    t0 = time.perf_counter()
+                    if fn is None:
+                        results.append({"name": name, "ok": False, "error": "unknown step", "duration_seconds": 0.0})
+                        continue
+                    try:
+                        summary = await fn(self, ctx)
+                        results.append({"name": name, "ok": True, "summary": summary, "duration_seconds": time.perf_counter() - t0})
+                    except Exception as e:
+                        logger.error(f"Scheduler step {name} failed: {e}", exc_info=True)
+                        results.append({"name": name, "ok": False, "error": str(e), "duration_seconds": time.perf_counter() - t0})
+            finally:
+                heartbeat.cancel()
+                try:
+                    await heartbeat
+                except asyncio.CancelledError:
+                    pass
+                if not lost.is_set():
+                    await self._release()
+                finished = datetime.utcnow()
+                if lost.is_set():
+                    status = "aborted"
+                else:
+                    status = "completed" if all(r["ok"] for r in results) else "partial"
+                update = {
+                    "status": status,
+                    "steps": results,
+                    "finished_at": finished,
+                    "duration_seconds": (finished - started).total_seconds(),
+                }
+                await self.runs.update_one({"_id": to_object_id(run_id)}, {"$set": update})
+                run.update(update)
+            logger.info(f"Scheduler run {run_id} {status} in {run['duration_seconds']:.1f}s")
+            run["id"] = run_id
+            run.pop("_id", None)
+            return run
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scheduler tick failed: {e}", exc_info=True)
+            await asyncio.sleep(settings.SCHEDULER_POLL_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_runner: Optional[PipelineRunner] = None
+
+
+async def start_scheduler(db: AsyncIOMotorDatabase) -> None:
+    """Start the pipeline runner (called from the FastAPI lifespan)."""
+    global _runner
+    if not settings.SCHEDULER_ENABLED or _runner is not None:
+        return
+    _runner = PipelineRunner(db)
+    _runner.start()
+    logger.info("Pipeline scheduler started")
+
+
+async def stop_scheduler() -> None:
+    global _runner
+    if _runner is None:
+        return
+    await _runner.stop()
+    _runner = None
+    logger.info("Pipeline scheduler stopped")
+
+
+def pipeline_runner(db: AsyncIOMotorDatabase) -> PipelineRunner:
+    """The running scheduler, or a one-off runner when the loop is disabled."""
+    return _runner if _runner is not None else PipelineRunner(db)
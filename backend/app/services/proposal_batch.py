@@ -0,0 +1,158 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..repositories.base import to_object_id
+from ..repositories.collections import ProposalBatchesRepo
+from ..schemas.proposals import ProposalBatchRequest, ProposalGenerateRequest
+from .audit import AuditService
+from .notification_outbox import enqueue_proposal_notification
+from .proposal_service import ProposalService
+
+logger = get_logger(__name__)
+
+# Keep references to running batches so tasks aren't garbage-collected mid-run.
+_running: set[asyncio.Task] = set()
+
+
+class ProposalBatchService:
+    """
+    Fans proposal generation for many jobs out over a bounded worker pool.
+    Progress is written to proposal_batches as each job finishes.
+    The per-provider semaphore in the LLM registry still caps in-flight calls.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.batches = ProposalBatchesRepo(db)
+
+    async def create(self, req: ProposalBatchRequest, job_ids: list[str]) -> str:
+        now = datetime.utcnow()
+        doc = {
+            "status": "queued",
+            "job_ids": job_ids,
+            "total": len(job_ids),
+            "completed": 0,
+            "failed": 0,
+            "results": [],
+            "request": req.model_dump(mode="json", exclude={"job_ids"}),
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+        }
+        return await self.batches.insert_one(doc)
+
+    def start(self, batch_id: str, req: ProposalBatchRequest, job_ids: list[str]) -> None:
+        task = asyncio.create_task(self.run(batch_id, req, job_ids))
+        _running.add(task)
+        task.add_done_callback(_running.discard)
+
+    async def _record(self, batch_id: str, item: dict[str, Any]) -> None:
+        counter = "completed" if item["status"] == "generated" else "failed"
+        await self.batches.update_one(
+            {"_id": to_object_id(batch_id)},
+            {
+                "$inc": {counter: 1},
+                "$push": {"results": item},
+                "$set": {"updated_at": datetime.utcnow()},
+            },
+        )
+
+    async def _generate_one(self, batch_id: str, req: ProposalBatchRequest, job_id: str) -> dict[str, Any]:
+        svc = ProposalService(self.db)
+        try:
+            res = await svc.generate(
+                ProposalGenerateRequest(
+                    job_id=job_id,
+                    prompt_template_id=req.prompt_template_id,
+                    portfolio_id=req.portfolio_id,
+                    metadata={**req.metadata, "batch_id": batch_id},
+                    use_cache=req.use_cache,
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Batch {batch_id}: generation failed for job {job_id}: {e}")
+            return {"job_id": job_id, "status": "failed", "error": str(e)}
+
+        await AuditService(self.db).log(
+            action="proposal_generated",
+            entity="proposals",
+            entity_id=res.proposal_id,
+            data={"job_id": job_id, "batch_id": batch_id},
+        )
+        try:
+            await enqueue_proposal_notification(self.db, res.proposal_id)
+        except Exception as e:
+            logger.warning(f"Batch {batch_id}: failed to queue notifications for proposal {res.proposal_id}: {e}")
+        return {"job_id": job_id, "status": "generated", "proposal_id": res.proposal_id, "cached": res.cached}
+
+    async def run(self, batch_id: str, req: ProposalBatchRequest, job_ids: list[str]) -> None:
+        workers = min(req.concurrency or settings.PROPOSAL_BATCH_CONCURRENCY, max(len(job_ids), 1))
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for job_id in job_ids:
+            queue.put_nowait(job_id)
+
+        await self.batches.update_one(
+            {"_id": to_object_id(batch_id)},
+            {"$set": {"status": "running", "workers": workers, "updated_at": datetime.utcnow()}},
+        )
+
+        succeeded = 0
+
+        async def worker() -> None:
+            nonlocal succeeded
+            while True:
+                try:
+                    job_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                item = await self._generate_one(batch_id, req, job_id)
+                if item["status"] == "generated":
+                    succeeded += 1
+                try:
+                    await self._record(batch_id, item)
+                except Exception as e:
+                    logger.error(f"Batch {batch_id}: failed to record result for job {job_id}: {e}")
+
+        started = datetime.utcnow()
+        try:
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        finally:
+            finished = datetime.utcnow()
+            status = "completed" if succeeded or not job_ids else "failed"
+            await self.batches.update_one(
+                {"_id": to_object_id(batch_id)},
+                {
+                    "$set": {
+                        "status": status,
+                        "finished_at": finished,
+                        "updated_at": finished,
+                        "duration_seconds": (finished - started).total_seconds(),
+                    }
+                },
+            )
+            logger.info(f"Proposal batch {batch_id} {status}: {succeeded}/{len(job_ids)} jobs generated with {workers} workers")
+
+    async def get(self, batch_id: str) -> Optional[dict[str, Any]]:
+        return await self.batches.find_by_id(batch_id)
+
+
+async def recover_stale_batches(db: AsyncIOMotorDatabase) -> int:
+    """
+    Mark batches left queued/running by a process that died as interrupted
+    (called from the FastAPI lifespan). Batches run in-process, so nothing
+    resumes them; the cutoff leaves batches another replica is still running alone.
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=settings.PROPOSAL_BATCH_STALE_SECONDS)
+    res = await ProposalBatchesRepo(db).col.update_many(
+        {"status": {"$in": ["queued", "running"]}, "updated_at": {"$lt": cutoff}},
+        {"$set": {"status": "interrupted", "finished_at": now, "updated_at": now}},
+    )
+    if res.modified_count:
+        logger.warning(f"Marked {res.modified_count} stale proposal batches as interrupted")
+    return res.modified_count
@@ -1,11 +1,12 @@
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from ..repositories.collections import AISettingsRepo, JobsFilteredRepo, PortfoliosRepo, PromptTemplatesRepo, ProposalsRepo
 from ..schemas.proposals import ProposalGenerateRequest, ProposalGenerateResponse, ProposalStatus
-from .openai_service import OpenAIService
+from .llm_cache import LLMCache
+from .llm_rate_limit import configure_rate_limits
 
 
 class ProposalService:
@@ -16,11 +17,13 @@ class ProposalService:
         self.prompts = PromptTemplatesRepo(db)
         self.ai = AISettingsRepo(db)
         self.proposals = ProposalsRepo(db)
+        self.cache = LLMCache(db)
 
     async def _get_ai_settings(self) -> dict[str, Any]:
         doc = await self.ai.find_one({"_key": "ai"})
         if not doc:
             raise RuntimeError("AI settings not configured in ai_settings (_key='ai')")
+        configure_rate_limits(doc.get("rate_limits"))
         return doc
 
     async def _get_prompt_template(self, template_id: Optional[str]) -> dict[str, Any]:
@@ -58,7 +61,11 @@ class ProposalService:
         """
         return template.format(job=job, portfolio=portfolio or {})
 
-    async def generate(self, req: ProposalGenerateRequest) -> ProposalGenerateResponse:
+    async def prepare(self, req: ProposalGenerateRequest) -> dict[str, Any]:
+        """
+        Resolve job, template, portfolio and AI settings, and render the prompt.
+        Raises on missing or misconfigured inputs (before any model call).
+        """
         job = await self._get_job(req)
         prompt_doc = await self._get_prompt_template(req.prompt_template_id)
         portfolio_doc = await self._get_portfolio(req.portfolio_id)
@@ -74,20 +81,20 @@ class ProposalService:
 
         prompt = self._render_prompt(template=str(prompt_doc.get("template")), job=job, portfolio=portfolio_doc)
 
-        # Use Gemini or OpenAI based on model name
-        model_str = str(model).lower()
-        if 'gemini' in model_str or model_str == 'gemini-pro' or model_str == 'gemini':
-            from .gemini_service import GeminiService
-            client = GeminiService()
-        else:
-            client = OpenAIService()
-        
-        text, meta = await client.generate(
-            model=str(model),
-            temperature=float(temperature),
-            max_tokens=int(max_tokens),
-            prompt=prompt,
-        )
+        return {
+            "job": job,
+            "prompt_doc": prompt_doc,
+            "portfolio_doc": portfolio_doc,
+            "model": str(model),
+            "temperature": float(temperature),
+            "max_tokens": int(max_tokens),
+            "prompt": prompt,
+        }
+
+    async def _persist(self, req: ProposalGenerateRequest, ctx: dict[str, Any], *, text: str, meta: dict[str, Any], cached: bool) -> ProposalGenerateResponse:
+        job = ctx["job"]
+        prompt_doc = ctx["prompt_doc"]
+        portfolio_doc = ctx["portfolio_doc"]
 
         now = datetime.utcnow()
         doc = {
@@ -97,6 +104,7 @@ class ProposalService:
             "proposal_text": text,
             "model": meta.get("model"),
             "token_usage": meta.get("usage") or {},
+            "cached": cached,
             "prompt_template_id": str(prompt_doc.get("_id")) if prompt_doc.get("_id") else None,
             "portfolio_id": str(portfolio_doc.get("_id")) if portfolio_doc and portfolio_doc.get("_id") else None,
             "metadata": req.metadata or {},
@@ -111,6 +119,41 @@ class ProposalService:
             model=doc.get("model"),
             token_usage=doc.get("token_usage") or {},
             proposal_text=text,
+            cached=cached,
         )
 
+    async def generate(self, req: ProposalGenerateRequest) -> ProposalGenerateResponse:
+        ctx = await self.prepare(req)
+
+        # Shared client (Gemini or OpenAI based on model name), fronted by the response cache
+        text, meta, cached = await self.cache.generate(
+            model=ctx["model"],
+            temperature=ctx["temperature"],
+            max_tokens=ctx["max_tokens"],
+            prompt=ctx["prompt"],
+            use_cache=req.use_cache,
+        )
+
+        return await self._persist(req, ctx, text=text, meta=meta, cached=cached)
 
+    async def stream(self, req: ProposalGenerateRequest, ctx: dict[str, Any]) -> AsyncIterator[tuple[str, Optional[ProposalGenerateResponse]]]:
+        """
+        Streaming variant of generate() for a context from prepare(), which is
+        awaited separately so configuration errors surface before streaming starts.
+        Yields (text_delta, None) as tokens arrive, then ("", response) after the
+        full text and token usage have been persisted to proposals.
+        """
+        parts: list[str] = []
+        async for delta, meta in self.cache.stream(
+            model=ctx["model"],
+            temperature=ctx["temperature"],
+            max_tokens=ctx["max_tokens"],
+            prompt=ctx["prompt"],
+            use_cache=req.use_cache,
+        ):
+            if meta is None:
+                parts.append(delta)
+                yield delta, None
+                continue
+            res = await self._persist(req, ctx, text="".join(parts), meta=meta, cached=bool(meta.get("cached")))
+            yield "", res
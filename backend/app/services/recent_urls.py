@@ -0,0 +1,193 @@
+"""
+Process-local filter of recently seen job URLs, checked before dedup lookups.
+
+Entries are canonical job keys (see services.job_key), so every url form of
+a job maps to the same entry. Each collection that dedups jobs (jobs_raw,
+vollna_jobs) gets a time-windowed Bloom filter: RECENT_URL_GENERATIONS Bloom
+filters that each cover an equal slice of RECENT_URL_WINDOW_DAYS. The oldest
+slice is dropped as the window moves. A url the filter has never seen skips the database lookup. A possible
+hit is confirmed with an indexed query, and misses there are counted as false
+positives. Until the filter has been warmed from the collection at startup,
+every url counts as a possible hit, so nothing is skipped on a cold filter.
+"""
+import asyncio
+import hashlib
+import math
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..db.mongo import has_unique_job_key
+from .job_key import canonical_job_key
+
+logger = get_logger(__name__)
+
+# collection -> timestamp field that says when a url was last received
+WARM_FIELDS = {"jobs_raw": "last_seen_at", "vollna_jobs": "received_at"}
+
+_filters: dict[str, "RecentUrlFilter"] = {}
+_warm_task: Optional[asyncio.Task] = None
+
+
+class _Generation:
+    def __init__(self, started_at: datetime, bits: int):
+        self.started_at = started_at
+        self.bits = bytearray((bits + 7) // 8)
+        self.count = 0
+
+
+class RecentUrlFilter:
+    """Time-windowed Bloom filter over normalized URLs."""
+
+    def __init__(self, name: str, *, window: timedelta, generations: int, capacity: int, error_rate: float):
+        self.name = name
+        self.window = window
+        self.span = window / max(generations, 1)
+        self.max_generations = max(generations, 1)
+        # Sized so each generation holds its share of capacity at error_rate
+        per_generation = max(capacity // self.max_generations, 1)
+        self.num_bits = max(int(-per_generation * math.log(error_rate) / math.log(2) ** 2), 64)
+        self.num_hashes = max(round(self.num_bits / per_generation * math.log(2)), 1)
+        # Newest first; backdated so urls loaded at warm-up land in the slice they were seen in
+        now = datetime.utcnow()
+        self.generations = [_Generation(now - i * self.span, self.num_bits) for i in range(self.max_generations)]
+        self.ready = False
+        self.stats: dict[str, int] = {"checks": 0, "skipped_lookups": 0, "confirmed": 0, "false_positives": 0}
+
+    def _positions(self, url: str) -> list[int]:
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def _rotate(self, now: datetime) -> None:
+        newest = self.generations[0].started_at
+        if now - newest >= self.window:
+            newest = now - self.span  # idle for a whole window: start over
+        while now - newest >= self.span:
+            newest += self.span
+            self.generations.insert(0, _Generation(newest, self.num_bits))
+        del self.generations[self.max_generations:]
+
+    def add(self, url: Optional[str], seen_at: Optional[datetime] = None) -> None:
+        if not url or not isinstance(url, str):
+            return
+        now = datetime.utcnow()
+        self._rotate(now)
+        seen_at = seen_at or now
+        gen = next((g for g in self.generations if seen_at >= g.started_at), None)
+        if gen is None:
+            return  # older than the window
+        for pos in self._positions(url):
+            gen.bits[pos >> 3] |= 1 << (pos & 7)
+        gen.count += 1
+
+    def might_contain(self, url: Optional[str]) -> bool:
+        """
+        False means the key was definitely not seen within the window; True needs
+        confirming. A missing or non-string key is never in the filter.
+        """
+        self.stats["checks"] += 1
+        if not url or not isinstance(url, str):
+            self.stats["skipped_lookups"] += 1
+            return False
+        if not self.ready:
+            return True
+        self._rotate(datetime.utcnow())
+        positions = self._positions(url)
+        for gen in self.generations:
+            if all(gen.bits[pos >> 3] & (1 << (pos & 7)) for pos in positions):
+                return True
+        self.stats["skipped_lookups"] += 1
+        return False
+
+    def record_lookup(self, found: bool) -> None:
+        """Outcome of the database lookup that confirmed a might_contain() hit."""
+        self.stats["confirmed" if found else "false_positives"] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        checks = self.stats["checks"]
+        negatives = self.stats["skipped_lookups"] + self.stats["false_positives"]
+        return {
+            "collection": self.name,
+            "ready": self.ready,
+            **self.stats,
+            "hit_rate": (self.stats["confirmed"] / checks) if checks else 0.0,
+            "false_positive_rate": (self.stats["false_positives"] / negatives) if negatives else 0.0,
+            "entries": sum(gen.count for gen in self.generations),
+            "generations": len(self.generations),
+            "bits_per_generation": self.num_bits,
+            "hashes": self.num_hashes,
+        }
+
+
+def recent_urls(collection: str) -> Optional[RecentUrlFilter]:
+    """
+    The filter for a collection, or None when RECENT_URL_FILTER_ENABLED is off
+    or the collection has no unique job_key index. Without that index nothing
+    else stops a duplicate, so every key goes to the confirming lookup.
+    """
+    if not settings.RECENT_URL_FILTER_ENABLED or not has_unique_job_key(collection):
+        return None
+    flt = _filters.get(collection)
+    if flt is None:
+        flt = _filters[collection] = RecentUrlFilter(
+            collection,
+            window=timedelta(days=settings.RECENT_URL_WINDOW_DAYS),
+            generations=settings.RECENT_URL_GENERATIONS,
+            capacity=settings.RECENT_URL_CAPACITY,
+            error_rate=settings.RECENT_URL_ERROR_RATE,
+        )
+    return flt
+
+
+def recent_url_stats() -> list[dict[str, Any]]:
+    return [flt.snapshot() for flt in _filters.values()]
+
+
+async def _warm(db: AsyncIOMotorDatabase, collection: str) -> None:
+    flt = recent_urls(collection)
+    if flt is None:
+        return
+    field = WARM_FIELDS[collection]
+    cutoff = datetime.utcnow() - flt.window
+    loaded = 0
+    cursor = db[collection].find({field: {"$gte": cutoff}}, {"url": 1, "job_key": 1, field: 1, "_id": 0}).batch_size(5000)
+    async for doc in cursor:
+        key = doc.get("job_key") or canonical_job_key(doc.get("url"))
+        if key:
+            flt.add(key, doc.get(field))
+            loaded += 1
+    flt.ready = True
+    logger.info(f"Recent-url filter for {collection} warmed with {loaded} urls")
+
+
+async def _warm_all(db: AsyncIOMotorDatabase) -> None:
+    for collection in WARM_FIELDS:
+        try:
+            await _warm(db, collection)
+        except Exception as e:
+            # Stays not ready, so every url keeps going to the database
+            logger.error(f"Failed to warm recent-url filter for {collection}: {e}", exc_info=True)
+
+
+def start_recent_url_warmup(db: AsyncIOMotorDatabase) -> None:
+    """Warm the filters in the background (called from the FastAPI lifespan)."""
+    global _warm_task
+    if not settings.RECENT_URL_FILTER_ENABLED or _warm_task is not None:
+        return
+    _warm_task = asyncio.create_task(_warm_all(db))
+
+
+async def stop_recent_url_warmup() -> None:
+    global _warm_task
+    if _warm_task is not None and not _warm_task.done():
+        _warm_task.cancel()
+        try:
+            await _warm_task
+        except asyncio.CancelledError:
+            pass
+    _warm_task = None
@@ -0,0 +1,219 @@
+"""
+Re-evaluate stored jobs against the current keyword/geo filters.
+
+Every evaluated jobs_raw document records the filter version it was checked
+against (filter_version) and the outcome (filter_passed). When the config
+changes, the previous snapshot in filter_state is diffed against the current
+one so only jobs whose outcome can flip are re-checked:
+
+- keyword added (match_mode "any"): currently rejected jobs containing the term
+- keyword removed ("any"): currently passing jobs containing the term
+- keyword added/removed ("all"): currently passing / rejected jobs respectively
+- excluded country added/removed: passing / rejected jobs in that region
+
+Anything else (mode or match locations changed, keywords switched on/off
+entirely) falls back to a full pass. Jobs never evaluated are always checked.
+"""
+import re
+from datetime import datetime
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DeleteOne, UpdateOne
+
+from ..core.background import SingleFlight
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..repositories.base import oid_str
+from ..repositories.collections import FilterStateRepo, JobsFilteredRepo, JobsRawRepo
+from .filter_service import FilterService, normalize_region
+from .job_ranking import schedule_ranking_update
+
+logger = get_logger(__name__)
+
+_FILTERED_FIELDS = ("job_key", "title", "description", "source", "region", "posted_at", "skills", "budget", "proposals", "client", "features")
+_LOCATION_FIELDS = {"title": "title", "description": "description", "skills": "skills"}
+
+_background = SingleFlight("re-filter")
+
+
+def _contains_any(terms: list[str], locations: list[str]) -> dict[str, Any]:
+    pattern = "|".join(re.escape(t) for t in terms)
+    fields = [_LOCATION_FIELDS[loc] for loc in locations if loc in _LOCATION_FIELDS]
+    return {"$or": [{f: {"$regex": pattern, "$options": "i"}} for f in fields]}
+
+
+def _region_in(regions: list[str]) -> dict[str, Any]:
+    # Stored regions may still carry the whitespace geo_match strips before comparing
+    return {"region": {"$in": [re.compile(rf"^\s*{re.escape(r)}\s*$") for r in regions]}}
+
+
+def affected_query(prev: Optional[dict[str, Any]], cur: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """
+    Mongo query for jobs whose filter outcome may change between two rules
+    snapshots, or None if every job has to be re-checked.
+    """
+    if prev is None:
+        return None
+    if prev["match_mode"] != cur["match_mode"] or prev["match_locations"] != cur["match_locations"]:
+        return None
+    # keyword_match() accepts everything when terms (or mode/locations) are unset.
+    keywords_active_before = bool(prev["terms"] and prev["match_mode"] and prev["match_locations"])
+    keywords_active_now = bool(cur["terms"] and cur["match_mode"] and cur["match_locations"])
+    if keywords_active_before != keywords_active_now:
+        return None
+
+    clauses: list[dict[str, Any]] = []
+    added = sorted(set(cur["terms"]) - set(prev["terms"]))
+    removed = sorted(set(prev["terms"]) - set(cur["terms"]))
+    if keywords_active_now and (added or removed):
+        if cur["match_mode"] == "all":
+            if added:
+                clauses.append({"filter_passed": True})
+            if removed:
+                clauses.append({"filter_passed": False})
+        else:
+            if added:
+                clauses.append({"filter_passed": False, **_contains_any(added, cur["match_locations"])})
+            if removed:
+                clauses.append({"filter_passed": True, **_contains_any(removed, cur["match_locations"])})
+
+    prev_geo = {normalize_region(c) for c in prev["excluded_countries"]} - {""}
+    cur_geo = {normalize_region(c) for c in cur["excluded_countries"]} - {""}
+    geo_added = sorted(cur_geo - prev_geo)
+    geo_removed = sorted(prev_geo - cur_geo)
+    if geo_added:
+        clauses.append({"filter_passed": True, **_region_in(geo_added)})
+    if geo_removed:
+        clauses.append({"filter_passed": False, **_region_in(geo_removed)})
+
+    return {"$or": clauses} if clauses else {"_id": {"$exists": False}}
+
+
+class RefilterService:
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.filters = FilterService(db)
+        self.raw = JobsRawRepo(db)
+        self.filtered = JobsFilteredRepo(db)
+        self.state = FilterStateRepo(db)
+
+    async def process(self, query: dict[str, Any], *, rules: Optional[tuple] = None) -> dict[str, int]:
+        """
+        Stream jobs_raw matching `query` in batches, apply the current filters and
+        bulk-upsert / remove the matching jobs_filtered entries.
+        """
+        settings_doc, keywords, geo = rules or await self.filters.load_rules()
+        version = FilterService.rules_version(FilterService.rules_snapshot(settings_doc, keywords, geo))
+        batch_size = settings.REFILTER_BATCH_SIZE
+
+        stats = {"checked": 0, "passed": 0, "removed": 0}
+        raw_ops: list[UpdateOne] = []
+        filtered_ops: list[Any] = []
+        touched: list[str] = []
+
+        async def flush() -> None:
+            if filtered_ops:
+                res = await self.filtered.col.bulk_write(filtered_ops, ordered=False)
+                stats["removed"] += res.deleted_count
+                filtered_ops.clear()
+            if raw_ops:
+                await self.raw.col.bulk_write(raw_ops, ordered=False)
+                raw_ops.clear()
+
+        cursor = self.raw.col.find(query, {"raw": 0}).batch_size(batch_size)
+        async for job in cursor:
+            stats["checked"] += 1
+            ok_kw, reasons_kw = self.filters.keyword_match(job, settings=settings_doc, keywords=keywords)
+            ok_geo, reasons_geo = self.filters.geo_match(job, geo)
+            passed = ok_kw and ok_geo
+            reasons = reasons_kw + reasons_geo
+            now = datetime.utcnow()
+
+            if passed:
+                stats["passed"] += 1
+                filtered_ops.append(
+                    UpdateOne(
+                        {"url": job["url"]},
+                        {
+                            "$setOnInsert": {"url": job["url"], "metadata": {}, "created_at": now},
+                            "$set": {
+                                **{k: job.get(k) for k in _FILTERED_FIELDS},
+                                "raw_id": oid_str(job["_id"]),
+                                "filter_reasons": reasons,
+                                "filter_version": version,
+                                "updated_at": now,
+                            },
+                        },
+                        upsert=True,
+                    )
+                )
+            else:
+                filtered_ops.append(DeleteOne({"url": job["url"]}))
+            touched.append(job["url"])
+            raw_ops.append(
+                UpdateOne(
+                    {"_id": job["_id"]},
+                    {"$set": {"filter_version": version, "filter_passed": passed, "filter_reasons": reasons}},
+                )
+            )
+            if len(raw_ops) >= batch_size:
+                await flush()
+        await flush()
+        if touched and settings.RANKING_UPDATE_ON_INGEST:
+            schedule_ranking_update(self.db, touched)
+        return stats
+
+    async def refilter(self, *, full: bool = False) -> dict[str, Any]:
+        """Bring every jobs_raw document up to the current filter version."""
+        started = datetime.utcnow()
+        rules = await self.filters.load_rules()
+        snapshot = FilterService.rules_snapshot(*rules)
+        version = FilterService.rules_version(snapshot)
+
+        state = await self.state.find_one({"_key": "filters"})
+        prev_snapshot = state.get("snapshot") if state else None
+        prev_version = state.get("version") if state else None
+
+        narrowed = None if full else affected_query(prev_snapshot, snapshot)
+        if narrowed is None:
+            query: dict[str, Any] = {"filter_version": {"$ne": version}}
+            mode = "full"
+        else:
+            # Jobs never evaluated (or evaluated against an older, unknown version) are always checked.
+            query = {"$or": [{"filter_version": {"$nin": [prev_version, version]}}, {"filter_version": prev_version, **narrowed}]}
+            mode = "incremental"
+
+        stats = await self.process(query, rules=rules)
+
+        skipped = 0
+        if narrowed is not None and prev_version and prev_version != version:
+            # Everything else was checked against prev_version and cannot have changed outcome.
+            res = await self.raw.col.update_many({"filter_version": prev_version}, {"$set": {"filter_version": version}})
+            skipped = res.modified_count
+            await self.filtered.col.update_many({"filter_version": prev_version}, {"$set": {"filter_version": version}})
+
+        finished = datetime.utcnow()
+        await self.state.update_one(
+            {"_key": "filters"},
+            {"$set": {"_key": "filters", "version": version, "snapshot": snapshot, "updated_at": finished}},
+            upsert=True,
+        )
+        summary = {
+            "version": version,
+            "previous_version": prev_version,
+            "mode": mode,
+            **stats,
+            "carried_over": skipped,
+            "duration_seconds": (finished - started).total_seconds(),
+        }
+        logger.info(f"Re-filter finished: {summary}")
+        return summary
+
+
+def schedule_refilter(db: AsyncIOMotorDatabase) -> None:
+    """
+    Re-filter stored jobs in the background after a filter config change.
+    Rapid successive edits are coalesced into at most one extra run.
+    """
+    _background.trigger(lambda: RefilterService(db).refilter())
@@ -2,11 +2,22 @@ from datetime import datetime
 from typing import Any, Optional
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
 
-from ..repositories.collections import ClientRulesRepo, JobRulesRepo, JobScoresRepo, RiskRulesRepo
+from ..core.background import SingleFlight
+from ..core.logging import get_logger
+from ..core.settings import settings
+from ..repositories.base import oid_str
+from ..repositories.collections import ClientRulesRepo, JobRulesRepo, JobScoresRepo, JobsFilteredRepo, RiskRulesRepo
 from ..schemas.scoring import ScoreResult
 from .rule_engine import aggregate, eval_rule
 
+logger = get_logger(__name__)
+
+RULESET_KEYS = ("client_rules", "job_rules", "risk_rules")
+
+_background = SingleFlight("rescore")
+
 
 class ScoringService:
     """
@@ -19,16 +30,30 @@ class ScoringService:
         self.job_rules = JobRulesRepo(db)
         self.risk_rules = RiskRulesRepo(db)
         self.scores = JobScoresRepo(db)
+        self.jobs = JobsFilteredRepo(db)
 
     async def _load_ruleset(self, repo, key: str) -> Optional[dict[str, Any]]:
         return await repo.find_one({"_key": key})
 
-    async def score_job(self, job: dict[str, Any]) -> ScoreResult:
+    async def load_rulesets(self) -> dict[str, dict[str, Any]]:
+        return {
+            "client_rules": await self._load_ruleset(self.client_rules, "client_rules") or {},
+            "job_rules": await self._load_ruleset(self.job_rules, "job_rules") or {},
+            "risk_rules": await self._load_ruleset(self.risk_rules, "risk_rules") or {},
+        }
+
+    @staticmethod
+    def ruleset_versions(rulesets: dict[str, dict[str, Any]]) -> dict[str, int]:
+        """Version of each ruleset (bumped on every upsert; 0 if never saved)."""
+        return {key: int(rulesets.get(key, {}).get("version") or 0) for key in RULESET_KEYS}
+
+    async def score_job(self, job: dict[str, Any], rulesets: Optional[dict[str, dict[str, Any]]] = None) -> ScoreResult:
         payload = {"job": job, "client": job.get("client") or {}}
 
-        client_rs = await self._load_ruleset(self.client_rules, "client_rules") or {}
-        job_rs = await self._load_ruleset(self.job_rules, "job_rules") or {}
-        risk_rs = await self._load_ruleset(self.risk_rules, "risk_rules") or {}
+        rulesets = rulesets if rulesets is not None else await self.load_rulesets()
+        client_rs = rulesets["client_rules"]
+        job_rs = rulesets["job_rules"]
+        risk_rs = rulesets["risk_rules"]
 
         rejection_reasons: list[str] = []
         passed = True
@@ -90,13 +115,104 @@ class ScoringService:
             confidence_details=confidence_details,
         )
 
-    async def persist_score(self, *, job_url: str, job_id: Optional[str], result: ScoreResult) -> str:
-        doc = {
-            "job_url": job_url,
-            "job_id": job_id,
-            "result": result.model_dump(mode="json"),
-            "created_at": datetime.utcnow(),
+    def _score_update(self, *, job_url: str, job_id: Optional[str], result: ScoreResult, versions: dict[str, int]) -> dict[str, Any]:
+        now = datetime.utcnow()
+        return {
+            "$set": {
+                "job_id": job_id,
+                "result": result.model_dump(mode="json"),
+                "rule_versions": versions,
+                "updated_at": now,
+            },
+            "$setOnInsert": {"job_url": job_url, "created_at": now},
+        }
+
+    async def persist_score(
+        self,
+        *,
+        job_url: str,
+        job_id: Optional[str],
+        result: ScoreResult,
+        rule_versions: Optional[dict[str, int]] = None,
+    ) -> str:
+        """Upsert the current score for a job (one row per job_url)."""
+        versions = rule_versions if rule_versions is not None else self.ruleset_versions(await self.load_rulesets())
+        doc = await self.scores.col.find_one_and_update(
+            {"job_url": job_url},
+            self._score_update(job_url=job_url, job_id=job_id, result=result, versions=versions),
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+            projection={"_id": 1},
+        )
+        return oid_str(doc["_id"])
+
+    async def score_jobs(self, query: dict[str, Any]) -> dict[str, int]:
+        """Score jobs_filtered matching `query` in bulk with one rules load."""
+        rulesets = await self.load_rulesets()
+        versions = self.ruleset_versions(rulesets)
+        ops: list[UpdateOne] = []
+        scored = 0
+        async for job in self.jobs.col.find(query, {"raw": 0}).batch_size(settings.RESCORE_BATCH_SIZE):
+            result = await self.score_job(job, rulesets)
+            ops.append(
+                UpdateOne(
+                    {"job_url": job.get("url")},
+                    self._score_update(job_url=job.get("url"), job_id=oid_str(job["_id"]), result=result, versions=versions),
+                    upsert=True,
+                )
+            )
+            scored += 1
+            if len(ops) >= settings.RESCORE_BATCH_SIZE:
+                await self.scores.col.bulk_write(ops, ordered=False)
+                ops.clear()
+        if ops:
+            await self.scores.col.bulk_write(ops, ordered=False)
+        return {"scored": scored}
+
+    async def rescore_stale(self) -> dict[str, Any]:
+        """
+        Recompute only scores produced by older ruleset versions.
+        Scores whose job is no longer in jobs_filtered are dropped.
+        """
+        started = datetime.utcnow()
+        rulesets = await self.load_rulesets()
+        versions = self.ruleset_versions(rulesets)
+        stale = {"$or": [{f"rule_versions.{k}": {"$ne": v}} for k, v in versions.items()]}
+
+        rescored = removed = 0
+        while True:
+            rows = await self.scores.col.find(stale, {"job_url": 1}).limit(settings.RESCORE_BATCH_SIZE).to_list(length=None)
+            if not rows:
+                break
+            urls = [r["job_url"] for r in rows]
+            jobs = {j["url"]: j async for j in self.jobs.col.find({"url": {"$in": urls}}, {"raw": 0})}
+            ops: list[Any] = []
+            for row in rows:
+                job = jobs.get(row["job_url"])
+                if job is None:
+                    ops.append(DeleteOne({"_id": row["_id"]}))
+                    removed += 1
+                    continue
+                result = await self.score_job(job, rulesets)
+                ops.append(
+                    UpdateOne(
+                        {"_id": row["_id"]},
+                        self._score_update(job_url=job["url"], job_id=oid_str(job["_id"]), result=result, versions=versions),
+                    )
+                )
+                rescored += 1
+            await self.scores.col.bulk_write(ops, ordered=False)
+
+        summary = {
+            "rule_versions": versions,
+            "rescored": rescored,
+            "removed": removed,
+            "duration_seconds": (datetime.utcnow() - started).total_seconds(),
         }
-        return await self.scores.insert_one(doc)
+        logger.info(f"Rescore finished: {summary}")
+        return summary
 
 
+def schedule_rescore(db: AsyncIOMotorDatabase) -> None:
+    """Recompute stale scores in the background after a ruleset change."""
+    _background.trigger(lambda: ScoringService(db).rescore_stale())
@@ -0,0 +1,40 @@
+"""
+Description cleanup shared by the ingest paths (Vollna webhook, RSS and
+Upwork JSON conversion, /ingest/vollna).
+
+CDATA markers and HTML tags are removed with precompiled patterns, then every
+HTML entity (named, decimal and hex) is decoded in one html.unescape pass.
+Descriptions longer than MAX_DESCRIPTION_CHARS are cut to that length.
+"""
+import html
+import re
+from typing import Optional
+
+from ..core.settings import settings
+
+_CDATA_RE = re.compile(r"<!\[CDATA\[(.*?)\]\]>", re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+# &nbsp; decodes to U+00A0; store it as a plain space like before.
+_NBSP = {0xA0: " "}
+
+
+def clean_description(text: Optional[str], *, max_length: Optional[int] = None) -> str:
+    """
+    Plain-text description: CDATA unwrapped, tags stripped, entities decoded,
+    whitespace trimmed. max_length defaults to settings.MAX_DESCRIPTION_CHARS
+    (None or 0 means no limit).
+    """
+    if not text:
+        return ""
+    if "<" in text:
+        if "<![CDATA[" in text:
+            text = _CDATA_RE.sub(r"\1", text)
+        text = _TAG_RE.sub("", text)
+    if "&" in text:
+        text = html.unescape(text).translate(_NBSP)
+    text = text.strip()
+
+    limit = settings.MAX_DESCRIPTION_CHARS if max_length is None else max_length
+    if limit and len(text) > limit:
+        text = text[:limit].rstrip()
+    return text
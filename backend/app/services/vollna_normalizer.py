@@ -0,0 +1,266 @@
+"""
+Vollna webhook job normalization, kept free of I/O so it can run off the
+event loop.
+
+normalize_webhook_job() turns one webhook job into a vollna_jobs document
+(regex budget/URL extraction, description cleanup, posted_at parsing). Batches
+of at least NORMALIZE_POOL_THRESHOLD jobs are split into chunks and
+normalized on a process pool. This keeps a large burst from stalling
+other requests. Smaller batches run inline to skip the pickling overhead.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import Any, Optional
+from urllib.parse import urlparse, parse_qs, unquote
+
+from ..core.logging import get_logger
+from ..core.settings import settings
+from .date_parser import parse_posted_at
+from .job_key import canonical_job_key
+from .job_normalizer import TITLE_RATE_RE, VOLLNA_WEBHOOK_FIELDS
+from .text_sanitizer import clean_description
+
+logger = get_logger(__name__)
+
+# (job index, document to insert or None, error or None)
+NormalizedJob = tuple[int, Optional[dict[str, Any]], Optional[str]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def normalize_webhook_job(job: Any, idx: int, *, received_at: datetime) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+    """
+    (document, None) for a storable job, (None, error) for an invalid one and
+    (None, None) for jobs that are skipped on purpose (test jobs, filter metadata).
+    idx is the job's position in the payload; job 0 gets verbose logging.
+    The original payload is not part of the document (it goes to job_payloads).
+    """
+    received_utc = received_at.replace(tzinfo=timezone.utc)
+    
+    if not isinstance(job, dict):
+        logger.warning(f"Skipping job {idx}: not a dict")
+        return None, f"Job {idx}: Not a dictionary"
+    
+    # 🛑 Skip test messages and test jobs (already handled at payload level, but double-check)
+    if job.get("event") == "webhook.test":
+        logger.info(f"Skipping test webhook payload (event: webhook.test)")
+        return None, None
+    
+    # Skip filter metadata objects (they don't have job data)
+    if "filter" in job and not (job.get("title") or job.get("url")):
+        logger.debug(f"Skipping filter metadata object: {job.get('filter', {}).get('name', 'unknown')}")
+        return None, None
+    
+    # Extract fields (see VOLLNA_WEBHOOK_FIELDS for candidate keys)
+    winners: dict[str, str] = {}
+    fields = VOLLNA_WEBHOOK_FIELDS.extract(job, winners=winners)
+    
+    job_title = fields["title"]
+    if "test" in str(job_title).lower():
+        logger.info(f"Skipping test job: {job_title}")
+        return None, None
+    
+    # ✅ Extract URL - handle Vollna tracking links
+    job_url = fields["url"].strip() if isinstance(fields["url"], str) else fields["url"]
+    
+    # Extract real Upwork URL from Vollna tracking links
+    # Format: https://www.vollna.com/go?...&url=https%253A%2F%2Fwww.upwork.com%2Fjobs%2F~
+    if job_url and "vollna.com/go" in job_url and "url=" in job_url:
+        try:
+            parsed = urlparse(job_url)
+            params = parse_qs(parsed.query)
+            if "url" in params:
+                # Double URL encoding: %253A becomes %3A becomes :
+                decoded_url = unquote(unquote(params["url"][0]))
+                job_url = decoded_url
+                logger.debug(f"Extracted Upwork URL from tracking link: {job_url[:50]}...")
+        except Exception as e:
+            logger.warning(f"Failed to extract URL from tracking link: {e}")
+            # Keep original URL if extraction fails
+    
+    if not job_title or not job_url:
+        # Log the actual job structure to understand what Vollna is sending
+        logger.warning(
+            f"Skipping incomplete job payload (missing title or URL): "
+            f"title={bool(job_title)}, url={bool(job_url)}, "
+            f"job_keys={list(job.keys())[:10]}, "
+            f"sample_job={str(job)[:200]}"
+        )
+        return None, None
+    
+    # Dedup key; a url it can't be derived from can't be deduplicated either
+    job_key = canonical_job_key(job_url)
+    if job_key is None:
+        logger.warning(f"Skipping job {idx}: unusable URL {str(job_url)[:100]!r}")
+        return None, f"Job {idx}: Invalid URL: {str(job_url)[:100]}"
+    
+    # Extract description - strip CDATA/HTML and decode entities
+    description = clean_description(fields["description"])
+    
+    # Extract skills from categories (RSS format)
+    skills = fields["skills"] or []
+    if not skills and fields["categories"]:
+        categories = fields["categories"]
+        if isinstance(categories, list):
+            skills = [cat.get("text", cat) if isinstance(cat, dict) else str(cat) for cat in categories]
+        elif isinstance(categories, str):
+            skills = [categories]
+    
+    # Extract budget from title if present (e.g., "Job Title (Hourly Rate: 3 - 10 USD)")
+    budget = fields["budget"]
+    if not budget or budget == 0:
+        # Try to extract from title
+        budget_match = TITLE_RATE_RE.search(job_title)
+        if budget_match:
+            budget = float(budget_match.group(2))  # Use max rate
+    
+    # posted_at from the first time field set (top-level first, then under "raw")
+    posted_at = fields["posted_at"]
+    if idx == 0:  # Log for first job only
+        if posted_at:
+            logger.info(f"🔍 Found time field '{winners['posted_at']}': {posted_at}")
+        else:
+            logger.warning(f"🔍 No time field found in job. Available fields: {list(job.keys())}")
+    
+    # Normalize to an ISO-8601 UTC string; unrecognized strings are kept as sent
+    if posted_at:
+        parsed_at = parse_posted_at(posted_at, now=received_utc)
+        if parsed_at is not None:
+            posted_at = parsed_at.isoformat()
+            if idx == 0:
+                logger.info(f"🔍 Parsed time: {posted_at}")
+        elif isinstance(posted_at, str):
+            if idx == 0:
+                logger.warning(f"🔍 Failed to parse time '{posted_at}'")
+        else:
+            posted_at = None
+    
+    # If posted_at is still None or empty after all parsing attempts, use received_at as fallback
+    if not posted_at:
+        logger.debug(f"No posted_at found for job: {job_title[:50]}... Using received_at as fallback")
+        posted_at = received_utc.isoformat()
+    
+    # Log available fields from Vollna payload (first job only to avoid spam)
+    if idx == 0:
+        logger.info(f"🔍 Sample job fields from Vollna: {list(job.keys())}")
+        logger.info(f"🔍 Client data: client_name={job.get('client_name')}, client={job.get('client')}")
+        logger.info(f"🔍 Proposals data: proposals={job.get('proposals')}, proposal_count={job.get('proposal_count')}, num_proposals={job.get('num_proposals')}")
+        # Show full job structure for first job (truncated)
+        job_str = str(job)
+        if len(job_str) > 1000:
+            logger.info(f"🔍 Full job structure (truncated): {job_str[:1000]}...")
+        else:
+            logger.info(f"🔍 Full job structure: {job}")
+    
+    # Extract client_name - Vollna doesn't send client_name, only client_details
+    # client_details contains: rank, rating, payment_method_verified, total_spent, etc., but NO name
+    client_name = fields["client_name"]
+    
+    # Extract client_rating from client_details if available
+    client_details = job.get("client_details", {})
+    client_rating_from_details = None
+    if isinstance(client_details, dict):
+        client_rating_from_details = client_details.get("rating")
+    
+    if idx == 0:
+        logger.info(f"🔍 Extracted client_name: '{client_name}' (Vollna doesn't provide client names)")
+        logger.info(f"🔍 client_details available: {bool(client_details)}, rating: {client_rating_from_details}")
+    
+    # Extract proposals - Vollna does NOT send proposals/proposal_count in their payload
+    proposals = fields["proposals"]
+    if idx == 0:
+        logger.info(f"🔍 Extracted proposals: {proposals} (Vollna does NOT provide proposal counts)")
+    
+    # Normalize job fields to standard format
+    doc = {
+        # Standard fields (map from various Vollna field names)
+        "title": job_title,
+        "url": job_url,
+        "job_key": job_key,
+        "description": description,
+        "budget": budget,
+        "budget_value": budget,
+        "client_name": client_name,  # Vollna doesn't provide this - will be empty
+        "client_rating": client_rating_from_details or job.get("client_rating") or (job.get("client", {}).get("rating") if isinstance(job.get("client"), dict) else None),
+        "client_details": client_details,  # Store full client_details for reference
+        "proposals": proposals,
+        "skills": skills if isinstance(skills, list) else (skills.split(", ") if isinstance(skills, str) else []),
+        "platform": job.get("platform") or "upwork",
+        "posted_at": posted_at,
+        "location": fields["location"],
+        "job_type": fields["job_type"],
+        
+        # Preserve original client object if it exists
+        "client": job.get("client") if isinstance(job.get("client"), dict) else {},
+    }
+    
+    # Add metadata only if missing (avoid $set conflicts)
+    if "source" not in doc:
+        doc["source"] = "vollna"
+    if "received_at" not in doc:
+        doc["received_at"] = received_at
+    if "created_at" not in doc:
+        doc["created_at"] = received_at
+    
+    return doc, None
+
+
+def normalize_webhook_jobs(jobs: list[Any], offset: int, received_at: datetime) -> list[NormalizedJob]:
+    """Normalize a chunk of jobs (also the unit of work sent to the pool)."""
+    results: list[NormalizedJob] = []
+    for idx, job in enumerate(jobs, start=offset):
+        try:
+            doc, error = normalize_webhook_job(job, idx, received_at=received_at)
+        except Exception as e:
+            doc, error = None, f"Job {idx}: Error normalizing - {str(e)}"
+            logger.error(error, exc_info=True)
+        results.append((idx, doc, error))
+    return results
+
+
+async def normalize_webhook_batch(jobs: list[Any], *, received_at: datetime, offset: int = 0) -> list[NormalizedJob]:
+    """Normalize jobs in payload order, on the process pool when the batch is large enough."""
+    if _pool is None or len(jobs) < settings.NORMALIZE_POOL_THRESHOLD:
+        return normalize_webhook_jobs(jobs, offset, received_at)
+    
+    loop = asyncio.get_running_loop()
+    size = settings.NORMALIZE_POOL_CHUNK_SIZE
+    futures = [
+        loop.run_in_executor(_pool, normalize_webhook_jobs, jobs[start:start + size], offset + start, received_at)
+        for start in range(0, len(jobs), size)
+    ]
+    try:
+        chunks = await asyncio.gather(*futures)
+    except BrokenProcessPool:
+        logger.error("Normalization pool broke; restarting it and normalizing this batch inline", exc_info=True)
+        close_normalize_pool()
+        init_normalize_pool()
+        return normalize_webhook_jobs(jobs, offset, received_at)
+    results: list[NormalizedJob] = []
+    for chunk in chunks:
+        results.extend(chunk)
+    return results
+
+
+def init_normalize_pool() -> None:
+    """Create the normalization process pool (called from the FastAPI lifespan)."""
+    global _pool
+    if _pool is not None or settings.NORMALIZE_POOL_WORKERS <= 0:
+        return
+    # spawn: forking a process that already runs the event loop and driver threads is unsafe
+    _pool = ProcessPoolExecutor(
+        max_workers=settings.NORMALIZE_POOL_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    logger.info(f"Normalization pool started ({settings.NORMALIZE_POOL_WORKERS} workers)")
+
+
+def close_normalize_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        logger.info("Normalization pool stopped")
+    _pool = None
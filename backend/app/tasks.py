@@ -1,18 +1,140 @@
-import os
-from celery import Celery
-from time import sleep
-
-celery = Celery(
-    "tasks",
-    broker=os.getenv("REDIS_URL"),
-    backend=os.getenv("REDIS_URL")
-)
-
-@celery.task(bind=True, max_retries=3)
-def generate_proposal(self, job_id: int):
-    # Demo: replace with actual OpenAI API call
-    print(f"[Celery] Generating proposal for job_id={job_id}")
-    sleep(2)
-    result = {"proposal": f"Sample proposal for job {job_id}"}
-    print(f"[Celery] Done: {result}")
-    return result
+"""
+Celery worker path for proposal generation.
+
+Run a worker with:
+    celery -A app.tasks worker --loglevel=info
+
+The broker comes from CELERY_BROKER_URL (falling back to REDIS_URL). Tests can
+use CELERY_BROKER_URL=memory:// with CELERY_TASK_ALWAYS_EAGER=true.
+Task progress is tracked in the proposal_tasks collection, so polling works
+without a result backend.
+"""
+import asyncio
+import os
+import threading
+from datetime import datetime
+from typing import Any, Optional
+
+from celery import Celery
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+
+from .core.logging import get_logger
+from .core.settings import settings
+from .repositories.base import to_object_id
+from .repositories.collections import ProposalTasksRepo
+from .schemas.proposals import ProposalGenerateRequest
+
+logger = get_logger(__name__)
+
+_broker = settings.CELERY_BROKER_URL or os.getenv("REDIS_URL")
+
+celery = Celery(
+    "tasks",
+    broker=_broker,
+    backend=settings.CELERY_RESULT_BACKEND or _broker,
+)
+celery.conf.update(
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+)
+
+# One event loop, Mongo client and LLM registry per worker thread, reused across
+# tasks (Motor clients, asyncio semaphores and httpx clients are bound to the
+# loop they were first used on, so they are recreated along with the loop).
+_local = threading.local()
+
+
+def _run(coro: Any) -> Any:
+    loop: Optional[asyncio.AbstractEventLoop] = getattr(_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _local.loop = asyncio.new_event_loop()
+        _local.client = None
+    return loop.run_until_complete(coro)
+
+
+async def _worker_db() -> AsyncIOMotorDatabase:
+    client: Optional[AsyncIOMotorClient] = getattr(_local, "client", None)
+    if client is None:
+        from .services.llm_registry import bind_loop_registry
+
+        client = _local.client = AsyncIOMotorClient(settings.MONGODB_URI)
+        bind_loop_registry()
+    return client[settings.MONGODB_DB]
+
+
+async def _generate(db: AsyncIOMotorDatabase, task_id: str) -> dict[str, Any]:
+    from .services.audit import AuditService
+    from .services.notification_outbox import enqueue_proposal_notification
+    from .services.proposal_service import ProposalService
+
+    tasks = ProposalTasksRepo(db)
+    doc = await tasks.find_by_id(task_id)
+    if not doc:
+        raise RuntimeError(f"proposal task {task_id} not found")
+
+    await tasks.update_one(
+        {"_id": to_object_id(task_id)},
+        {"$set": {"status": "running", "started_at": datetime.utcnow()}},
+    )
+    req = ProposalGenerateRequest(**doc["request"])
+    try:
+        res = await ProposalService(db).generate(req)
+    except Exception as e:
+        await tasks.update_one(
+            {"_id": to_object_id(task_id)},
+            {"$set": {"status": "failed", "error": str(e), "finished_at": datetime.utcnow()}},
+        )
+        raise
+
+    await tasks.update_one(
+        {"_id": to_object_id(task_id)},
+        {"$set": {"status": "completed", "proposal_id": res.proposal_id, "cached": res.cached, "finished_at": datetime.utcnow()}},
+    )
+    await AuditService(db).log(action="proposal_generated", entity="proposals", entity_id=res.proposal_id, data={"job_id": req.job_id, "job_url": req.job_url, "task_id": task_id})
+    try:
+        await enqueue_proposal_notification(db, res.proposal_id)
+    except Exception as e:
+        logger.warning(f"Failed to queue notifications for proposal {res.proposal_id}: {e}")
+    return {"proposal_id": res.proposal_id}
+
+
+@celery.task(bind=True, name="proposals.generate")
+def generate_proposal(self, task_id: str) -> dict[str, Any]:
+    """Generate and persist one proposal described by a proposal_tasks document."""
+    logger.info(f"[Celery] Generating proposal for task {task_id}")
+
+    async def run() -> dict[str, Any]:
+        return await _generate(await _worker_db(), task_id)
+
+    return _run(run())
+
+
+def celery_enabled() -> bool:
+    return bool(_broker) or settings.CELERY_TASK_ALWAYS_EAGER
+
+
+async def enqueue_proposal(db: AsyncIOMotorDatabase, req: ProposalGenerateRequest) -> str:
+    """Record a proposal_tasks document and hand it to Celery. Returns the task id."""
+    now = datetime.utcnow()
+    task_id = await ProposalTasksRepo(db).insert_one(
+        {
+            "status": "queued",
+            "request": req.model_dump(mode="json"),
+            "proposal_id": None,
+            "error": None,
+            "created_at": now,
+            "started_at": None,
+            "finished_at": None,
+        }
+    )
+    if settings.CELERY_TASK_ALWAYS_EAGER:
+        # Eager mode: run inline on this loop with the app's own db and LLM clients.
+        try:
+            await _generate(db, task_id)
+        except Exception as e:
+            logger.warning(f"Eager proposal task {task_id} failed: {e}")
+        return task_id
+    # Publishing to the broker is blocking I/O, so keep it off the event loop.
+    await asyncio.to_thread(generate_proposal.apply_async, args=[task_id], task_id=task_id)
+    return task_id
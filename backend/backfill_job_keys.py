@@ -0,0 +1,110 @@
+"""
+Script to backfill job_key (see app/services/job_key.py) on jobs_raw, jobs_filtered
+and vollna_jobs, and to collapse documents that turn out to be the same job.
+Keeps the earliest document per job_key, deletes the later copies and creates
+the unique job_key indexes the ingest paths rely on. Rows pointing at a deleted
+copy are cleaned up too: its job_payloads row is deleted, jobs_filtered.raw_id
+and job_scores.job_id are repointed to the kept document, and job_rankings rows
+for it are deleted (the next rankings rebuild covers the kept job).
+"""
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DeleteMany, UpdateMany, UpdateOne
+from app.core.settings import settings
+from app.services.job_key import canonical_job_key
+
+COLLECTIONS = ("jobs_raw", "jobs_filtered", "vollna_jobs")
+BATCH_SIZE = 500
+
+# collection -> (collection, field) holding its _id as a string, repointed to the kept document
+REFERENCES = {
+    "jobs_raw": [("jobs_filtered", "raw_id")],
+    "jobs_filtered": [("job_scores", "job_id")],
+}
+# collection -> (collection, field) whose rows for a deleted document are removed
+DEPENDENTS = {
+    "jobs_filtered": [("job_rankings", "job_id")],
+}
+
+async def clean_references(db, name, replaced):
+    """Delete payloads of removed documents and repoint or remove rows that referenced them"""
+    stale_ids = list(replaced)
+    removed = 0
+    for start in range(0, len(stale_ids), BATCH_SIZE):
+        result = await db["job_payloads"].bulk_write(
+            [DeleteMany({"_id": {"$in": stale_ids[start:start + BATCH_SIZE]}, "collection": name})], ordered=False
+        )
+        removed += result.deleted_count
+    print(f"Removed {removed} job_payloads rows of deleted documents")
+
+    for ref_name, field in REFERENCES.get(name, []):
+        ops = [UpdateMany({field: str(stale)}, {"$set": {field: str(kept)}}) for stale, kept in replaced.items()]
+        for start in range(0, len(ops), BATCH_SIZE):
+            await db[ref_name].bulk_write(ops[start:start + BATCH_SIZE], ordered=False)
+        print(f"Repointed {ref_name}.{field} to the kept documents")
+
+    for dep_name, field in DEPENDENTS.get(name, []):
+        for start in range(0, len(stale_ids), BATCH_SIZE):
+            batch = [str(i) for i in stale_ids[start:start + BATCH_SIZE]]
+            await db[dep_name].bulk_write([DeleteMany({field: {"$in": batch}})], ordered=False)
+        print(f"Removed {dep_name} rows of deleted documents")
+
+async def backfill_collection(db, name):
+    """Set job_key on one collection and delete all but the earliest document per key"""
+    collection = db[name]
+    print(f"\nCollection: {name}")
+    kept = {}
+    replaced = {}
+    updates = []
+    skipped = 0
+
+    cursor = collection.find({}, {"url": 1, "job_key": 1}).sort([("created_at", 1), ("_id", 1)]).batch_size(BATCH_SIZE)
+    async for doc in cursor:
+        key = doc.get("job_key") or canonical_job_key(doc.get("url"))
+        if not key:
+            skipped += 1
+            continue
+        if key in kept:
+            replaced[doc["_id"]] = kept[key]
+            continue
+        kept[key] = doc["_id"]
+        if doc.get("job_key") != key:
+            updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"job_key": key}}))
+
+    # Duplicates go first so the unique index (if already there) accepts the new keys
+    stale_ids = list(replaced)
+    for start in range(0, len(stale_ids), BATCH_SIZE):
+        await collection.bulk_write([DeleteMany({"_id": {"$in": stale_ids[start:start + BATCH_SIZE]}})], ordered=False)
+    print(f"Removed {len(stale_ids)} duplicate documents")
+    if replaced:
+        await clean_references(db, name, replaced)
+
+    for start in range(0, len(updates), BATCH_SIZE):
+        await collection.bulk_write(updates[start:start + BATCH_SIZE], ordered=False)
+    print(f"Backfilled job_key on {len(updates)} documents ({skipped} without a url)")
+
+    await collection.create_index(
+        "job_key",
+        unique=True,
+        partialFilterExpression={"job_key": {"$type": "string"}},
+    )
+    print(f"Unique index on {name}.job_key is in place")
+
+async def backfill_job_keys():
+    """Backfill job_key on every collection that deduplicates jobs"""
+
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[settings.MONGODB_DB]
+
+    print(f"Connecting to MongoDB: {settings.MONGODB_URI}")
+    print(f"Database: {settings.MONGODB_DB}")
+
+    for name in COLLECTIONS:
+        await backfill_collection(db, name)
+
+    client.close()
+    print("\nDone!")
+
+if __name__ == "__main__":
+    asyncio.run(backfill_job_keys())
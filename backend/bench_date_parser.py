@@ -0,0 +1,95 @@
+"""
+Microbenchmark for posted_at parsing.
+Compares app.services.date_parser against the try/except chain the Vollna
+webhook used before (relative regex, then fromisoformat, then RFC 2822),
+on a batch shaped like real webhook traffic: mostly repeated values, a mix
+of relative, ISO, RFC 2822 and unix timestamps, plus some junk.
+"""
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+from app.services import date_parser
+from app.services.date_parser import parse_posted_at
+
+BATCH_SIZE = 5000
+DISTINCT = 400
+ROUNDS = 5
+
+def legacy_parse(posted_at):
+    """The previous webhook logic, returning a datetime or None"""
+    if isinstance(posted_at, (int, float)):
+        try:
+            return datetime.fromtimestamp(posted_at / 1000 if posted_at > 1e12 else posted_at)
+        except Exception:
+            return None
+    m = re.search(r'(\d+)\s*(second|minute|hour|day|week|month|year)s?\s+ago', posted_at.lower())
+    if m:
+        value, unit = int(m.group(1)), m.group(2)
+        days = {"week": 7, "month": 30, "year": 365}.get(unit)
+        if days:
+            return datetime.utcnow() - timedelta(days=value * days)
+        return datetime.utcnow() - timedelta(**{unit + "s": value})
+    try:
+        return datetime.fromisoformat(posted_at.replace('Z', '+00:00'))
+    except Exception:
+        try:
+            return parsedate_to_datetime(posted_at)
+        except Exception:
+            return None
+
+def sample_values(rng):
+    base = datetime(2025, 1, 15, 10, 0, 0)
+    values = []
+    for i in range(DISTINCT):
+        dt = base - timedelta(minutes=rng.randint(0, 60 * 24 * 14))
+        kind = i % 6
+        if kind == 0:
+            values.append(f"{rng.randint(1, 59)} minutes ago")
+        elif kind == 1:
+            values.append(dt.strftime("%Y-%m-%dT%H:%M:%SZ"))
+        elif kind == 2:
+            values.append(dt.strftime("%a, %d %b %Y %H:%M:%S +0000"))
+        elif kind == 3:
+            values.append(dt.strftime("%Y-%m-%dT%H:%M:%S.%f+00:00"))
+        elif kind == 4:
+            values.append(int(dt.timestamp() * 1000))
+        else:
+            values.append(rng.choice(["Posted recently", "n/a", f"{rng.randint(1, 23)} hours ago"]))
+    return [rng.choice(values) for _ in range(BATCH_SIZE)]
+
+def timed(fn, values):
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for v in values:
+            fn(v)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    rng = random.Random(42)
+    values = sample_values(rng)
+
+    legacy = timed(legacy_parse, values)
+
+    def cold(fn, values):
+        date_parser._parse_text.cache_clear()
+        return fn(values)
+
+    start = time.perf_counter()
+    cold(lambda vs: [parse_posted_at(v) for v in vs], values)
+    first_pass = time.perf_counter() - start
+    warm = timed(parse_posted_at, values)
+
+    print(f"Batch: {BATCH_SIZE} values, {len(set(map(str, values)))} distinct, best of {ROUNDS}")
+    print(f"legacy try/except chain: {legacy * 1e3:8.2f} ms ({legacy / BATCH_SIZE * 1e6:.2f} us/value)")
+    print(f"date_parser, cold cache: {first_pass * 1e3:8.2f} ms ({first_pass / BATCH_SIZE * 1e6:.2f} us/value)")
+    print(f"date_parser, warm cache: {warm * 1e3:8.2f} ms ({warm / BATCH_SIZE * 1e6:.2f} us/value)")
+    print(f"Speedup (warm): {legacy / warm:.1f}x")
+    print(f"Cache: {date_parser.cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Script to collapse the append-only job_scores history into one current score per job.
+Keeps the most recent score for each job_url, marks it with updated_at, and
+creates the unique job_url index the scoring service relies on.
+Legacy rows have no rule_versions, so the next rescore pass recomputes them.
+"""
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DeleteMany
+from app.core.settings import settings
+
+async def dedupe_job_scores():
+    """Delete all but the latest job_scores row per job_url"""
+
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[settings.MONGODB_DB]
+    collection = db["job_scores"]
+
+    print(f"Connecting to MongoDB: {settings.MONGODB_URI}")
+    print(f"Database: {settings.MONGODB_DB}")
+    print(f"Collection: job_scores")
+
+    pipeline = [
+        {"$sort": {"created_at": -1}},
+        {"$group": {"_id": "$job_url", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+
+    ops = []
+    removed = 0
+    async for group in collection.aggregate(pipeline, allowDiskUse=True):
+        stale_ids = group["ids"][1:]
+        ops.append(DeleteMany({"_id": {"$in": stale_ids}}))
+        removed += len(stale_ids)
+        if len(ops) >= 500:
+            await collection.bulk_write(ops, ordered=False)
+            ops = []
+    if ops:
+        await collection.bulk_write(ops, ordered=False)
+    print(f"\nRemoved {removed} superseded scores")
+
+    # Rows written before scores were upserted only have created_at
+    result = await collection.update_many(
+        {"updated_at": {"$exists": False}},
+        [{"$set": {"updated_at": "$created_at"}}],
+    )
+    print(f"Backfilled updated_at on {result.modified_count} scores")
+
+    await collection.create_index("job_url", unique=True)
+    print("Unique index on job_scores.job_url is in place")
+
+    client.close()
+    print("\nDone!")
+
+if __name__ == "__main__":
+    asyncio.run(dedupe_job_scores())
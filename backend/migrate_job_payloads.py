@@ -0,0 +1,67 @@
+"""
+Script to move the raw payload embedded in jobs_raw and vollna_jobs documents into
+the job_payloads collection (see app/services/job_payloads.py).
+Each payload is written to job_payloads (compressed if JOB_PAYLOAD_COMPRESSION=zstd)
+before "raw" is removed from the job, so the script can be stopped and re-run.
+Run update_job_times.py first if it is still needed; it reads raw.published.
+"""
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateMany
+from app.core.settings import settings
+from app.services.job_payloads import JobPayloadStore
+
+COLLECTIONS = ("jobs_raw", "vollna_jobs")
+BATCH_SIZE = 200
+
+async def migrate_collection(db, store, name):
+    """Move embedded raw payloads of one collection into job_payloads"""
+    collection = db[name]
+    query = {"raw": {"$exists": True}}
+
+    count = await collection.count_documents(query)
+    print(f"\nCollection: {name} - {count} documents with an embedded payload")
+    if count == 0:
+        return
+
+    moved = 0
+    batch = []
+
+    async def flush():
+        nonlocal moved
+        await store.save_many(name, [(doc["_id"], doc["raw"] or {}) for doc in batch])
+        await collection.bulk_write(
+            [UpdateMany({"_id": {"$in": [doc["_id"] for doc in batch]}}, {"$unset": {"raw": ""}})],
+            ordered=False,
+        )
+        moved += len(batch)
+        batch.clear()
+        print(f"  Moved {moved}/{count}")
+
+    async for doc in collection.find(query, {"raw": 1}).batch_size(BATCH_SIZE):
+        batch.append(doc)
+        if len(batch) >= BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+
+async def migrate_job_payloads():
+    """Move embedded raw payloads into job_payloads"""
+
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[settings.MONGODB_DB]
+    store = JobPayloadStore(db)
+
+    print(f"Connecting to MongoDB: {settings.MONGODB_URI}")
+    print(f"Database: {settings.MONGODB_DB}")
+    print(f"Compression: {settings.JOB_PAYLOAD_COMPRESSION}")
+
+    for name in COLLECTIONS:
+        await migrate_collection(db, store, name)
+
+    client.close()
+    print("\nDone!")
+
+if __name__ == "__main__":
+    asyncio.run(migrate_job_payloads())
@@ -0,0 +1,7 @@
+import os
+
+# Settings are read at import time; point them at a throwaway config before app modules load.
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGODB_DB", "upwork_proposal_bot_test")
+os.environ.setdefault("CELERY_BROKER_URL", "memory://")
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "true")
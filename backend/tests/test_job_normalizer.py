@@ -0,0 +1,36 @@
+import pytest
+
+from app.routers.ingest import _normalize_vollna_payload
+from app.services.job_normalizer import VOLLNA_INGEST_FIELDS
+
+
+def _job(**fields):
+    return {"title": "Build an API", "url": "https://www.upwork.com/jobs/~0123456789abcdef", "clientName": "Acme", **fields}
+
+
+@pytest.mark.parametrize("budget", [0, 0.0, "0"])
+def test_zero_budget_is_kept(budget):
+    items = _normalize_vollna_payload({"jobs": [_job(budget=budget)]})
+
+    assert len(items) == 1
+    assert items[0].budget == 0.0
+
+
+def test_later_nonzero_budget_wins_over_zero():
+    winners: dict[str, str] = {}
+    fields = VOLLNA_INGEST_FIELDS.extract(_job(budget=0, hourlyRate="$15-$25"), winners=winners)
+
+    assert fields["budget"] == 20.0
+    assert winners["budget"] == "hourlyRate"
+
+
+def test_zero_budget_falls_back_when_no_later_key_helps():
+    winners: dict[str, str] = {}
+    fields = VOLLNA_INGEST_FIELDS.extract(_job(budget=0, price="n/a"), winners=winners)
+
+    assert fields["budget"] == 0.0
+    assert winners["budget"] == "budget"
+
+
+def test_missing_budget_is_skipped():
+    assert _normalize_vollna_payload({"jobs": [_job()]}) == []
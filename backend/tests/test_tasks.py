@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from bson import ObjectId
+
+pytest.importorskip("celery")
+
+from app import tasks  # noqa: E402
+from app.schemas.proposals import ProposalGenerateRequest  # noqa: E402
+from app.services import llm_registry as registry_module  # noqa: E402
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs: dict[ObjectId, dict[str, Any]] = {}
+
+    async def insert_one(self, doc):
+        doc = {**doc, "_id": doc.get("_id") or ObjectId()}
+        self.docs[doc["_id"]] = doc
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def find_one(self, query):
+        return self.docs.get(query.get("_id"))
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query.get("_id"))
+        if doc is not None:
+            doc.update(update.get("$set", {}))
+        return SimpleNamespace(modified_count=int(doc is not None))
+
+
+class FakeDB(dict):
+    def __missing__(self, name):
+        col = self[name] = FakeCollection()
+        return col
+
+
+@pytest.fixture
+def fake_generate(monkeypatch):
+    calls: list[ProposalGenerateRequest] = []
+
+    async def generate(self, req):
+        calls.append(req)
+        return SimpleNamespace(proposal_id=str(ObjectId()), cached=False)
+
+    async def log(self, **kwargs):
+        return None
+
+    async def notify(db, proposal_id):
+        return None
+
+    monkeypatch.setattr("app.services.proposal_service.ProposalService.generate", generate)
+    monkeypatch.setattr("app.services.audit.AuditService.log", log)
+    monkeypatch.setattr("app.services.notification_outbox.enqueue_proposal_notification", notify)
+    return calls
+
+
+def test_enqueue_proposal_eager_runs_inline(fake_generate):
+    assert tasks.celery.conf.task_always_eager
+    db = FakeDB()
+    req = ProposalGenerateRequest(job_url="https://www.upwork.com/jobs/~0123456789abcdef")
+
+    task_id = asyncio.run(tasks.enqueue_proposal(db, req))
+
+    doc = db["proposal_tasks"].docs[ObjectId(task_id)]
+    assert doc["status"] == "completed"
+    assert doc["proposal_id"]
+    assert doc["request"]["job_url"] == req.job_url
+    assert [r.job_url for r in fake_generate] == [req.job_url]
+
+
+def test_enqueue_proposal_eager_records_failure(monkeypatch):
+    async def generate(self, req):
+        raise RuntimeError("no provider configured")
+
+    monkeypatch.setattr("app.services.proposal_service.ProposalService.generate", generate)
+    db = FakeDB()
+
+    task_id = asyncio.run(tasks.enqueue_proposal(db, ProposalGenerateRequest(job_id=str(ObjectId()))))
+
+    doc = db["proposal_tasks"].docs[ObjectId(task_id)]
+    assert doc["status"] == "failed"
+    assert doc["error"] == "no provider configured"
+
+
+def test_worker_threads_get_their_own_llm_registry(monkeypatch):
+    seen: dict[str, Any] = {}
+
+    async def generate(db, task_id):
+        seen[task_id] = (registry_module.llm_registry(), asyncio.get_running_loop())
+        return {"proposal_id": None}
+
+    monkeypatch.setattr(tasks, "_generate", generate)
+
+    def worker(task_id):
+        for _ in range(2):
+            tasks.generate_proposal.apply(args=[task_id]).get()
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in ("a", "b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    (reg_a, loop_a), (reg_b, loop_b) = seen["a"], seen["b"]
+    assert loop_a is not loop_b
+    assert reg_a is not reg_b
+    assert registry_module._loop_registries.get(loop_a) is reg_a